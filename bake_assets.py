@@ -0,0 +1,105 @@
+# bake_assets.py
+# Krok budowania: pakuje grafiki kart, lokacji, surowców i przycisków do jednego atlasu na każdą
+# rozdzielczość z settings.RESOLUTIONS (surowe RGBA + index.json). Tła są od razu przeskalowane do ekranu.
+# Gra wczytuje taką paczkę zamiast dekodować i skalować ~25 plików przy każdym starcie.
+#
+#   python bake_assets.py               -> wszystkie rozdzielczości
+#   python bake_assets.py 1280x800      -> tylko wybrane
+import argparse
+import json
+import os
+import pygame
+from settings import RESOLUTIONS
+from engine.assets import IMAGE_SPECS, PACK_VERSION, load_image, pack_path, source_stamp
+
+ATLAS_WIDTH = 1024
+PADDING = 1
+
+
+def shelf_pack(sizes, width=ATLAS_WIDTH, pad=PADDING):
+    #Proste pakowanie "półkami": od najwyższych, wiersz po wierszu. Zwraca pozycje i wysokość atlasu.
+    order = sorted(sizes, key=lambda k: (-sizes[k][1], -sizes[k][0], k))
+    positions, x, y, shelf_h = {}, 0, 0, 0
+    for key in order:
+        w, h = sizes[key]
+        if x + w > width:
+            x, y, shelf_h = 0, y + shelf_h + pad, 0
+        positions[key] = (x, y)
+        x += w + pad
+        shelf_h = max(shelf_h, h)
+    return positions, y + shelf_h
+
+
+def write_raw(pack, filename, surf, fmt):
+    with open(os.path.join(pack, filename), "wb") as f:
+        f.write(pygame.image.tobytes(surf, fmt))
+    return {"file": filename, "size": list(surf.get_size()), "format": fmt}
+
+
+def bake(resolution):
+    pack = pack_path(resolution)
+    os.makedirs(pack, exist_ok=True)
+
+    # Ten sam plik (np. mar.png dla Męża i Żony) trafia do atlasu tylko raz
+    sprites, missing, images = {}, [], {}
+    for group, (files, size) in IMAGE_SPECS.items():
+        if size is None:
+            continue
+        for key, filename in files.items():
+            src = (filename, size)
+            if src not in images:
+                images[src] = load_image(filename, size)
+            if images[src] is None:
+                missing.append(f"{group}/{key}")
+            else:
+                sprites[f"{group}/{key}"] = src
+
+    unique = {src: surf.get_size() for src, surf in images.items() if surf is not None}
+    positions, height = shelf_pack(unique)
+    atlas = pygame.Surface((ATLAS_WIDTH, max(height, 1)), pygame.SRCALPHA)
+    for src, pos in positions.items():
+        atlas.blit(images[src], pos)
+
+    index = {
+        "version": PACK_VERSION,
+        "resolution": list(resolution),
+        "sources": source_stamp(),  # Gra odrzuca paczkę, gdy pliki źródłowe zmieniły się po bake
+        "atlas": write_raw(pack, "atlas.raw", atlas, "RGBA"),
+        "sprites": {name: [*positions[src], *unique[src]] for name, src in sprites.items()},
+        "backgrounds": {},
+        "missing": missing,
+    }
+
+    # Tła - pełnoekranowe, więc nie do atlasu, tylko osobny plik już w docelowym rozmiarze
+    bg_files, _ = IMAGE_SPECS["backgrounds"]
+    for key, filename in bg_files.items():
+        surf = load_image(filename, resolution)
+        if surf is None:
+            missing.append(f"backgrounds/{key}")
+        else:
+            index["backgrounds"][key] = write_raw(pack, f"bg_{key}.raw", surf, "RGB")
+
+    with open(os.path.join(pack, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    return pack, len(sprites), len(positions)
+
+
+def parse_resolution(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pakuje grafiki Forest Valley do atlasów per rozdzielczość.")
+    parser.add_argument("resolutions", nargs="*", type=parse_resolution,
+                        help="np. 1280x800 (domyślnie wszystkie z settings.RESOLUTIONS)")
+    args = parser.parse_args()
+
+    pygame.init()
+    for res in args.resolutions or RESOLUTIONS:
+        pack, n_sprites, n_unique = bake(res)
+        print(f"{res[0]}x{res[1]}: {n_sprites} grafik ({n_unique} unikalnych) -> {pack}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# bench_frames.py
+# Powtarzalny benchmark renderowania: App na sterowniku SDL "dummy" (bez okna), dla każdej rozdzielczości
+# z settings.RESOLUTIONS scenariusz menu -> gra -> hover (dymek) -> koniec gry, z czasem każdej klatki
+# dla Menu.draw, GameManager.draw (osobno draw_hover_tooltip) i GameOverScene.draw.
+#
+#   python bench_frames.py                         -> tabela percentyli + bench_frames.json
+#   python bench_frames.py 1280x800 --frames 300
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Przed importem pygame - inaczej SDL otworzy okno
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import time
+from typing import Dict, List
+import pygame
+from settings import RESOLUTIONS
+from bake_assets import parse_resolution
+from engine import game_manager
+from engine.app import App
+from engine.game_manager import GameManager
+from engine.game_state import GameState
+
+SCENES = ("menu", "game", "game_hover", "tooltip", "game_over")
+
+
+def stats_ms(samples: List[float]) -> Dict:
+    values = sorted(samples)
+    pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+    return {"n": len(values), "mean": round(sum(values) / len(values), 4), "p50": round(pick(0.50), 4),
+            "p90": round(pick(0.90), 4), "p99": round(pick(0.99), 4), "max": round(values[-1], 4)}
+
+
+def timed_ms(fn) -> float:
+    t = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t) * 1000
+
+
+class TooltipTimer:
+    # Podmienia draw_hover_tooltip instancji GameManager na wersję mierzącą czas każdego wywołania
+    def __init__(self, game: GameManager):
+        self.samples: List[float] = []
+        self._draw = game.draw_hover_tooltip
+        game.draw_hover_tooltip = self
+
+    def __call__(self, *args):
+        t = time.perf_counter()
+        rect = self._draw(*args)
+        self.samples.append((time.perf_counter() - t) * 1000)
+        return rect
+
+
+def bench_resolution(app: App, resolution, frames: int, warmup: int, seed: int) -> Dict[str, List[float]]:
+    app.set_resolution(*resolution)
+    rng = random.Random(seed)
+    samples: Dict[str, List[float]] = {scene: [] for scene in SCENES}
+
+    def run(scene: str, draw, step=None):
+        for i in range(warmup + frames):
+            if step: step(i)
+            ms = timed_ms(draw)
+            if i >= warmup: samples[scene].append(ms)
+
+    # 1. Menu - kursor przechodzi po kolejnych przyciskach (podświetlenie + powiększony obrazek)
+    app.change_state("MENU")
+    menu = app.menu
+    keys = ["play", "setting", "quit"]
+    run("menu", menu.draw, lambda i: menu.handle_motion(menu.ui[keys[i % 3]].rect.center, (0, 0, 0)))
+
+    # 2. Gra - ta sama talia dla każdej rozdzielczości, co klatkę jeden losowy (ale powtarzalny) ruch
+    app.game = GameManager(app, GameState(seed))
+    app.change_state("GAME")
+    game = app.game
+    game.handle_motion((0, 0))  # Kursor poza kartami - bez dymka
+
+    def advance(i):
+        # Ruchy przez GameManager.apply (powtórka, telemetria, dźwięk jak w grze), ale bez ostatniego -
+        # koniec gry należy do kroku 4, a hover ma działać na planszy w trakcie gry
+        if i % 2:
+            action = rng.choice(game.state.legal_actions())
+            probe = game.state.clone()
+            probe.apply(action)
+            if not probe.over:
+                game.apply(action)
+    run("game", game.draw, advance)
+
+    # 3. Hover - kursor nad kolejnymi kartami na łące i w ręce, dymek rysowany co klatkę
+    tooltip = TooltipTimer(game)
+    slots = [n for n in game.ui.nodes.values() if n.parent.key in ("meadow", "hand")]
+    run("game_hover", game.draw, lambda i: game.handle_motion(slots[i % len(slots)].rect.center))
+    samples["tooltip"] = tooltip.samples[warmup:]
+
+    # 4. Koniec gry - dogrywamy do końca i mierzymy ekran wyników
+    assert not game.state.over, "gra skończyła się przed krokiem 4"
+    while not game.state.over:
+        game.apply(rng.choice(game.state.legal_actions()))
+    scene = app.game_over_scene
+    assert app.state == "GAME_OVER" and scene.winner_text and scene.summary, "ekran wyników bez wyników"
+    run("game_over", scene.draw)
+    app.reset_game_manager()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark czasu klatki Forest Valley (SDL dummy).")
+    parser.add_argument("resolutions", nargs="*", type=parse_resolution,
+                        help="np. 1280x800 (domyślnie wszystkie z settings.RESOLUTIONS)")
+    parser.add_argument("--frames", type=int, default=200, help="mierzonych klatek na scenę")
+    parser.add_argument("--warmup", type=int, default=10, help="klatek rozgrzewki (cache) poza pomiarem")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="bench_frames.json")
+    args = parser.parse_args()
+
+    # Benchmark nie zostawia plików: bez powtórek i autozapisu
+    game_manager.REPLAY_DIR = None
+    app = App()
+    app.autosaver = None
+    app.ai_seat = None
+    app.loader.wait()
+    app.finish_loading()
+
+    results = {}
+    for res in args.resolutions or RESOLUTIONS:
+        samples = bench_resolution(app, res, args.frames, args.warmup, args.seed)
+        results[f"{res[0]}x{res[1]}"] = {scene: stats_ms(v) for scene, v in samples.items() if v}
+    pygame.quit()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "sdl": ".".join(map(str, pygame.get_sdl_version())),
+            "video_driver": os.environ["SDL_VIDEODRIVER"],
+            "frames": args.frames,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "unit": "ms",
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+
+    print(f"{'rozdzielczość':<14}{'scena':<12}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}  [ms]")
+    for res, scenes in results.items():
+        for scene, s in scenes.items():
+            print(f"{res:<14}{scene:<12}{s['p50']:>8.3f}{s['p90']:>8.3f}{s['p99']:>8.3f}{s['max']:>8.3f}")
+    print(f"-> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# bench_rules.py
+# Benchmark silnika reguł (bez okna): całe gry z polityką losową i zachłanną (engine.tournament),
+# pamięć alokowana na akcję (tracemalloc) + opóźnienia pojedynczych operacji (can_afford, pay,
+# check_triggers, prepare_season, kupno z łąki, zagranie z ręki).
+# Wynik trafia do JSON-a, żeby porównywać przebiegi po zmianach kart albo reguł.
+#
+#   python bench_rules.py                          -> bench_rules.json
+#   python bench_rules.py --games 2000 --out a.json
+#   python bench_rules.py --compare a.json         -> porównanie z poprzednim wynikiem (kod 1 przy regresji)
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from engine.card import CARDS, CardType
+from engine.game_state import GameState, Action, ActionType
+from engine.tournament import random_policy, greedy_policy
+
+OPS = ("can_afford", "pay", "check_triggers", "prepare_season", "buy_from_market", "play_from_hand")
+REGRESSION = 0.15  # Spadek przepustowości / wzrost opóźnienia o tyle uznajemy za regresję
+
+
+POLICIES: Dict[str, Callable[[GameState, random.Random], Action]] = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+
+def play_games(policy, games: int, seed: int) -> Dict:
+    #Przepustowość: pełne gry od rozdania do końca. GC wyłączony, żeby nie mierzyć przypadkowych zbiórek.
+    rng = random.Random(seed)
+    actions = 0
+    gc.collect()
+    gc.disable()
+    start = time.perf_counter()
+    for i in range(games):
+        state = GameState(seed + i)
+        while not state.over:
+            state.apply(policy(state, rng))
+            actions += 1
+    elapsed = time.perf_counter() - start
+    gc.enable()
+    return {
+        "games": games,
+        "actions": actions,
+        "seconds": round(elapsed, 4),
+        "games_per_s": round(games / elapsed, 1),
+        "actions_per_s": round(actions / elapsed, 1),
+    }
+
+
+def measure_alloc(policy, games: int, seed: int) -> Dict:
+    # Pamięć alokowana przez samo state.apply: szczyt śledzony przez tracemalloc ponad stan sprzed akcji
+    # (obejmuje obiekty tymczasowe, które zaraz znikają) oraz to, co zostaje po akcji. Osobny przebieg -
+    # tracemalloc spowalnia kilkukrotnie, więc nie miesza się z pomiarem przepustowości.
+    rng = random.Random(seed)
+    peaks: List[int] = []
+    retained = 0
+    tracemalloc.start()
+    for i in range(games):
+        state = GameState(seed + i)
+        while not state.over:
+            action = policy(state, rng)
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            state.apply(action)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained += current - before
+    tracemalloc.stop()
+    peaks.sort()
+    return {
+        "actions": len(peaks),
+        "peak_bytes_mean": round(sum(peaks) / max(len(peaks), 1), 1),
+        "peak_bytes_p99": percentile(peaks, 0.99) if peaks else 0,
+        "retained_bytes_per_action": round(retained / max(len(peaks), 1), 1),
+    }
+
+
+def percentile(sorted_values: List[int], q: float) -> int:
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def timed(samples: List[int], fn, *args) -> None:
+    t = time.perf_counter_ns()
+    fn(*args)
+    samples.append(time.perf_counter_ns() - t)
+
+
+def measure_ops(games: int, seed: int) -> Dict:
+    # Opóźnienia pojedynczych operacji: w każdym stanie losowej gry mierzymy je na kopiach stanu
+    # (clone poza pomiarem), żeby nie zmieniać przebiegu samej gry.
+    rng = random.Random(seed)
+    samples: Dict[str, List[int]] = {op: [] for op in OPS}
+    for i in range(games):
+        state = GameState(seed + i)
+        while not state.over:
+            p = state.current_player
+            for card_id in state.meadow:
+                card = CARDS[card_id]
+                timed(samples["can_afford"], p.can_afford, card)
+                if p.can_afford(card):
+                    timed(samples["pay"], p.clone().pay, card)
+            for card_id in p.hand:
+                timed(samples["check_triggers"], p.clone().check_triggers, CARDS[card_id])
+            if p.workers_available == 0:
+                timed(samples["prepare_season"], state.clone().prepare_season)
+            for action in state.legal_actions():
+                if action.kind == ActionType.BUY:
+                    timed(samples["buy_from_market"], state.clone().buy_from_market, action.index)
+                elif action.kind == ActionType.PLAY:
+                    timed(samples["play_from_hand"], state.clone().play_from_hand, action.index)
+            state.apply(random_policy(state, rng))
+
+    result = {}
+    for op, values in samples.items():
+        values.sort()
+        result[op] = {"n": len(values), "p50_ns": percentile(values, 0.50), "p99_ns": percentile(values, 0.99),
+                      "mean_ns": round(sum(values) / len(values), 1)} if values else {"n": 0}
+    return result
+
+
+def compare(old: Dict, new: Dict) -> List[str]:
+    #Lista regresji względem poprzedniego wyniku.
+    problems = []
+    for name, cur in new["throughput"].items():
+        prev = old.get("throughput", {}).get(name)
+        if prev and cur["games_per_s"] < prev["games_per_s"] * (1 - REGRESSION):
+            problems.append(f"{name}: {prev['games_per_s']} -> {cur['games_per_s']} gier/s")
+    for op, cur in new["latency"].items():
+        prev = old.get("latency", {}).get(op)
+        if prev and prev.get("n") and cur.get("n") and cur["p50_ns"] > prev["p50_ns"] * (1 + REGRESSION):
+            problems.append(f"{op}: p50 {prev['p50_ns']} -> {cur['p50_ns']} ns")
+    for name, cur in new["alloc"].items():
+        prev = old.get("alloc", {}).get(name)
+        if prev and cur["peak_bytes_mean"] > prev["peak_bytes_mean"] * (1 + REGRESSION):
+            problems.append(f"{name}: {prev['peak_bytes_mean']} -> {cur['peak_bytes_mean']} B/akcję")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark silnika reguł Forest Valley (bez okna).")
+    parser.add_argument("--games", type=int, default=500, help="gier na politykę (domyślnie 500)")
+    parser.add_argument("--latency-games", type=int, default=100, help="gier do pomiaru opóźnień operacji")
+    parser.add_argument("--alloc-games", type=int, default=50, help="gier do pomiaru alokacji (tracemalloc)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="bench_rules.json")
+    parser.add_argument("--compare", help="poprzedni plik JSON do porównania")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cards": len(CARDS),
+            "prod_cards": sum(c.type == CardType.PROD for c in CARDS),
+            "games": args.games,
+            "seed": args.seed,
+        },
+        "throughput": {name: play_games(policy, args.games, args.seed) for name, policy in POLICIES.items()},
+        "alloc": {name: measure_alloc(policy, args.alloc_games, args.seed) for name, policy in POLICIES.items()},
+        "latency": measure_ops(args.latency_games, args.seed),
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+
+    for name, t in report["throughput"].items():
+        a = report["alloc"][name]
+        print(f"{name:>9}: {t['games_per_s']:>8} gier/s  {t['actions_per_s']:>9} akcji/s  "
+              f"alokacje {a['peak_bytes_mean']} B/akcję (p99 {a['peak_bytes_p99']} B, "
+              f"zostaje {a['retained_bytes_per_action']} B)")
+    for op, l in report["latency"].items():
+        if l["n"]:
+            print(f"{op:>16}: p50 {l['p50_ns']:>6} ns  p99 {l['p99_ns']:>7} ns  (n={l['n']})")
+    print(f"-> {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            problems = compare(json.load(f), report)
+        for line in problems:
+            print(f"REGRESJA {line}")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
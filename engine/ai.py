@@ -0,0 +1,224 @@
+# engine/ai.py
+# Przeciwnik komputerowy (Monte Carlo): dla każdej dozwolonej akcji rozgrywa losowo resztę gry
+# i wybiera akcję z najlepszym wynikiem. Rozgrywki liczą procesy z ProcessPoolExecutor do limitu czasu,
+# więc siła bota rośnie z liczbą rdzeni, a główna pętla (60 FPS) tylko sprawdza, czy wynik jest gotowy.
+import math
+import multiprocessing
+import os
+import pickle
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, Future, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from engine.game_state import GameState, Action
+
+MAX_ROLLOUT_STEPS = 2000  # Bezpiecznik - normalna gra kończy się dużo wcześniej
+UCT_C = 0.7  # Stała eksploracji UCB1 (wyniki są w przedziale 0..1)
+
+# Padnięty proces roboczy albo stan, którego nie da się przesłać (pickle zgłasza wtedy PicklingError, TypeError
+# albo AttributeError - zależnie od obiektu) - bot robi ruch awaryjny zamiast wywrócić grę
+POOL_ERRORS = (BrokenProcessPool, pickle.PicklingError, TypeError, AttributeError)
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    # Jedna pula na proces, współdzielona przez kolejne gry (start procesów jest drogi).
+    # "spawn" zamiast fork - nie kopiujemy do dzieci zainicjalizowanego SDL/okna.
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 2,
+                                    mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def reset_pool() -> None:
+    #Porzuca zepsutą pulę - następny ruch AI uruchomi procesy od nowa.
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def score_for(state: GameState, seat: int) -> float:
+    #Wynik zakończonej gry z punktu widzenia gracza seat: 1 wygrana, 0.5 remis, 0 przegrana.
+    me, other = state.players[seat].score, state.players[1 - seat].score
+    return 1.0 if me > other else (0.5 if me == other else 0.0)
+
+
+def random_playout(state: GameState, rng: random.Random) -> None:
+    #Losowa rozgrywka do końca gry (modyfikuje przekazany stan).
+    for _ in range(MAX_ROLLOUT_STEPS):
+        if state.over:
+            return
+        state.apply(rng.choice(state.legal_actions()))
+    state.calc_winner()
+
+
+def determinize(state: GameState, rng: random.Random) -> GameState:
+    #Kopia stanu z przetasowaną talią - bot nie może znać kolejności kart, której nie widać.
+    sim = state.clone()
+    rng.shuffle(sim.deck)
+    return sim
+
+
+def evaluate_actions(state: GameState, actions: List[Action], seat: int, deadline: float,
+                     seed: int) -> Tuple[List[float], List[int]]:
+    # Zadanie dla procesu roboczego: po kolei każda akcja + losowa dogrywka, aż minie deadline.
+    rng = random.Random(seed)
+    wins, visits = [0.0] * len(actions), [0] * len(actions)
+    i = 0
+    while time.time() < deadline or not any(visits):
+        sim = determinize(state, rng)
+        sim.apply(actions[i])
+        random_playout(sim, rng)
+        wins[i] += score_for(sim, seat)
+        visits[i] += 1
+        i = (i + 1) % len(actions)
+    return wins, visits
+
+
+class Node:
+    # Węzeł w tablicy transpozycji: statystyki krawędzi trzymamy w rodzicu, kluczem jest action_key,
+    # więc stany osiągnięte różnymi kolejnościami ruchów dzielą te same liczniki.
+    __slots__ = ("visits", "edges")
+
+    def __init__(self):
+        self.visits = 0
+        self.edges: Dict[Tuple, List] = {}  # action_key -> [suma wyników, liczba odwiedzin]
+
+
+def select_action(node: Node, sim: GameState, rng: random.Random) -> Tuple[Tuple, Action]:
+    #UCB1 po dozwolonych ruchach; nowe (nieodwiedzone) ruchy mają pierwszeństwo.
+    choices: Dict[Tuple, Action] = {}
+    for a in sim.legal_actions():
+        choices.setdefault(sim.action_key(a), a)
+    untried = [k for k in choices if k not in node.edges]
+    if untried:
+        key = rng.choice(untried)
+        return key, choices[key]
+
+    log_n = math.log(node.visits or 1)
+    key = max(choices, key=lambda k: node.edges[k][0] / node.edges[k][1] +
+                                      UCT_C * math.sqrt(log_n / node.edges[k][1]))
+    return key, choices[key]
+
+
+def mcts_search(state: GameState, actions: List[Action], seat: int, deadline: float,
+                seed: int) -> Tuple[List[float], List[int]]:
+    # Zadanie dla procesu roboczego: MCTS z tablicą transpozycji po GameState.canonical_key().
+    # Każda iteracja gra na nowej determinizacji (przetasowana talia), więc drzewo nie zna ukrytych kart.
+    rng = random.Random(seed)
+    table: Dict[Tuple, Node] = {}
+    iterations = 0
+    while time.time() < deadline or iterations == 0:
+        sim = determinize(state, rng)
+        path: List[Tuple[Node, Tuple, int]] = []
+
+        # Selekcja + ekspansja: schodzimy, dopóki trafiamy na znane stany
+        while not sim.over:
+            key = sim.canonical_key()
+            node = table.get(key)
+            expanded = node is None
+            if expanded:
+                node = table[key] = Node()
+            akey, action = select_action(node, sim, rng)
+            path.append((node, akey, sim.turn_idx))
+            sim.apply(action)
+            if expanded or akey not in node.edges:
+                break
+
+        # Symulacja i propagacja wyniku w górę (z punktu widzenia gracza, który wykonywał ruch)
+        random_playout(sim, rng)
+        for node, akey, mover in path:
+            edge = node.edges.setdefault(akey, [0.0, 0])
+            edge[0] += score_for(sim, mover)
+            edge[1] += 1
+            node.visits += 1
+        iterations += 1
+
+    root = table.get(state.canonical_key(), Node())
+    stats = [root.edges.get(state.action_key(a), [0.0, 0]) for a in actions]
+    return [w for w, _ in stats], [n for _, n in stats]
+
+
+class MonteCarloBot:
+    search = staticmethod(evaluate_actions)
+
+    def __init__(self, seat: int, time_budget: float = 1.0, workers: Optional[int] = None):
+        self.seat = seat
+        self.time_budget = time_budget
+        self.workers = workers or os.cpu_count() or 2
+        self.actions: List[Action] = []
+        self._futures: List[Future] = []
+        self.playouts = 0  # Ile rozgrywek policzono przy ostatnim ruchu (do podglądu siły)
+
+    @property
+    def thinking(self) -> bool:
+        return bool(self._futures)
+
+    def start(self, state: GameState) -> None:
+        #Rozpoczyna liczenie w tle - nie blokuje wywołującego.
+        self.actions = state.legal_actions()
+        self._futures = []
+        if len(self.actions) < 2:
+            return  # Nie ma czego liczyć - poll() od razu zwróci jedyny ruch
+        deadline = time.time() + self.time_budget
+        try:
+            pool = get_pool(self.workers)
+            self._futures = [pool.submit(self.search, state, self.actions, self.seat, deadline,
+                                         random.getrandbits(32)) for _ in range(self.workers)]
+        except BrokenProcessPool as e:
+            print(f"AI: pula procesów nie działa ({e}) - ruch awaryjny")
+            reset_pool()  # poll() bez wyników wybierze losowy dozwolony ruch
+
+    def poll(self) -> Optional[Action]:
+        #Zwraca wybraną akcję, gdy wszystkie procesy skończyły, inaczej None.
+        if any(not f.done() for f in self._futures):
+            return None
+        if not self.actions:
+            return None
+        wins, visits = [0.0] * len(self.actions), [0] * len(self.actions)
+        results = 0
+        for f in self._futures:
+            try:
+                w, v = f.result()
+            except POOL_ERRORS as e:
+                print(f"AI: błąd procesu roboczego ({e!r}) - pomijamy jego wyniki")
+                reset_pool()
+                continue
+            wins = [a + b for a, b in zip(wins, w)]
+            visits = [a + b for a, b in zip(visits, v)]
+            results += 1
+        self._futures = []
+        self.playouts = sum(visits)
+
+        # Bez żadnego wyniku (wszystkie procesy padły) - losowy dozwolony ruch, żeby gra szła dalej
+        index = self.pick(wins, visits) if results else random.randrange(len(self.actions))
+        action, self.actions = self.actions[index], []
+        return action
+
+    @staticmethod
+    def pick(wins: List[float], visits: List[int]) -> int:
+        # Płaski Monte Carlo: najlepsza średnia
+        return max(range(len(wins)), key=lambda i: wins[i] / visits[i] if visits[i] else -1.0)
+
+    def choose(self, state: GameState) -> Action:
+        #Wersja blokująca - dla symulacji bez okna.
+        self.start(state)
+        wait(self._futures)
+        return self.poll()
+
+
+class MCTSBot(MonteCarloBot):
+    # Drzewa liczone niezależnie w każdym procesie (root parallelization), sumowane w poll()
+    search = staticmethod(mcts_search)
+
+    @staticmethod
+    def pick(wins: List[float], visits: List[int]) -> int:
+        # MCTS: najczęściej odwiedzany ruch (stabilniejszy niż najlepsza średnia)
+        return max(range(len(wins)), key=lambda i: (visits[i], wins[i]))
+
+
+BOTS = {"MC": MonteCarloBot, "MCTS": MCTSBot}
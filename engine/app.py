@@ -1,39 +1,153 @@
 # engine/app.py
+import os
+import struct
 import pygame
+from typing import Optional
 from settings import *
 from engine.menu import Menu
 from engine.game_manager import GameManager
 from engine.game_over import GameOverScene
 from engine.sound import SoundManager
+from engine.loading import LoadingScene
+from engine.assets import AssetLoader, asset_store
+from engine.fonts import get_font
+from engine.card_view import card_faces, card_tooltips
+from engine.snapshot import Autosaver, load
+from engine.perf import PerfMonitor, StartupProfile
 
 
 class App:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, connect: Optional[str] = None, session: Optional[int] = None,
+                 profile: Optional[StartupProfile] = None):
+        # Przed pierwszą klatką tylko to, co potrzebne do ekranu ładowania. Bez pygame.init() - ono
+        # otwiera też urządzenie audio, a dźwięk startuje dopiero po pierwszej klatce.
+        self.profile = profile
+        if profile: profile.mark("import modułów")
+        pygame.display.init()
+        pygame.font.init()
+        if profile: profile.mark("pygame (okno + czcionki)")
         self.width, self.height = SCREEN_WIDTH, SCREEN_HEIGHT
         self.fullscreen = False
         self.screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption("Forest Valley - Final Version")
+        if profile: profile.mark("set_mode")
         self.clock = pygame.time.Clock()
         self.running = True
 
-        self.font = pygame.font.SysFont("Arial", 16)
-        self.title_font = pygame.font.SysFont("Arial", 30, bold=True)
+        # Dirty rects: sceny zgłaszają zmienione fragmenty ekranu, a bez zmian pętla śpi na event.wait
+        self.full_redraw = True
+        self.dirty_rects: list[pygame.Rect] = []
 
-        self.sound = SoundManager()
-        self.sound.play_music()
+        self.ai_seat = AI_SEAT
+        self.autosaver = Autosaver(AUTOSAVE_PATH) if AUTOSAVE_PATH else None
+        # Gra sieciowa (--connect host:port) - łączymy od razu, stan przyjdzie, zanim gracz kliknie "Graj"
+        self.net = None
+        if connect:
+            from engine.net import NetClient, parse_address  # asyncio tylko w grze sieciowej (czas startu)
+            self.net = NetClient(*parse_address(connect), session=session).start()
 
-        self.menu = Menu(self)
-        self.game = GameManager(self)
-        self.game_over_scene = GameOverScene(self)
+        # Liczniki wydajności - w pętli używane tylko gdy nakładka jest włączona albo jest eksport
+        self.perf = PerfMonitor(PERF_HUD, PERF_EXPORT_FILE, PERF_METRICS_PORT)
+        if profile: profile.mark("autozapis, sieć, liczniki")
+
+        self.font = get_font(16)
+        self.title_font = get_font(30, bold=True)
+        if profile: profile.mark("czcionki")
+
+        # Grafiki ładują się w tle - do tego czasu widać ekran ładowania.
+        # Sceny (menu, gra, koniec gry) i dźwięk powstają przy pierwszym użyciu.
+        self.assets = asset_store
+        self.loader = AssetLoader(self.assets).start((self.width, self.height))
+        self.loading_scene = LoadingScene(self)
+        self._menu = None
+        self._game = None
+        self._game_over_scene = None
+        self._sound = None
+        self.state = "LOADING"
+        if profile: profile.mark("start ładowania grafik")
+
+    @property
+    def sound(self) -> SoundManager:
+        if self._sound is None:
+            self._sound = SoundManager()
+        return self._sound
+
+    @property
+    def menu(self) -> Menu:
+        if self._menu is None:
+            self._menu = Menu(self)
+        return self._menu
+
+    @property
+    def game_over_scene(self) -> GameOverScene:
+        if self._game_over_scene is None:
+            self._game_over_scene = GameOverScene(self)
+        return self._game_over_scene
+
+    @property
+    def game(self) -> GameManager:
+        if self._game is None:
+            self._game = GameManager(self, net=self.net)
+        return self._game
+
+    @game.setter
+    def game(self, value) -> None:
+        self._game = value
+
+    def reset_game_manager(self) -> None:
+        #Porzucamy skończoną grę - nowa powstanie przy następnym wejściu do gry (grafiki zostają w pamięci).
+        if self._game: self._game.close()
+        self._game = None
+        if self.net:
+            # Po meczu sieciowym wracamy do gry lokalnej
+            self.net.close()
+            self.net = None
+
+    def load_autosave(self):
+        #(stan, miejsce AI) z autozapisu albo None, gdy go nie ma lub jest nieczytelny.
+        if not AUTOSAVE_PATH or not os.path.exists(AUTOSAVE_PATH):
+            return None
+        try:
+            return load(AUTOSAVE_PATH)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Błąd autozapisu {AUTOSAVE_PATH}: {e}")
+            return None
+
+    def can_resume(self) -> bool:
+        # Bieżąca gra w pamięci ma pierwszeństwo - autozapis jest dla gry sprzed zamknięcia/awarii
+        if self._game is not None or self.net:
+            return False
+        saved = self.load_autosave()
+        return saved is not None and not saved[0].over
+
+    def resume_game(self) -> None:
+        saved = self.load_autosave()
+        if saved is None:
+            return
+        state, self.ai_seat = saved
+        self._game = GameManager(self, state)
+        self.change_state("GAME")
+
+    def finish_loading(self) -> None:
+        card_faces.clear()  # Nowe grafiki kart - stare gotowe twarze są nieaktualne
+        self._menu = None  # Menu budujemy z gotowych grafik przy pierwszym rysowaniu
         self.state = "MENU"
+        self.invalidate()
 
-    def reset_game_manager(self):
-        return GameManager(self)
+    def invalidate(self, rect=None) -> None:
+        #Zgłoszenie zmienionego fragmentu ekranu (None = cały ekran).
+        if rect is None:
+            self.full_redraw = True
+        else:
+            self.dirty_rects.append(pygame.Rect(rect))
+
+    def needs_frame(self) -> bool:
+        return self.full_redraw or bool(self.dirty_rects) or not DIRTY_RECTS
 
     def change_state(self, new_state):
         self.sound.play_click()
         self.state = new_state
+        self.invalidate()
         #Pattern Matching - match/case (sterowanie stanem)]
         match new_state:
             case "GAME":
@@ -41,29 +155,97 @@ class App:
             case "GAME_OVER":
                 self.game_over_scene.update_layout()
             case "MENU":
+                if self._game: self._game.close()  # Gra czeka w pamięci, ale pliku powtórki nie trzymamy otwartego
                 self.menu.update_layout()
 
     def set_resolution(self, w, h):
         self.width, self.height = w, h
         self.screen = pygame.display.set_mode((w, h), pygame.FULLSCREEN if self.fullscreen else 0)
-        self.menu.update_layout();
-        self.game.update_layout();
-        self.game_over_scene.update_layout()
+        self.loader.set_resolution((w, h))  # Tła pod nowy ekran dochodzą w tle (refresh_backgrounds)
+        card_faces.clear()
+        card_tooltips.clear()
+        self.invalidate()
+        self.loading_scene.update_layout()
+        if self._menu: self._menu.update_layout()
+        if self._game: self._game.update_layout()
+        if self._game_over_scene: self._game_over_scene.update_layout()
+
+    def refresh_backgrounds(self) -> None:
+        #Loader doczytał tła dla bieżącej rozdzielczości - sceny podmieniają przeskalowane stare.
+        size = (self.width, self.height)
+        if self._menu: self._menu.bg_image = self.assets.variant("backgrounds", "menu", size)
+        if self._game: self._game.bg_image = self.assets.variant("backgrounds", "game", size)
+        self.invalidate()
 
     def toggle_fullscreen(self):
         self.fullscreen = not self.fullscreen
         self.set_resolution(self.width, self.height)
 
+    def draw_scene(self) -> None:
+        match self.state:
+            case "LOADING":
+                self.loading_scene.draw()
+            case "MENU":
+                self.menu.draw()
+            case "GAME":
+                self.game.draw()
+            case "GAME_OVER":
+                self.game_over_scene.draw()
+
+    def busy(self) -> bool:
+        #Praca w tle (np. AI liczy ruch, grafiki po zmianie rozdzielczości) - pętla nie może zasnąć
+        #na event.wait, choć nic nie rysuje.
+        if not self.loader.done:
+            return True
+        return self.state == "GAME" and self._game is not None and self._game.busy()
+
+    def present(self) -> None:
+        #Wypycha klatkę na ekran - całą albo tylko zgłoszone prostokąty.
+        if self.full_redraw or not DIRTY_RECTS:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty_rects)
+        self.full_redraw = False
+        self.dirty_rects = []
+
+    def startup_frame(self, frames: int) -> int:
+        #Po pierwszej klatce startuje dźwięk; z --startup-profile kończymy na pierwszej klatce menu.
+        if frames == 0:
+            if self.profile: self.profile.first_frame()
+            self.sound.play_music()
+            if self.profile: self.profile.mark("dźwięk (po pierwszej klatce)")
+            return 1
+        if self.state != "MENU":
+            return 1
+        if self.profile:
+            self.profile.mark("grafiki w tle + pierwsza klatka menu")
+            self.running = False
+        return 2
+
     def run(self):
+        frames = 0  # 0 - przed pierwszą klatką, 1 - ekran ładowania, 2 - menu gotowe
         while self.running:
-            for event in pygame.event.get():
+            perf = self.perf if self.perf.active else None
+            # Tryb bezczynny: nic się nie zmienia, więc czekamy na zdarzenie zamiast kręcić 60 FPS
+            if self.needs_frame() or self.busy():
+                events = pygame.event.get()
+            else:
+                events = [pygame.event.wait(IDLE_WAIT_MS)] + pygame.event.get()
+            if perf: perf.begin_frame()  # Po event.wait - sen w trybie bezczynnym to nie czas klatki
+
+            for event in events:
                 if event.type == pygame.QUIT:
                     self.running = False
                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     if self.state == "GAME": self.change_state("MENU")
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.perf.toggle_overlay()
+                    self.invalidate()
 
                 # [Wykład: Pattern Matching w obsłudze zdarzeń]
                 elif event.type == pygame.MOUSEBUTTONDOWN:
+                    # Kliknięcie może zmienić prawie wszystko - rysujemy cały ekran
+                    self.invalidate()
                     match self.state:
                         case "MENU":
                             self.menu.handle_click(event.pos)
@@ -72,17 +254,41 @@ class App:
                         case "GAME_OVER":
                             self.game_over_scene.handle_click(event.pos)
 
-                elif event.type == pygame.MOUSEMOTION and self.state == "MENU":
-                    self.menu.handle_drag(event.pos, event.buttons)
+                elif event.type == pygame.MOUSEMOTION:
+                    match self.state:
+                        case "MENU":
+                            self.menu.handle_motion(event.pos, event.buttons)
+                        case "GAME":
+                            self.game.handle_motion(event.pos)
 
-            match self.state:
-                case "MENU":
-                    self.menu.draw()
-                case "GAME":
-                    self.game.draw()
-                case "GAME_OVER":
-                    self.game_over_scene.draw()
+                elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWFOCUSGAINED):
+                    self.invalidate()
 
-            pygame.display.flip()
+            if self.state == "LOADING":
+                if self.loader.poll(): self.finish_loading()
+            elif not self.loader.done and self.loader.poll():
+                self.refresh_backgrounds()
+
+            if self.state == "GAME":
+                self.game.update()
+
+            # Nakładka F3 nie bierze udziału w decyzji o bezczynności (needs_frame/busy) - gdy liczby
+            # są do odświeżenia, zgłaszamy tylko jej prostokąt, najwyżej raz na export_interval
+            if perf and perf.overlay_due() and perf.overlay_rect: self.invalidate(perf.overlay_rect)
+            if perf: perf.end_events()
+
+            if self.needs_frame():
+                if perf: perf.begin_draw()
+                self.draw_scene()
+                if perf:
+                    # Nakładka w czasie i licznikach rysowania - jej koszt też widać w pomiarze
+                    changed = perf.draw(self.screen) if perf.overlay else None
+                    if changed: self.invalidate(changed)
+                    perf.end_draw(self.state)
+                self.present()
+                if frames < 2: frames = self.startup_frame(frames)
             self.clock.tick(FPS)
-        pygame.quit()
\ No newline at end of file
+            if perf: perf.end_frame(self.clock)
+        if self.autosaver: self.autosaver.flush()  # Ostatnia tura musi trafić na dysk przed wyjściem
+        self.perf.close()
+        pygame.quit()
@@ -0,0 +1,263 @@
+# engine/assets.py
+# Ładowanie grafik w tle: dekodowanie i skalowanie na wątkach roboczych, postęp dla ekranu ładowania.
+# Wczytane grafiki trafiają do AssetStore (jeden na proces) i są współdzielone przez wszystkie sceny i gry.
+import os
+import hashlib
+import json
+import pygame
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Dict, Optional, Tuple
+from settings import ASSET_CACHE_MB
+
+ASSET_DIR = "assets"
+PACK_DIR = os.path.join(ASSET_DIR, "packs")  # Wynik bake_assets.py (atlasy per rozdzielczość)
+PACK_VERSION = 1
+
+# Grupa -> (klucz -> plik, docelowy rozmiar albo None = bez skalowania)
+IMAGE_SPECS: Dict[str, Tuple[Dict[str, str], Optional[Tuple[int, int]]]] = {
+    "backgrounds": ({"game": "bg.PNG", "menu": "menu_bg.png"}, None),
+    "locations": ({"brzeg": "brzeg.png", "las": "las.png", "zywica": "zywica.png", "kamyki": "kamyki.png",
+                   "krzaki": "krzaki.png", "polana": "polana.png"}, (110, 160)),
+    "resources": ({"twig": "twigs.png", "resin": "resin.png", "pebble": "stones.png", "berry": "berries.png"},
+                  (30, 30)),
+    "cards": ({"Farma": "farm.png", "Sklep": "shop.png", "Zamek": "castle.png", "Król": "king.png",
+               "Mąż": "mar.png", "Żona": "mar.png", "Sędzia": "judge.png", "Historyk": "history.png",
+               "Karczmarz": "innkeeper.png", "Kupiec": "shopkeeper.png", "Rezydencja": "res.png"}, (100, 140)),
+    "buttons": ({"play": "play.png", "setting": "setting.png", "quit": "quit.png"}, (300, 110)),
+}
+
+
+def load_image(filename: str, size: Optional[Tuple[int, int]] = None) -> Optional[pygame.Surface]:
+    #Wczytuje (i ewentualnie skaluje) jeden obrazek - brak pliku to None, a nie wyjątek.
+    path = os.path.join(ASSET_DIR, filename)
+    if not os.path.exists(path):
+        return None
+    img = pygame.image.load(path)
+    return pygame.transform.smoothscale(img, size) if size else img
+
+
+def pack_path(resolution: Tuple[int, int]) -> str:
+    return os.path.join(PACK_DIR, f"{resolution[0]}x{resolution[1]}")
+
+
+def source_stamp() -> str:
+    #Skrót źródeł paczki: IMAGE_SPECS plus czas modyfikacji i długość każdego pliku (bez czytania grafik).
+    #Zmieniona, dodana albo usunięta grafika daje inny skrót - paczka z bake_assets.py jest wtedy nieaktualna.
+    entries = []
+    for group, (files, size) in sorted(IMAGE_SPECS.items()):
+        for key, filename in sorted(files.items()):
+            try:
+                st = os.stat(os.path.join(ASSET_DIR, filename))
+                entries.append([group, key, filename, size, st.st_mtime_ns, st.st_size])
+            except OSError:
+                entries.append([group, key, filename, size, None, None])
+    return hashlib.sha1(json.dumps(entries).encode()).hexdigest()
+
+
+def read_raw(pack: str, entry: Dict) -> pygame.Surface:
+    #Surowe piksele z paczki - bez dekodowania PNG i bez skalowania.
+    with open(os.path.join(pack, entry["file"]), "rb") as f:
+        return pygame.image.frombytes(f.read(), tuple(entry["size"]), entry["format"])
+
+
+def load_pack(resolution: Tuple[int, int]) -> Optional[Dict]:
+    #Wczytuje atlas i tła dla danej rozdzielczości (wątek roboczy). None = brak aktualnej paczki.
+    pack = pack_path(resolution)
+    try:
+        with open(os.path.join(pack, "index.json"), encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get("version") != PACK_VERSION:
+        return None
+    if index.get("sources") != source_stamp():
+        print(f"Paczka grafik {pack} jest starsza niż pliki źródłowe - uruchom bake_assets.py")
+        return None
+    index["atlas_surface"] = read_raw(pack, index["atlas"])
+    index["background_surfaces"] = {k: read_raw(pack, e) for k, e in index["backgrounds"].items()}
+    return index
+
+
+def to_display_format(surf: pygame.Surface) -> pygame.Surface:
+    #convert()/convert_alpha() - blit bez konwersji formatu pikseli. Wymaga ustawionego trybu ekranu.
+    if not pygame.display.get_init() or pygame.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha() if surf.get_flags() & pygame.SRCALPHA else surf.convert()
+
+
+def surface_bytes(surf: pygame.Surface) -> int:
+    return surf.get_pitch() * surf.get_height()
+
+
+class AssetStore:
+    # Oryginały w formacie ekranu + cache przeskalowanych wariantów (grupa, klucz, rozmiar) z wyrzucaniem LRU.
+    # Przełączanie rozdzielczości tam i z powrotem korzysta z już zbudowanych wariantów.
+    def __init__(self, budget_bytes: int = ASSET_CACHE_MB * 1024 * 1024):
+        self.images: Dict[str, Dict[str, Optional[pygame.Surface]]] = {group: {} for group in IMAGE_SPECS}
+        self.budget_bytes = budget_bytes
+        self.variant_bytes = 0
+        self._variants: OrderedDict = OrderedDict()
+
+    def add(self, group: str, key: str, surf: Optional[pygame.Surface], convert: bool = True) -> None:
+        self.images.setdefault(group, {})[key] = to_display_format(surf) if surf and convert else surf
+        self.drop_variants(group, key)
+
+    def add_pack(self, index: Dict, sprites: bool = True, backgrounds: bool = True) -> None:
+        #Grafiki z atlasu to subsurface jednego przekonwertowanego obrazka - bez kopiowania pikseli.
+        if sprites:
+            atlas = to_display_format(index["atlas_surface"])
+            for name, (x, y, w, h) in index["sprites"].items():
+                group, key = name.split("/", 1)
+                self.add(group, key, atlas.subsurface((x, y, w, h)), convert=False)
+        if backgrounds:
+            for key, surf in index["background_surfaces"].items():
+                self.add("backgrounds", key, surf)
+        for name in index["missing"]:
+            group, key = name.split("/", 1)
+            if (group == "backgrounds" and backgrounds) or (group != "backgrounds" and sprites):
+                self.add(group, key, None)
+
+    def group(self, name: str) -> Dict[str, Optional[pygame.Surface]]:
+        return self.images[name]
+
+    def get(self, group: str, key: str) -> Optional[pygame.Surface]:
+        return self.images[group].get(key)
+
+    def variant(self, group: str, key: str, size: Tuple[int, int], smooth: bool = False) -> Optional[pygame.Surface]:
+        #Przeskalowana wersja grafiki - liczona raz na (grafika, rozmiar), potem z cache.
+        original = self.get(group, key)
+        if original is None:
+            return None
+        size = (int(size[0]), int(size[1]))
+        if original.get_size() == size:
+            return original
+
+        vkey = (group, key, size, smooth)
+        surf = self._variants.get(vkey)
+        if surf is not None:
+            self._variants.move_to_end(vkey)
+            return surf
+
+        surf = (pygame.transform.smoothscale if smooth else pygame.transform.scale)(original, size)
+        self._variants[vkey] = surf
+        self.variant_bytes += surface_bytes(surf)
+        self.evict()
+        return surf
+
+    def evict(self) -> None:
+        # Wyrzucamy najdawniej używane warianty, aż zmieścimy się w budżecie (ostatni zostaje zawsze)
+        while self.variant_bytes > self.budget_bytes and len(self._variants) > 1:
+            _, surf = self._variants.popitem(last=False)
+            self.variant_bytes -= surface_bytes(surf)
+
+    def drop_variants(self, group: str, key: str) -> None:
+        for vkey in [k for k in self._variants if k[0] == group and k[1] == key]:
+            self.variant_bytes -= surface_bytes(self._variants.pop(vkey))
+
+    def clear_variants(self) -> None:
+        self._variants.clear()
+        self.variant_bytes = 0
+
+
+asset_store = AssetStore()
+
+
+class AssetLoader:
+    # Zadania w _pending: (grupa, klucz) dla pojedynczego pliku albo (None, zakres) dla paczki -
+    # zakres None to wszystkie grafiki (start), "backgrounds" to same tła (zmiana rozdzielczości).
+    def __init__(self, store: AssetStore = asset_store, workers: Optional[int] = None):
+        self.store = store
+        self.workers = workers or min(8, os.cpu_count() or 2)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[Future, Tuple[Optional[str], Optional[str]]] = {}
+        self.resolution: Optional[Tuple[int, int]] = None
+        self.total = 0
+        self.loaded = 0
+
+    def submit(self, target: Tuple[Optional[str], Optional[str]], fn, *args) -> None:
+        # Wątki startują przy pierwszym zadaniu i kończą się, gdy wszystko wczytane (poll)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="assets")
+        self._pending[self._executor.submit(fn, *args)] = target
+
+    def start(self, resolution: Optional[Tuple[int, int]] = None) -> "AssetLoader":
+        #Zleca wszystkie obrazki do wątków i od razu wraca.
+        #Jeśli jest paczka z bake_assets.py dla tej rozdzielczości, ładujemy ją zamiast luźnych plików.
+        self.resolution = resolution
+        if resolution:
+            self.submit((None, None), load_pack, resolution)
+        else:
+            self.load_loose()
+        self.total = len(self._pending)
+        return self
+
+    def set_resolution(self, resolution: Tuple[int, int]) -> None:
+        #Tła dla nowego ekranu: z jego paczki albo z plików źródłowych w pełnym rozmiarze.
+        #Bez tego skalowalibyśmy tła przygotowane pod rozdzielczość z chwili startu.
+        if resolution == self.resolution:
+            return
+        self.resolution = resolution
+        self.submit((None, "backgrounds"), load_pack, resolution)
+        self.total = self.loaded + len(self._pending)
+
+    def load_loose(self, skip=(), only: Optional[str] = None) -> None:
+        for group, (files, size) in IMAGE_SPECS.items():
+            if only and group != only:
+                continue
+            for key, filename in files.items():
+                if f"{group}/{key}" not in skip:
+                    self.submit((group, key), load_image, filename, size)
+        self.total = self.loaded + len(self._pending)
+
+    @property
+    def progress(self) -> float:
+        return self.loaded / self.total if self.total else 1.0
+
+    @property
+    def done(self) -> bool:
+        return not self._pending
+
+    def poll(self) -> bool:
+        #Przenosi gotowe wyniki do AssetStore (wołane z głównej pętli - convert() musi iść w głównym wątku).
+        #Zwraca True, gdy wszystko gotowe.
+        for future in [f for f in self._pending if f.done()]:
+            group, key = self._pending.pop(future)
+            if group is None:
+                self.install_pack(future, only=key)
+                continue
+            try:
+                self.store.add(group, key, future.result())
+            except (pygame.error, OSError) as e:
+                print(f"Błąd grafiki {group}/{key}: {e}")
+                self.store.add(group, key, None)
+            self.loaded += 1
+        if self.done and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        return self.done
+
+    def install_pack(self, future: Future, only: Optional[str] = None) -> None:
+        try:
+            index = future.result()
+        except (pygame.error, OSError, KeyError, ValueError) as e:
+            print(f"Błąd paczki grafik: {e}")
+            index = None
+        if index is None:
+            self.load_loose(only=only)  # Brak (aktualnej) paczki - zwykłe ładowanie plików
+            return
+        # Tła z paczki tylko dla bieżącej rozdzielczości - ekran mógł się zmienić, zanim paczka doszła
+        current = tuple(index["resolution"]) == self.resolution
+        self.store.add_pack(index, sprites=only is None, backgrounds=current)
+        self.loaded += 1
+        # To, czego nie ma w paczce (np. grafiki spoza ostatniego bake), doczytujemy z plików
+        self.load_loose(skip=set(index["sprites"]) | set(index["missing"]) |
+                             {f"backgrounds/{k}" for k in index["backgrounds"]}, only=only)
+
+    def wait(self) -> "AssetLoader":
+        #Blokujące ładowanie - dla trybów bez ekranu ładowania (testy, benchmarki).
+        while self._pending:
+            for future in list(self._pending):
+                future.exception()
+            self.poll()
+        return self
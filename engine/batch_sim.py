@@ -0,0 +1,250 @@
+# engine/batch_sim.py
+# Wektorowy symulator do badań balansu: N gier naraz, w jednym kroku, na tablicach NumPy.
+# Zasady są te same co w Player/GameState, tylko zapisane jako operacje na maskach:
+#   zasoby      (N, 2, 4)  - kolejność RESOURCE_ORDER
+#   ręka/miasto (N, 2, C)  - liczniki kart wg indeksu w CARD_DB
+#   łąka        (N, C), talia (N, D) + wskaźnik wierzchu, pory roku / robotnicy / tura jako wektory.
+# Wymaga numpy (tylko ten moduł - gra i silnik reguł działają bez niego).
+import numpy as np
+from engine.card import CARD_DB, CardType
+from engine.game_state import LOCATION_DEFS, RESOURCE_ORDER, HAND_LIMIT, CITY_LIMIT, MEADOW_SIZE
+
+C = len(CARD_DB)
+L = len(LOCATION_DEFS)
+DECK_SIZE = C * 4
+POLANA_HAND_LIMIT = 8  # Polana dobiera do 8 kart w ręce (jak w GameState.place_worker)
+FINAL_SEASON = 3  # ZIMA=0, WIOSNA=1, LATO=2, JESIEŃ=3
+
+# Katalog kart jako macierze (C, ...)
+COST = np.array([[d["cost"].get(r, 0) for r in RESOURCE_ORDER] for d in CARD_DB], dtype=np.int32)
+BENEFIT = np.array([[d["benefit"].get(r, 0) for r in RESOURCE_ORDER] for d in CARD_DB], dtype=np.int32)
+POINTS = np.array([d["points"] for d in CARD_DB], dtype=np.int32)
+IS_PROD = np.array([d["type"] == CardType.PROD for d in CARD_DB])
+PROD_BENEFIT = BENEFIT * IS_PROD[:, None]
+
+TAGS = sorted({d["tag"] for d in CARD_DB})
+TAG = np.array([TAGS.index(d["tag"]) for d in CARD_DB])
+
+LINKS = sorted({d["link"] for d in CARD_DB if d.get("link")})
+PROVIDES = np.array([[d.get("link") == k for k in LINKS] for d in CARD_DB], dtype=np.int32)  # (C, K)
+REQ = np.array([LINKS.index(d["link_req"]) if d.get("link_req") else -1 for d in CARD_DB])
+
+# Wyzwalacze kart pasywnych rozpisane per tag zagranej karty: (T, C, 4) zasoby i (T, C) dobierane karty
+TRIG_RES = np.zeros((len(TAGS), C, 4), dtype=np.int32)
+TRIG_CARDS = np.zeros((len(TAGS), C), dtype=np.int32)
+for c, d in enumerate(CARD_DB):
+    trig = d.get("trigger") if d["type"] == CardType.PASSIVE else None
+    if trig:
+        t = TAGS.index(trig["on_play_tag"])
+        TRIG_RES[t, c] = [trig.get("gain_res", {}).get(r, 0) for r in RESOURCE_ORDER]
+        TRIG_CARDS[t, c] = trig.get("gain_card", 0)
+
+LOC_GAIN = np.array([[gain.get(r, 0) for r in RESOURCE_ORDER] for _, gain, _, _ in LOCATION_DEFS], dtype=np.int32)
+LOC_CARDS = np.array([gain.get("cards", 0) for _, gain, _, _ in LOCATION_DEFS])
+LOC_EXCL = np.array([excl for _, _, excl, _ in LOCATION_DEFS])
+
+# Płaska przestrzeń akcji: [NASTĘPNA PORA | lokacje | kup kartę c | zagraj kartę c]
+NEXT_SEASON = 0
+PLACE = 1
+BUY = PLACE + L
+PLAY = BUY + C
+N_ACTIONS = PLAY + C
+
+
+class BatchSim:
+    def __init__(self, n: int, seed=None):
+        self.n = n
+        self.rng = np.random.default_rng(seed)
+        self.rows = np.arange(n)
+
+        # Talia: CARD_DB * 4 przetasowana osobno w każdej grze, dobieramy z końca (jak list.pop())
+        base = np.tile(np.arange(C), 4)
+        self.deck = base[np.argsort(self.rng.random((n, DECK_SIZE)), axis=1)].astype(np.int8)
+        self.deck_top = np.full(n, DECK_SIZE, dtype=np.int32)
+
+        self.res = np.zeros((n, 2, 4), dtype=np.int32)
+        self.hand = np.zeros((n, 2, C), dtype=np.int16)
+        self.city = np.zeros((n, 2, C), dtype=np.int16)
+        self.meadow = np.zeros((n, C), dtype=np.int16)
+        self.season = np.zeros((n, 2), dtype=np.int8)
+        self.finished = np.zeros((n, 2), dtype=bool)
+        self.workers_total = np.full((n, 2), 2, dtype=np.int8)
+        self.workers_available = np.full((n, 2), 2, dtype=np.int8)
+        self.occupancy = np.full((n, L), -1, dtype=np.int8)
+        self.turn = np.zeros(n, dtype=np.int8)
+        self.over = np.zeros(n, dtype=bool)
+        self.steps = 0
+
+        # Rozdanie: po 3 karty na rękę, potem łąka do 8
+        for p in (0, 1):
+            for _ in range(3):
+                self.draw_to(self.hand, self.rows, np.full(n, p))
+        for _ in range(MEADOW_SIZE):
+            self.draw_to(self.meadow, self.rows)
+
+    # --- Pomocnicze ---
+
+    def draw(self, rows: np.ndarray):
+        #Zdejmuje kartę z wierzchu talii tam, gdzie talia nie jest pusta. Zwraca (wiersze, karty).
+        rows = rows[self.deck_top[rows] > 0]
+        self.deck_top[rows] -= 1
+        return rows, self.deck[rows, self.deck_top[rows]]
+
+    def draw_to(self, target: np.ndarray, rows: np.ndarray, players=None) -> None:
+        has = self.deck_top[rows] > 0
+        rows, cards = self.draw(rows)
+        if players is None:
+            target[rows, cards] += 1
+        else:
+            target[rows, players[has], cards] += 1
+
+    def score(self) -> np.ndarray:
+        #(N, 2) - punkty zwycięstwa (Player.score)
+        return self.city.astype(np.int32) @ POINTS
+
+    def free_builds(self, city: np.ndarray) -> np.ndarray:
+        #(n, C) - Player.check_free_build: w mieście jest karta z linkiem, którego wymaga karta c.
+        provided = (city.astype(np.int32) @ PROVIDES) > 0
+        return (REQ >= 0)[None, :] & provided[:, np.maximum(REQ, 0)]
+
+    def can_afford(self, res: np.ndarray, city: np.ndarray):
+        #(n, C) - Player.can_afford dla wszystkich kart naraz. Zwraca też maskę darmowych budów.
+        free = self.free_builds(city)
+        enough = np.ones(free.shape, dtype=bool)
+        for r in range(COST.shape[1]):  # 4 porównania (n, C) zamiast tablicy (n, C, 4)
+            enough &= res[:, r, None] >= COST[None, :, r]
+        return free | enough, free
+
+    # --- Akcje ---
+
+    def legal_mask(self) -> np.ndarray:
+        #(N, N_ACTIONS) - odpowiednik GameState.legal_actions dla wszystkich gier.
+        p = self.turn
+        res, hand, city = self.res[self.rows, p], self.hand[self.rows, p], self.city[self.rows, p]
+        wa = self.workers_available[self.rows, p]
+
+        legal = np.zeros((self.n, N_ACTIONS), dtype=bool)
+        legal[:, NEXT_SEASON] = wa == 0
+        legal[:, PLACE:BUY] = (wa > 0)[:, None] & ~(LOC_EXCL[None, :] & (self.occupancy >= 0))
+        afford, _ = self.can_afford(res, city)
+        legal[:, BUY:PLAY] = (hand.sum(1) < HAND_LIMIT)[:, None] & (self.meadow > 0) & afford
+        legal[:, PLAY:] = (city.sum(1) < CITY_LIMIT)[:, None] & (hand > 0)
+        legal[self.over] = False
+        return legal
+
+    def production(self, rows: np.ndarray, p: np.ndarray) -> None:
+        #Player.activate_production - zielone karty dają swój benefit.
+        self.res[rows, p] += self.city[rows, p].astype(np.int32) @ PROD_BENEFIT
+
+    def prepare_season(self, rows: np.ndarray) -> None:
+        p = self.turn[rows]
+        occ = self.occupancy[rows]
+        self.occupancy[rows] = np.where(occ == p[:, None], -1, occ)
+
+        s = self.season[rows, p]
+        bonus = np.array([1, 1, 2, 0], dtype=np.int8)[s]
+        last = s == FINAL_SEASON
+        self.workers_total[rows, p] = np.where(last, 0, self.workers_total[rows, p] + bonus)
+        self.finished[rows[last], p[last]] = True
+        self.season[rows, p] = np.where(last, s, s + 1)
+
+        prod = (s == 0) | (s == 2)  # Wiosna i Jesień
+        self.production(rows[prod], p[prod])
+        summer = s == 1  # Lato - dwie karty (bez limitu ręki, jak w GameState)
+        for _ in range(2):
+            self.draw_to(self.hand, rows[summer], p[summer])
+
+        keep = ~last  # Koniec gry gracza: robotnicy zostają na 0
+        self.workers_available[rows[keep], p[keep]] = self.workers_total[rows[keep], p[keep]]
+
+    def place_worker(self, rows: np.ndarray, loc: np.ndarray) -> None:
+        p = self.turn[rows]
+        self.res[rows, p] += LOC_GAIN[loc]
+        for k in range(LOC_CARDS.max()):
+            take = (LOC_CARDS[loc] > k) & (self.hand[rows, p].sum(1) < POLANA_HAND_LIMIT)
+            self.draw_to(self.hand, rows[take], p[take])
+        excl = LOC_EXCL[loc]
+        self.occupancy[rows[excl], loc[excl]] = p[excl]
+        self.workers_available[rows, p] -= 1
+
+    def buy(self, rows: np.ndarray, card: np.ndarray) -> None:
+        p = self.turn[rows]
+        _, free = self.can_afford(self.res[rows, p], self.city[rows, p])
+        paid = ~free[np.arange(len(rows)), card]
+        self.res[rows[paid], p[paid]] -= COST[card[paid]]
+        self.hand[rows, p, card] += 1
+        self.meadow[rows, card] -= 1
+        self.draw_to(self.meadow, rows)
+
+    def play(self, rows: np.ndarray, card: np.ndarray) -> None:
+        p = self.turn[rows]
+        city = self.city[rows, p].astype(np.int32)
+        tag = TAG[card]
+
+        # Player.check_triggers - karty pasywne z miasta (przed dołożeniem zagranej karty)
+        self.res[rows, p] += np.einsum("nc,ncr->nr", city, TRIG_RES[tag])
+        draws = (city * TRIG_CARDS[tag]).sum(1)
+        for k in range(int(draws.max(initial=0))):
+            take = (draws > k) & (self.hand[rows, p].sum(1) < HAND_LIMIT)
+            self.draw_to(self.hand, rows[take], p[take])
+
+        self.city[rows, p, card] += 1
+        self.hand[rows, p, card] -= 1
+        self.res[rows, p] += PROD_BENEFIT[card]  # Produkcja natychmiastowa (tylko zielone)
+
+    def next_turn(self, rows: np.ndarray) -> None:
+        both = self.finished[rows].all(1)
+        self.over[rows[both]] = True
+        rows = rows[~both]
+        cur = self.turn[rows]
+        nxt = 1 - cur
+        back = self.finished[rows, nxt]  # Następny już skończył - gra dalej ten sam gracz
+        self.turn[rows] = np.where(back, cur, nxt)
+
+    def step(self, policy) -> None:
+        #Jeden ruch w każdej trwającej grze. policy(sim, legal) -> (N,) indeksy akcji.
+        legal = self.legal_mask()
+        actions = np.asarray(policy(self, legal))
+        acting = legal[self.rows, actions]  # Niedozwolone wybory (i skończone gry) nic nie robią
+
+        rows = self.rows[acting & (actions == NEXT_SEASON)]
+        self.prepare_season(rows)
+        sel = acting & (actions >= PLACE) & (actions < BUY)
+        self.place_worker(self.rows[sel], actions[sel] - PLACE)
+        sel = acting & (actions >= BUY) & (actions < PLAY)
+        self.buy(self.rows[sel], actions[sel] - BUY)
+        sel = acting & (actions >= PLAY)
+        self.play(self.rows[sel], actions[sel] - PLAY)
+
+        self.next_turn(self.rows[acting])
+        self.steps += 1
+
+    def run(self, policy, max_steps: int = 2000) -> np.ndarray:
+        #Gra do końca wszystkie partie. Zwraca wyniki (N, 2).
+        while not self.over.all() and self.steps < max_steps:
+            self.step(policy)
+        return self.score()
+
+
+def simulate(n_games: int, policy, seed=None, chunk: int = 16384):
+    #Generator wyników (n, 2) dla dużych serii - paczki po chunk gier mieszczą się w cache procesora.
+    rng = np.random.default_rng(seed)
+    while n_games > 0:
+        sim = BatchSim(min(chunk, n_games), rng)
+        yield sim.run(policy)
+        n_games -= sim.n
+
+
+def random_policy(sim: BatchSim, legal: np.ndarray) -> np.ndarray:
+    #Losowa dozwolona akcja w każdej grze (jak random.choice(legal_actions())).
+    return np.argmax(np.where(legal, sim.rng.random(legal.shape), -1.0), axis=1)
+
+
+def greedy_policy(sim: BatchSim, legal: np.ndarray) -> np.ndarray:
+    #Prosta heurystyka: zagraj najcenniejszą kartę, potem kup najcenniejszą, potem robotnik, na końcu pora roku.
+    prio = np.zeros(N_ACTIONS)
+    prio[PLACE:BUY] = 10
+    prio[BUY:PLAY] = 20 + POINTS
+    prio[PLAY:] = 40 + POINTS
+    noise = sim.rng.random(legal.shape)
+    return np.argmax(np.where(legal, prio[None, :] + noise, -1.0), axis=1)
@@ -1,16 +1,24 @@
 # engine/board.py
 import pygame
+from engine.game_state import LocationSpot
+from engine.fonts import render_text
 
 
 class Location:
-    def __init__(self, name, x, y, gain, exclusive=True, image=None):
-        self.name = name
+    # Widok pola planszy - stan (zysk, zajętość) trzyma LocationSpot w GameState
+    def __init__(self, spot: LocationSpot, x, y, image=None):
+        self.spot = spot
         self.rect = pygame.Rect(x, y, 110, 160)  # Domyślne wymiary pionowe
-        self.gain = gain
-        self.exclusive = exclusive
-        self.occupant = None
         self.image = image  # grafikę tła
 
+    @property
+    def name(self):
+        return self.spot.name
+
+    @property
+    def occupant(self):
+        return self.spot.occupant
+
     def draw(self, surface, font):
         # 1. RYSOWANIE OBRAZKA
         if self.image:
@@ -30,11 +38,11 @@ class Location:
             pygame.draw.rect(surface, border_col, self.rect, 2, border_radius=10)
 
         #cień (czarny) lekko przesunięty
-        shadow_surf = font.render(self.name, True, (0, 0, 0))
+        shadow_surf = render_text(font, self.name, (0, 0, 0))
         surface.blit(shadow_surf, (self.rect.x + 7, self.rect.y + 7))
 
         #tekst (biały)
-        text_surf = font.render(self.name, True, (255, 255, 255))
+        text_surf = render_text(font, self.name, (255, 255, 255))
         surface.blit(text_surf, (self.rect.x + 5, self.rect.y + 5))
 
         # Pionek (jeśli zajęte)
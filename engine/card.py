@@ -1,7 +1,6 @@
 # engine/card.py
-import pygame
-from dataclasses import dataclass, field  #Dekorator @dataclass]
-from typing import Optional, Dict, Any  #System typów - Typehinting]
+from dataclasses import dataclass  #Dekorator @dataclass]
+from typing import Optional, Dict, Any, Tuple  #System typów - Typehinting]
 from enum import StrEnum  #Typy wyliczeniowe]
 
 
@@ -46,81 +45,69 @@ CARD_DB = [
 ]
 
 
-@dataclass
+RESOURCE_ORDER = ("twig", "resin", "pebble", "berry")
+
+
+def res_tuple(res: Dict[str, int]) -> Tuple[int, ...]:
+    #Słownik zasobów -> krotka o stałej długości w kolejności RESOURCE_ORDER
+    return tuple(res.get(r, 0) for r in RESOURCE_ORDER)
+
+
+@dataclass(frozen=True, slots=True)
+class Trigger:
+    on_play_tag: str
+    gain_res: Tuple[int, ...] = (0, 0, 0, 0)
+    gain_card: int = 0
+
+
+@dataclass(frozen=True, slots=True)
 class Card:
+    # Prototyp karty (flyweight): jeden niezmienny obiekt na wpis w CARD_DB, współdzielony przez wszystkie gry.
+    # Talie, ręce, łąka i miasto trzymają tylko id karty (indeks w CARDS).
+    id: int
     name: str
     type: str
-    cost: Dict[str, int]
+    cost: Tuple[int, ...]  # Kolejność RESOURCE_ORDER
     points: int
-    benefit: Dict[str, int]
+    benefit: Tuple[int, ...]
     desc: str
     tag: str = CardTag.OTHER
-    trigger: Optional[Dict[str, Any]] = None
+    trigger: Optional[Trigger] = None
     link: Optional[str] = None
     link_req: Optional[str] = None
-    rect: Optional[pygame.Rect] = field(default=None, init=False)  #Pole wykluczone z init]
-
-    def __init__(self, data: Dict[str, Any]):
-        # Ręczny init dla kompatybilności ze słownikiem danych
-        self.name = data['name']
-        self.type = data['type']
-        self.tag = data.get('tag', CardTag.OTHER)
-        self.cost = data['cost']
-        self.points = data['points']
-        self.benefit = data['benefit']
-        self.trigger = data.get('trigger', None)
-        self.desc = data['desc']
-        self.link = data.get('link', None)
-        self.link_req = data.get('link_req', None)
-        self.rect = None
-
-    def draw_visual(self, surface: pygame.Surface, x: int, y: int, font: pygame.font.Font,
-                    bonus_source: Optional[str] = None, image: Optional[pygame.Surface] = None) -> None:
-        self.rect = pygame.Rect(x, y, 100, 140)
-
-        if image:
-            surface.blit(image, (x, y))
-        else:
-            # [match/case]
-            match self.type:
-                case CardType.PROD:
-                    bg_col = (60, 100, 60)
-                case CardType.PASSIVE:
-                    bg_col = (60, 80, 140)
-                case _:
-                    bg_col = (100, 100, 110)
-            pygame.draw.rect(surface, bg_col, self.rect, border_radius=8)
-
-        match self.type:
-            case CardType.PROD:
-                border_col = (50, 200, 50)
-            case CardType.PASSIVE:
-                border_col = (50, 100, 255)
-            case _:
-                border_col = (180, 180, 180)
-
-        if bonus_source:
-            border_col = (255, 215, 0)
-
-        thickness = 4 if bonus_source else 3  # [Wykład: Wyrażenie warunkowe]
-        pygame.draw.rect(surface, border_col, self.rect, thickness, border_radius=8)
-
-        header = pygame.Surface((100, 20))
-        header.set_alpha(180)
-        header.fill((0, 0, 0))
-        surface.blit(header, (x, y))
-
-        name_surf = pygame.font.SysFont("Arial", 12, bold=True).render(self.name, True, (255, 255, 255))
-        surface.blit(name_surf, (x + 5, y + 2))
-
-        pygame.draw.circle(surface, (0, 0, 0), (x + 88, y + 12), 10)
-        pygame.draw.circle(surface, (255, 215, 0), (x + 88, y + 12), 9, width=1)
-        vp_surf = pygame.font.SysFont("Arial", 12, bold=True).render(str(self.points), True, (255, 215, 0))
-        surface.blit(vp_surf, (x + 88 - vp_surf.get_width() // 2, y + 5))
-
-        if bonus_source:
-            combo_font = pygame.font.SysFont("Arial", 11, bold=True)
-            txt = combo_font.render(f"COMBO!", True, (255, 255, 0))  # [Wykład: f-string]
-            bg_rect = txt.get_rect(center=(x + 50, y + 125))
-            pygame.draw.rect(surface, (0, 0, 0), bg_rect)
-            surface.blit(txt, bg_rect)
\ No newline at end of file
+
+    @classmethod
+    def from_data(cls, card_id: int, data: Dict[str, Any]) -> "Card":
+        trig = data.get('trigger')
+        return cls(id=card_id, name=data['name'], type=data['type'], cost=res_tuple(data['cost']),
+                   points=data['points'], benefit=res_tuple(data['benefit']), desc=data['desc'],
+                   tag=data.get('tag', CardTag.OTHER),
+                   trigger=Trigger(trig['on_play_tag'], res_tuple(trig.get('gain_res', {})),
+                                   trig.get('gain_card', 0)) if trig else None,
+                   link=data.get('link'), link_req=data.get('link_req'))
+
+    # Prototypy się nie kopiuje - kopia stanu gry (AI, zapis) ma wskazywać te same obiekty
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return card_by_id, (self.id,)
+
+
+CARDS: Tuple[Card, ...] = tuple(Card.from_data(i, d) for i, d in enumerate(CARD_DB))
+
+# Indeks darmowego budowania: link -> karty, które go dają (budynki) / które z niego korzystają.
+# Liczony raz przy imporcie - dymki i widoki nie przeszukują już całej bazy.
+PROVIDERS: Dict[str, Tuple[Card, ...]] = {}
+RECEIVERS: Dict[str, Tuple[Card, ...]] = {}
+for _card in CARDS:
+    if _card.link: PROVIDERS[_card.link] = PROVIDERS.get(_card.link, ()) + (_card,)
+    if _card.link_req: RECEIVERS[_card.link_req] = RECEIVERS.get(_card.link_req, ()) + (_card,)
+del _card
+
+
+def card_by_id(card_id: int) -> Card:
+    return CARDS[card_id]
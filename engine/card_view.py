@@ -0,0 +1,154 @@
+# engine/card_view.py
+import pygame
+from typing import Dict, List, Optional, Tuple
+from engine.card import Card, CardType, RESOURCE_ORDER, PROVIDERS, RECEIVERS
+from engine.fonts import get_font, render_text, wrap_text
+from engine.assets import to_display_format
+
+CARD_W, CARD_H = 100, 140
+TOOLTIP_W, TOOLTIP_PAD, TOOLTIP_LINE = 300, 10, 20
+RESOURCE_NAMES = {"twig": "Drewno", "resin": "Żywica", "pebble": "Kamyk", "berry": "Jagoda"}
+
+
+def compose_card_face(card: Card, bonus: bool, image: Optional[pygame.Surface] = None) -> pygame.Surface:
+    # Składa cały wygląd karty na jednej powierzchni (obrazek, ramka, nagłówek, VP, COMBO)
+    face = pygame.Surface((CARD_W, CARD_H), pygame.SRCALPHA)
+    rect = face.get_rect()
+
+    if image:
+        face.blit(image, (0, 0))
+    else:
+        # [match/case]
+        match card.type:
+            case CardType.PROD:
+                bg_col = (60, 100, 60)
+            case CardType.PASSIVE:
+                bg_col = (60, 80, 140)
+            case _:
+                bg_col = (100, 100, 110)
+        pygame.draw.rect(face, bg_col, rect, border_radius=8)
+
+    match card.type:
+        case CardType.PROD:
+            border_col = (50, 200, 50)
+        case CardType.PASSIVE:
+            border_col = (50, 100, 255)
+        case _:
+            border_col = (180, 180, 180)
+
+    if bonus:
+        border_col = (255, 215, 0)
+
+    thickness = 4 if bonus else 3  # [Wykład: Wyrażenie warunkowe]
+    pygame.draw.rect(face, border_col, rect, thickness, border_radius=8)
+
+    header = pygame.Surface((CARD_W, 20))
+    header.set_alpha(180)
+    header.fill((0, 0, 0))
+    face.blit(header, (0, 0))
+
+    name_surf = render_text(get_font(12, bold=True), card.name, (255, 255, 255))
+    face.blit(name_surf, (5, 2))
+
+    pygame.draw.circle(face, (0, 0, 0), (88, 12), 10)
+    pygame.draw.circle(face, (255, 215, 0), (88, 12), 9, width=1)
+    vp_surf = render_text(get_font(12, bold=True), str(card.points), (255, 215, 0))
+    face.blit(vp_surf, (88 - vp_surf.get_width() // 2, 5))
+
+    if bonus:
+        combo_font = get_font(11, bold=True)
+        txt = render_text(combo_font, f"COMBO!", (255, 255, 0))  # [Wykład: f-string]
+        bg_rect = txt.get_rect(center=(50, 125))
+        pygame.draw.rect(face, (0, 0, 0), bg_rect)
+        face.blit(txt, bg_rect)
+
+    return to_display_format(face)
+
+
+class CardFaceCache:
+    # Gotowe twarze kart: (id prototypu, combo) -> Surface. Wygląd karty zależy tylko od tych dwóch rzeczy,
+    # więc składamy go raz, a rysowanie to jeden blit. Czyścimy przy zmianie rozdzielczości lub grafik.
+    def __init__(self):
+        self._faces: Dict[Tuple[int, bool], pygame.Surface] = {}
+
+    def get(self, card: Card, bonus: bool, image: Optional[pygame.Surface] = None) -> pygame.Surface:
+        key = (card.id, bonus)
+        face = self._faces.get(key)
+        if face is None:
+            face = self._faces[key] = compose_card_face(card, bonus, image)
+        return face
+
+    def clear(self) -> None:
+        self._faces.clear()
+
+    def __len__(self) -> int:
+        return len(self._faces)
+
+
+card_faces = CardFaceCache()
+
+
+def tooltip_lines(card: Card, free: Optional[bool]) -> List[Tuple[str, Tuple[int, int, int]]]:
+    # Treść dymka: (napis, kolor); free - czy oglądany gracz ma budynek z linkiem (None gdy karta go nie wymaga)
+    cost_txt = ", ".join(f"{v} {RESOURCE_NAMES.get(k, k)}" for k, v in zip(RESOURCE_ORDER, card.cost) if v)
+    lines = [(card.name, (255, 215, 0)), (f"Typ: {card.tag} / {card.type}", (200, 200, 200)),
+             (f"Cena: {cost_txt}", (255, 150, 150)), ("Efekt:", (150, 255, 150)), (card.desc, (255, 255, 255))]
+
+    # Info o Combo (czy jest darmowa)
+    if card.link:
+        names = ", ".join(c.name for c in RECEIVERS.get(card.link, ()))
+        lines.append((f"Umożliwia darmowe: {names}", (100, 200, 255)))
+    if card.link_req:
+        prov = PROVIDERS.get(card.link_req)
+        # Zielony kolor jak gracz ma budynek, pomarańczowy jak nie
+        lines.append((f"DARMOWA jeśli masz: {prov[0].name if prov else '?'}",
+                      (0, 255, 0) if free else (255, 200, 100)))
+    return lines
+
+
+def compose_tooltip(card: Card, free: Optional[bool]) -> pygame.Surface:
+    # Cały dymek (tło, ramka, zawinięty tekst) na jednej półprzezroczystej powierzchni
+    font_b, font_r = get_font(14, bold=True), get_font(14)
+    rows = []
+    for i, (txt, col) in enumerate(tooltip_lines(card, free)):
+        font = font_b if i == 0 else font_r
+        rows += [(font, part, col) for part in wrap_text(font, txt, TOOLTIP_W - 2 * TOOLTIP_PAD)]
+
+    box = pygame.Surface((TOOLTIP_W, 2 * TOOLTIP_PAD + len(rows) * TOOLTIP_LINE), pygame.SRCALPHA)
+    box.fill((20, 20, 30, 230))
+    for i, (font, txt, col) in enumerate(rows):
+        box.blit(render_text(font, txt, col), (TOOLTIP_PAD, TOOLTIP_PAD + i * TOOLTIP_LINE))
+    pygame.draw.rect(box, (100, 100, 100), box.get_rect(), 2)
+    return to_display_format(box)
+
+
+class TooltipCache:
+    # Gotowe dymki: (id prototypu, darmowa?, rozdzielczość) -> Surface. Najechanie na kartę to jeden blit;
+    # układ i zawijanie tekstu liczymy raz. Czyścimy razem z twarzami kart.
+    def __init__(self):
+        self._boxes: Dict[Tuple[int, Optional[bool], Tuple[int, int]], pygame.Surface] = {}
+
+    def get(self, card: Card, free: Optional[bool], resolution: Tuple[int, int]) -> pygame.Surface:
+        key = (card.id, free, resolution)
+        box = self._boxes.get(key)
+        if box is None:
+            box = self._boxes[key] = compose_tooltip(card, free)
+        return box
+
+    def clear(self) -> None:
+        self._boxes.clear()
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+
+card_tooltips = TooltipCache()
+
+
+def draw_card(surface: pygame.Surface, card: Card, x: int, y: int, font: pygame.font.Font,
+              bonus_source: Optional[str] = None, image: Optional[pygame.Surface] = None) -> pygame.Rect:
+    # Rysowanie karty jest po stronie widoku - model karty (engine/card.py) nie zna pygame.
+    # Karta to współdzielony prototyp, więc prostokąt zwracamy, a trzyma go widok (GameManager).
+    rect = pygame.Rect(x, y, CARD_W, CARD_H)
+    surface.blit(card_faces.get(card, bool(bonus_source), image), rect)
+    return rect
@@ -0,0 +1,116 @@
+# engine/fonts.py
+# Wspólny rejestr czcionek i cache wyrenderowanych napisów.
+# SysFont przeszukuje czcionki systemowe, a render rasteryzuje tekst - oba są drogie, więc robimy je raz.
+# Wynik wyszukiwania (plik czcionki) trafia też do FONT_CACHE_PATH - kolejne uruchomienia w ogóle
+# nie skanują czcionek systemowych (na Linuksie fc-list potrafi zająć kilkaset ms).
+import json
+import os
+import pygame
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from settings import FONT_CACHE_PATH
+
+_fonts: Dict[Tuple[str, int, bool], pygame.font.Font] = {}
+_resolved: Optional[Dict[str, list]] = None  # "nazwa|pogrubienie" -> [plik albo None (wbudowana), sztuczne pogrubienie]
+
+
+def _font_cache() -> Dict[str, list]:
+    global _resolved
+    if _resolved is None:
+        _resolved = {}
+        try:
+            with open(FONT_CACHE_PATH, encoding="utf-8") as f:
+                data = json.load(f)
+            # Inna wersja pygame może inaczej dopasowywać nazwy - wtedy szukamy od nowa
+            if data.get("pygame") == pygame.version.ver:
+                _resolved = data["fonts"]
+        except (TypeError, OSError, ValueError, KeyError):
+            pass
+    return _resolved
+
+
+def _save_font_cache() -> None:
+    try:
+        os.makedirs(os.path.dirname(FONT_CACHE_PATH) or ".", exist_ok=True)
+        tmp = FONT_CACHE_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"pygame": pygame.version.ver, "fonts": _resolved}, f, indent=1)
+        os.replace(tmp, FONT_CACHE_PATH)
+    except OSError as e:
+        print(f"Błąd zapisu cache czcionek {FONT_CACHE_PATH}: {e}")
+
+
+def resolve_font(name: str, bold: bool) -> Tuple[Optional[str], bool]:
+    #(plik czcionki, czy pogrubiać sztucznie) - to samo, co wybrałby SysFont, ale z cache na dysku.
+    cache = _font_cache() if FONT_CACHE_PATH else {}
+    key = f"{name}|{int(bold)}"
+    hit = cache.get(key)
+    if hit and (hit[0] is None or os.path.exists(hit[0])):
+        return hit[0], hit[1]
+    # Konstruktor SysFont dostaje wynik wyszukiwania - zapamiętujemy go zamiast tworzyć czcionkę
+    path, set_bold = pygame.font.SysFont(name, 1, bold=bold, constructor=lambda p, size, b, i: (p, b))
+    if FONT_CACHE_PATH:
+        cache[key] = [path, set_bold]
+        _save_font_cache()
+    return path, set_bold
+
+
+def get_font(size: int, bold: bool = False, name: str = "Arial") -> pygame.font.Font:
+    #Zwraca współdzieloną czcionkę - wyszukiwanie i wczytanie pliku tylko przy pierwszym użyciu.
+    key = (name, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        path, set_bold = resolve_font(name, bold)
+        font = _fonts[key] = pygame.font.Font(path, size)
+        font.set_bold(set_bold)
+    return font
+
+
+def wrap_text(font: pygame.font.Font, text: str, width: int) -> List[str]:
+    #Dzieli tekst na linie nie szersze niż width (po słowach; za długie słowo zostaje w całości).
+    lines: List[str] = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if line and font.size(candidate)[0] > width:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+
+class TextCache:
+    # Cache LRU: (czcionka, napis, kolor) -> gotowy Surface.
+    # Zwrócone powierzchnie są współdzielone - można je blitować, ale nie wolno ich modyfikować.
+    def __init__(self, max_items: int = 512):
+        self.max_items = max_items
+        self._items: OrderedDict = OrderedDict()
+
+    def render(self, font: pygame.font.Font, text: str, color: Tuple[int, ...]) -> pygame.Surface:
+        key = (font, text, tuple(color))
+        surf = self._items.get(key)
+        if surf is not None:
+            self._items.move_to_end(key)
+            return surf
+
+        surf = self._items[key] = font.render(text, True, color)
+        if len(self._items) > self.max_items:
+            self._items.popitem(last=False)  # Wyrzucamy najdawniej używany napis
+        return surf
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+text_cache = TextCache()
+
+
+def render_text(font: pygame.font.Font, text: str, color: Tuple[int, ...]) -> pygame.Surface:
+    #Skrót do globalnego cache - używany przez wszystkie sceny.
+    return text_cache.render(font, text, color)
@@ -1,384 +1,338 @@
 # engine/game_manager.py
-import pygame
-import random
 import os
-import time
+import pygame
 from settings import *
-from engine.card import Card, CARD_DB, CardType, CardTag
+from engine.card import Card, CARDS, CardType
+from engine.card_view import draw_card, card_tooltips
 from engine.player import Player
 from engine.board import Location
-from typing import Dict, List, Optional, Tuple
+from engine.game_state import GameState, Action, ActionType, MEADOW_SIZE, HAND_MAX
+from engine.ai import BOTS
+from engine.replay import ReplayWriter
+from engine.telemetry import Telemetry, EXT as TELEMETRY_EXT
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from engine.fonts import render_text
+from engine.ui import UITree, Node
+
+if TYPE_CHECKING:
+    from engine.net import NetClient  # asyncio ładujemy tylko w grze sieciowej (czas startu)
+
+ACTION_SFX = {ActionType.PLACE_WORKER: "place_worker", ActionType.BUY: "buy", ActionType.PLAY: "play_card",
+              ActionType.NEXT_SEASON: "season"}  # Efekt dźwiękowy po wykonanej akcji (engine.sound.SFX)
 
 
 class GameManager:
 
-    def __init__(self, app):
+    def __init__(self, app, state: Optional[GameState] = None, net: Optional["NetClient"] = None):
         self.app = app
-        self.start_time = time.time()  # Łapiemy czas startu, żeby potem policzyć ile trwała gra
+        self.net = net  # Gra sieciowa: stan trzyma serwer, tu tylko jego lustro (net.view)
 
         # Inicjalizacja zmiennych pod UI
         self.btn_menu = pygame.Rect(0, 0, 0, 0)
-        self.bg_original = None
         self.bg_image = None
 
         # Słowniki na grafiki (Cache) - Typehinting dla czytelności
         self.images_db: Dict[str, Optional[pygame.Surface]] = {}
-        self.res_icons: Dict[str, Optional[pygame.Surface]] = {}
         self.images_res: Dict[str, Optional[pygame.Surface]] = {}
         self.card_images: Dict[str, Optional[pygame.Surface]] = {}
 
         self.locations: List[Location] = []
+        self.tooltip_rect: Optional[pygame.Rect] = None  # Gdzie ostatnio był dymek (do dirty rects)
+        self.hand_layout: Optional[int] = None  # Liczba kart, pod którą rozstawione są sloty ręki
+        # Drzewo UI: przyciski, lokacje i sloty kart z prostokątami liczonymi tylko przy zmianie rozmiaru okna
+        self.ui = UITree()
         self.LOC_W, self.LOC_H, self.LOC_GAP = 110, 160, 20
 
-        # 1. Wczytywanie tła gry
-        try:
-            self.bg_original = pygame.image.load("assets/bg.PNG")
-        except FileNotFoundError:
-            pass
-
-        # 2. Wczytywanie grafik lokacji
-        # Używamy os.path.join, żeby ścieżki działały na Windowsie i Linuxie tak samo
-        for k, f in {"brzeg": "brzeg.png", "las": "las.png", "zywica": "zywica.png", "kamyki": "kamyki.png",
-                     "krzaki": "krzaki.png", "polana": "polana.png"}.items():
-            path = os.path.join("assets", f)
-            # Operator trójargumentowy - wczytujemy tylko jak plik istnieje
-            self.images_db[k] = pygame.transform.smoothscale(pygame.image.load(path),
-                                                             (self.LOC_W, self.LOC_H)) if os.path.exists(path) else None
-
-        # 3. Wczytywanie ikon surowców
-        for k, f in {"twig": "twigs.png", "resin": "resin.png", "pebble": "stones.png", "berry": "berries.png"}.items():
-            path = os.path.join("assets", f)
-            self.images_res[k] = pygame.transform.smoothscale(pygame.image.load(path), (30, 30)) if os.path.exists(
-                path) else None
-
-        # 4. Wczytywanie grafik kart
-        cards_files = {"Farma": "farm.png", "Sklep": "shop.png", "Zamek": "castle.png", "Król": "king.png",
-                       "Mąż": "mar.png", "Żona": "mar.png", "Sędzia": "judge.png", "Historyk": "history.png",
-                       "Karczmarz": "innkeeper.png", "Kupiec": "shopkeeper.png", "Rezydencja": "res.png"}
-        for name, f in cards_files.items():
-            path = os.path.join("assets", f)
-            self.card_images[name] = pygame.transform.smoothscale(pygame.image.load(path),
-                                                                  (100, 140)) if os.path.exists(path) else None
-
-        # 5. Tworzenie talii kart
-        # List Comprehension - szybkie generowanie listy obiektów
-        source = CARD_DB * 4  # Mnożymy listę, żeby mieć więcej kart w talii
-        random.shuffle(source)
-        self.deck = [Card(d) for d in source]
-
-        # 6. Tworzenie graczy
-        self.players = [Player("Gracz 1", P1_COLOR), Player("Gracz 2", P2_COLOR)]
-        self.turn_idx = 0
-
-        # Rozdajemy po 3 karty na start
-        for p in self.players:
-            for _ in range(3):
-                if self.deck: p.hand.append(self.deck.pop())
-
-        self.meadow: List[Card] = []  # To jest nasza Łąka (Rynek)
-        self.refill_meadow()
-        self.info_msg = "Zaczyna Gracz 1 (ZIMA)."
+        # Grafiki wczytuje AssetLoader w tle przy starcie aplikacji - tu tylko z nich korzystamy,
+        # więc nowa gra (np. po powrocie do menu) nie ładuje niczego ponownie
+        assets = self.app.assets
+        self.images_db = assets.group("locations")
+        self.images_res = assets.group("resources")
+        self.card_images = assets.group("cards")
+
+        # 5. Stan gry (czysta logika, bez pygame) - GameManager jest tylko widokiem nad nim
+        self.state = state or (net and net.view) or GameState()
+        if self.net:
+            # Powtórki i autozapis prowadzi serwer; dopóki nie przyjdzie stan, pokazujemy pustą planszę
+            self.replay, self.bot, self.telemetry = None, None, None
+            if not self.net.ready: self.info_msg = "Łączenie z serwerem..."
+        else:
+            if self.app.autosaver:
+                # Autozapis po każdej turze - serializacja tutaj, zapis na dysk w wątku Autosavera
+                self.state.turn_hook = lambda s: self.app.autosaver.submit(s, self.app.ai_seat)
+            self.replay = ReplayWriter.for_game(self.state, REPLAY_DIR) if REPLAY_DIR else None
+            # Telemetria tur zawsze w pamięci (podsumowanie na ekranie końca gry), na dysk tylko z TELEMETRY_DIR
+            path = os.path.join(TELEMETRY_DIR, f"{self.state.seed:08x}{TELEMETRY_EXT}") if TELEMETRY_DIR else None
+            self.telemetry = Telemetry(path, capacity=512)
+            self.bot = BOTS[AI_KIND](self.app.ai_seat, AI_TIME_BUDGET) if self.app.ai_seat is not None else None
         self.update_layout()
 
+    # Skróty do stanu gry - sceny (np. GameOverScene) czytają graczy przez GameManager
+    @property
+    def players(self) -> List[Player]:
+        return self.state.players
+
+    @property
+    def meadow(self) -> List[Card]:
+        return [CARDS[c] for c in self.state.meadow]
+
+    @property
+    def current_player(self) -> Player:
+        #Zwraca obiekt gracza, którego jest teraz kolej.
+        return self.state.current_player
+
+    @property
+    def viewed_player(self) -> Player:
+        #Czyj panel pokazujemy: w sieci zawsze własny, przy jednym ekranie - gracza, który ma turę.
+        if self.net and self.net.seat is not None:
+            return self.state.players[self.net.seat]
+        return self.state.current_player
+
+    @property
+    def info_msg(self) -> str:
+        return self.state.info_msg
+
+    @info_msg.setter
+    def info_msg(self, value: str) -> None:
+        self.state.info_msg = value
+
     def update_layout(self) -> None:
         w, h = self.app.width, self.app.height
-        if self.bg_original:
-            self.bg_image = pygame.transform.scale(self.bg_original, (w, h))
+        if not self.ui.resize((w, h)):
+            return  # Ten sam rozmiar okna - układ z poprzedniego razu jest aktualny
+        self.bg_image = self.app.assets.variant("backgrounds", "game", (w, h))
         self.btn_menu = pygame.Rect(w - 120, 10, 110, 40)
 
-        # Definicje pól na planszy (Nazwa, Zysk, CzyWyłączne, KluczGrafiki)
-        loc_defs = [
-            ("Brzeg (2 Gałązki)", {"twig": 2}, True, "brzeg"),
-            ("Las (3 Gałązki)", {"twig": 3}, True, "las"),
-            ("Żywica (2 Żywice)", {"resin": 2}, True, "zywica"),
-            ("Kamyki (1 Kamyk)", {"pebble": 1}, True, "kamyki"),
-            ("Krzaki (1 Jagoda)", {"berry": 1}, True, "krzaki"),
-            ("Polana (2 Karty)", {"cards": 2}, False, "polana")
-        ]
-
-        # Inicjalizacja lokacji - robimy to tylko raz
+        # Inicjalizacja widoków lokacji - robimy to tylko raz
         if not self.locations:
             # Funkcja enumerate - bo potrzebujemy i elementu, i jego indeksu
             start_x, y = (w - ((6 * 110) + (5 * 20))) // 2, 60
-            for i, (name, gain, excl, img_key) in enumerate(loc_defs):
+            for i, spot in enumerate(self.state.locations):
                 rect = pygame.Rect(start_x + (i * 130), y, 110, 160)
-                self.locations.append(Location(name, rect.x, rect.y, gain, excl, image=self.images_db.get(img_key)))
+                self.locations.append(Location(spot, rect.x, rect.y, image=self.images_db.get(spot.image_key)))
         else:
             # Jak już są, to tylko przesuwamy (np. przy resize okna)
             start_x = (w - ((6 * 110) + (5 * 20))) // 2
             for i, loc in enumerate(self.locations):
                 loc.rect.x = start_x + (i * 130)
 
-    @property
-    def current_player(self) -> Player:
-        #Zwraca obiekt gracza, którego jest teraz kolej.
-        return self.players[self.turn_idx]
-
-    def refill_meadow(self) -> None:
-        #Dopycha karty na rynku do 8 sztuk.
-        while len(self.meadow) < 8 and self.deck:
-            self.meadow.append(self.deck.pop())
-
-    def next_turn(self) -> None:
-        #Przekazanie pałeczki następnemu graczowi.#
-        # Funkcja all - szybkie sprawdzenie czy wszyscy skończyli grę
-        if all(p.finished for p in self.players):
-            self.calc_winner()
+        # Węzły w kolejności rysowania - to, co rysujemy później, wygrywa przy kliknięciu
+        self.ui.add("menu", self.btn_menu, lambda n: self.app.change_state("MENU"))
+        for i, loc in enumerate(self.locations):
+            self.ui.add(f"loc{i}", loc.rect, self.on_location, index=i)
+        meadow, hand = self.ui.group("meadow"), self.ui.group("hand")
+        start_mx = (w - (MEADOW_SIZE * 110)) // 2
+        for i in range(MEADOW_SIZE):
+            self.ui.add(f"meadow{i}", pygame.Rect(start_mx + (i * 110), 250, 100, 140), self.on_meadow, index=i,
+                        parent=meadow)
+        # Sloty na najpełniejszą możliwą rękę - pozycje ustawia layout_hand według liczby kart
+        for i in range(HAND_MAX):
+            self.ui.add(f"hand{i}", pygame.Rect(20 + (i * 110), h - 120, 100, 140), self.on_hand, index=i,
+                        parent=hand)
+        self.ui.add("next_season", pygame.Rect(w - 220, h - 60, 200, 40),
+                    lambda n: self.apply(Action(ActionType.NEXT_SEASON)))
+        self.hand_layout = None
+        self.layout_hand()
+
+    def layout_hand(self) -> None:
+        #Rozstawia sloty ręki pod aktualną liczbę kart. Karty zachodzą na siebie tylko wtedy,
+        #gdy przy zwykłym odstępie nie zmieściłyby się przed przyciskiem pory.
+        n = len(self.viewed_player.hand)
+        if n == self.hand_layout:
             return
+        self.hand_layout = n
+        room = self.app.width - 240 - 20 - 100  # Od lewego marginesu do przycisku pory, bez ostatniej karty
+        step = min(110, room // (n - 1)) if n > 1 else 110
+        y = self.app.height - 120
+        for i in range(HAND_MAX):
+            self.ui.move(f"hand{i}", pygame.Rect(20 + (i * step), y, 100, 140))
+            self.ui[f"hand{i}"].visible = i < n  # Puste sloty nie zasłaniają kliknięć
+        self.ui.hover(self.ui.mouse_pos)
+
+    def set_state(self, state: GameState) -> None:
+        #Podmiana stanu (nowe lustro z serwera) - widoki lokacji wskazują na pola nowego stanu.
+        self.state = state
+        for loc, spot in zip(self.locations, state.locations):
+            loc.spot = spot
+
+    def apply(self, action: Action) -> bool:
+        #Przekazuje akcję do silnika i reaguje na koniec gry.
+        if self.net:
+            # Serwer rozstrzyga; postawienie robotnika widać od razu dzięki przewidywaniu w NetClient
+            self.net.send(action)
+            self.set_state(self.net.view)
+            return True  # Dźwięk dopiero po przyjęciu przez serwer (update_net)
+        done = self.telemetry.apply(self.state, action)
+        if done: self.app.sound.play(ACTION_SFX[action.kind])
+        if self.replay: self.replay.sync(self.state.log)
+        if self.state.over:
+            self.calc_winner()
+        return done
 
-        # Przełączamy indeks gracza (modulo 2)
-        self.turn_idx = (self.turn_idx + 1) % 2
-
-        # Jak następny gracz już spasował, to wracamy do poprzedniego
-        if self.current_player.finished:
-            self.turn_idx = (self.turn_idx + 1) % 2
-            if self.current_player.finished:  # Zabezpieczenie jakby obaj skończyli
-                self.calc_winner()
-                return
-
-        p = self.current_player
-        self.info_msg = f"Tura: {p.name} ({p.season})"
+    def close(self) -> None:
+        #Zamyka plik powtórki (wyjście do menu, porzucenie gry); ruch po powrocie otworzy go do dopisywania.
+        if self.replay: self.replay.close()
 
     def calc_winner(self) -> None:
-        #Podliczenie punktów i koniec imprezy.
-        p1, p2 = self.players
-        duration = time.time() - self.start_time
-
-        # Wyrażenie warunkowe - ustalamy tekst wyniku w jednej linii
-        winner = f"WYGRAŁ: {p1.name}!" if p1.score > p2.score else (
-            f"WYGRAŁ: {p2.name}!" if p2.score > p1.score else "REMIS!")
-
-        self.app.game_over_scene.set_results(winner, duration)
+        #Koniec imprezy - wynik liczy GameState, tu tylko przełączamy scenę.
+        self.close()
+        summary = None
+        if self.telemetry:
+            summary = self.telemetry.summary(self.state.seed)  # Przed zrzutem - close opróżnia bufor
+            self.telemetry.close()
+        self.app.game_over_scene.set_results(self.state.winner_text, self.state.duration, summary)
         self.app.change_state("GAME_OVER")
 
-    def prepare_season(self) -> None:
-        #Obsługa zmiany pory roku - reset workerów i bonusy.
-        p = self.current_player
-        # Zdejmujemy pionki z planszy
-        for loc in self.locations:
-            if loc.occupant == p: loc.occupant = None
-
-        # Pattern Matching (match/case) - maszyna stanów dla sezonów
-        match p.season:
-            case "ZIMA":
-                p.season = "WIOSNA";
-                p.workers_total += 1
-                if p.activate_production(): self.info_msg = "Wiosna: Produkcja aktywna!"
-            case "WIOSNA":
-                p.season = "LATO";
-                p.workers_total += 1
-                # W lecie dobieramy 2 karty
-                for _ in range(2):
-                    if self.deck: p.hand.append(self.deck.pop())
-            case "LATO":
-                p.season = "JESIEŃ";
-                p.workers_total += 2
-                if p.activate_production(): self.info_msg = "Jesień: Produkcja aktywna!"
-            case "JESIEŃ":
-                p.finished = True;
-                p.workers_total = 0;
-                self.info_msg = f"{p.name} zakończył grę."
-                self.next_turn();
-                return
-
-        p.workers_available = p.workers_total
-        self.next_turn()
+    def ai_turn(self) -> bool:
+        return self.bot is not None and not self.state.over and self.state.turn_idx == self.bot.seat
 
-    def handle_click(self, pos: Tuple[int, int]) -> None:
-        #kliknięć myszką.
-        if self.btn_menu.collidepoint(pos):
-            self.app.change_state("MENU");
-            return
-        if "KONIEC" in self.info_msg: return
+    def remote_turn(self) -> bool:
+        return self.net is not None and (not self.net.ready or self.state.turn_idx != self.net.seat)
 
-        p = self.current_player
+    def busy(self) -> bool:
+        return self.ai_turn() or self.net is not None  # W sieci co klatkę odbieramy wiadomości
 
-        # Kliknięcie w zmianę pory roku
-        if pygame.Rect(self.app.width - 220, self.app.height - 60, 200, 40).collidepoint(pos):
-            if p.workers_available == 0:
-                self.prepare_season()
-            else:
-                self.info_msg = "Masz jeszcze robotników!"
+    def update(self) -> None:
+        #Wołane co klatkę: AI liczy w osobnych procesach, tu tylko startujemy i odbieramy wynik.
+        if self.net:
+            self.update_net()
+            return
+        if not self.ai_turn():
+            return
+        if not self.bot.thinking and not self.bot.actions:
+            self.bot.start(self.state)
+            self.info_msg = f"{self.current_player.name} (AI) myśli..."
+            self.app.invalidate()
             return
+        action = self.bot.poll()
+        if action:
+            self.apply(action)
+            self.app.invalidate()
+
+    def update_net(self) -> None:
+        if self.net.poll():
+            self.set_state(self.net.view)
+            self.app.invalidate()
+        for action in self.net.accepted:
+            self.app.sound.play(ACTION_SFX[action.kind])
+        self.net.accepted.clear()
+        if self.net.error:
+            self.info_msg = f"Rozłączono: {self.net.error}"
+        elif self.state.over:
+            self.calc_winner()
 
-        # 1. Lokacje (Worker Placement)
-        if p.workers_available > 0:
-            for loc in self.locations:
-                if loc.rect.collidepoint(pos):
-                    # Sprawdzamy czy miejsce wolne
-                    if loc.exclusive and loc.occupant: self.info_msg = "Zajęte!"; return
-
-                    # Dajemy nagrodę
-                    if "cards" in loc.gain:
-                        for _ in range(loc.gain["cards"]):
-                            if self.deck and len(p.hand) < 8: p.hand.append(self.deck.pop())
-                    else:
-                        p.gain_resources(loc.gain)
-
-                    # Zajmujemy pole i koniec akcji
-                    if loc.exclusive: loc.occupant = p
-                    p.workers_available -= 1;
-                    self.next_turn();
-                    return
-
-        # 2. Rynek -> Ręka (Kupno)
-        for i, card in enumerate(self.meadow):
-            if card.rect and card.rect.collidepoint(pos):
-                self.action_buy_from_market(p, card, i);
-                return
-
-        # 3. Ręka -> Miasto (Zagranie)
-        start_x, hand_y = 20, self.app.height - 170
-        for i, card in enumerate(p.hand):
-            if pygame.Rect(start_x + (i * 110), hand_y, 100, 140).collidepoint(pos):
-                self.action_play_from_hand(p, card, i);
-                return
-
-    def action_buy_from_market(self, p: Player, card: Card, index: int) -> None:
-        #Logika kupowania: pobiera surowce i przenosi kartę do ręki.
-        if len(p.hand) >= 6: self.info_msg = "Pełna ręka!"; return
-        if p.can_afford(card):
-            is_free = p.pay(card)  # Pobranie surowców
-            p.hand.append(card)  # Dodanie do ręki
-            self.meadow.pop(index);
-            self.refill_meadow()  # Usunięcie z rynku
-            self.info_msg = f"Kupiono {card.name}." + (" (FREE)" if is_free else "")
-            self.next_turn()
-        else:
-            self.info_msg = "Nie stać Cię!"
-
-    def action_play_from_hand(self, p: Player, card: Card, index: int) -> None:
-        #Logika zagrywania: z ręki do miasta (za darmo, ale zużywa akcję).
-        if len(p.city) >= 15: self.info_msg = "Miasto pełne!"; return
-
-        # Sprawdzamy pasywne bonusy (niebieskie karty)
-        trigger_msgs = p.check_triggers(card) if hasattr(p, 'check_triggers') else []
-        for msg in trigger_msgs:
-            if "DRAW_CARD" in msg:
-                try:
-                    for _ in range(int(msg.split(":")[1])):
-                        if self.deck and len(p.hand) < 6: p.hand.append(self.deck.pop())
-                except:
-                    pass
-
-        p.city.append(card);
-        p.hand.pop(index)
-        p.stats["cards_played"] += 1
-
-        # Odpalamy produkcję natychmiastową (zielone karty)
-        if card.type == CardType.PROD: p.gain_resources(card.benefit)
-
-        self.info_msg = f"Zagrałeś {card.name}."
-        self.next_turn()
-
-    def get_cards_by_link_id(self, link_id: str, mode: str) -> List[str]:
-        #Pomocnik do szukania Combo w bazie.
-        # Funkcja filter/map - filtrujemy bazę żeby znaleźć pasujące nazwy
-        if mode == 'PROVIDER':
-            return [d["name"] for d in CARD_DB if d.get("link") == link_id]
-        elif mode == 'RECEIVER':
-            return [d["name"] for d in CARD_DB if d.get("link_req") == link_id]
-        return []
-
-    def draw_hover_tooltip(self, screen: pygame.Surface, card: Card, mouse_pos: Tuple[int, int]) -> None:
-        #Rysuje dymek z info o karcie (Tooltip).
-        font_b, font_r = pygame.font.SysFont("Arial", 14, bold=True), pygame.font.SysFont("Arial", 14)
-        res_map = {"twig": "Drewno", "resin": "Żywica", "pebble": "Kamyk", "berry": "Jagoda"}
-
-        # Składanie tekstu do wyświetlenia
-        lines = [(card.name, (255, 215, 0)), (f"Typ: {card.tag} / {card.type}", (200, 200, 200))]
-        cost_txt = ", ".join([f"{v} {res_map.get(k, k)}" for k, v in card.cost.items()])
-        lines.append((f"Cena: {cost_txt}", (255, 150, 150)))
-        lines.append(("Efekt:", (150, 255, 150)));
-        lines.append((card.desc, (255, 255, 255)))
-
-        # Info o Combo (czy jest darmowa)
-        if card.link:
-            lines.append(
-                (f"Umożliwia darmowe: {', '.join(self.get_cards_by_link_id(card.link, 'RECEIVER'))}", (100, 200, 255)))
-        if card.link_req:
-            prov = self.get_cards_by_link_id(card.link_req, 'PROVIDER')
-            name = prov[0] if prov else "?"
-            # Zielony kolor jak gracz ma budynek, pomarańczowy jak nie
-            col = (0, 255, 0) if self.current_player.check_free_build(card) else (255, 200, 100)
-            lines.append((f"DARMOWA jeśli masz: {name}", col))
-
-        # Rysowanie tła pod tekst
-        box_w, box_h = 300, 20 + (len(lines) * 20)
+    def handle_click(self, pos: Tuple[int, int]) -> None:
+        #kliknięć myszką.
+        self.layout_hand()
+        node = self.ui.hit(pos)
+        if node is None: return
+        if node.key != "menu":
+            if "KONIEC" in self.info_msg: return
+            if self.ai_turn() or self.remote_turn(): return  # Kliknięcia w turze komputera/rywala ignorujemy
+        node.on_click(node)
+
+    # 1. Lokacje (Worker Placement)
+    def on_location(self, node: Node) -> None:
+        if self.current_player.workers_available > 0:
+            self.apply(Action(ActionType.PLACE_WORKER, node.index))
+
+    # 2. Rynek -> Ręka (Kupno)
+    def on_meadow(self, node: Node) -> None:
+        if node.index < len(self.state.meadow):
+            self.apply(Action(ActionType.BUY, node.index))
+
+    # 3. Ręka -> Miasto (Zagranie)
+    def on_hand(self, node: Node) -> None:
+        if node.index < len(self.current_player.hand):
+            self.apply(Action(ActionType.PLAY, node.index))
+
+    def hovered_card(self) -> Optional[Card]:
+        #Karta pod kursorem według węzła z indeksu UI (slot może być pusty).
+        node = self.ui.hovered
+        if node is None or node.parent.key not in ("meadow", "hand"):
+            return None
+        cards = self.state.meadow if node.parent.key == "meadow" else self.viewed_player.hand
+        return CARDS[cards[node.index]] if node.index < len(cards) else None
+
+    def handle_motion(self, pos: Tuple[int, int]) -> None:
+        #Ruch myszy zmienia tylko dymek - zgłaszamy stare i nowe miejsce, resztę ekranu zostawiamy.
+        self.layout_hand()
+        self.ui.hover(pos)
+        if self.tooltip_rect:
+            self.app.invalidate(self.tooltip_rect)
+        if self.hovered_card():
+            self.app.invalidate(self.ui.hovered.rect)  # Nowy dymek zgłosi draw(), gdy już zna jego pozycję
+
+    def draw_hover_tooltip(self, screen: pygame.Surface, card: Card, mouse_pos: Tuple[int, int]) -> pygame.Rect:
+        #Rysuje dymek z info o karcie (Tooltip) - gotowy z card_tooltips, tu tylko pozycja i blit.
+        free = self.viewed_player.check_free_build(card) if card.link_req else None
+        box = card_tooltips.get(card, free, (self.app.width, self.app.height))
+        box_w, box_h = box.get_size()
         x, y = mouse_pos[0] + 15, mouse_pos[1] + 15
         # Żeby nie wyszło poza ekran
         if x + box_w > self.app.width: x -= box_w + 30
         if y + box_h > self.app.height: y -= box_h + 30
-
-        s = pygame.Surface((box_w, box_h));
-        s.set_alpha(230);
-        s.fill((20, 20, 30))
-        screen.blit(s, (x, y));
-        pygame.draw.rect(screen, (100, 100, 100), (x, y, box_w, box_h), 2)
-
-        for i, (txt, col) in enumerate(lines):
-            screen.blit(font_b.render(txt, True, col) if i == 0 else font_r.render(txt, True, col),
-                        (x + 10, y + 10 + (i * 20)))
+        return screen.blit(box, (x, y))
 
     def draw(self) -> None:
         #Główna pętla renderująca - rysuje wszystko co widać w grze.#
         screen = self.app.screen
+        self.layout_hand()  # Ręka mogła się zmienić od ostatniej klatki (ruch, tura rywala, stan z serwera)
         screen.blit(self.bg_image, (0, 0)) if self.bg_image else screen.fill(BG_COLOR)
 
         # Przycisk Menu
         pygame.draw.rect(screen, (150, 50, 50), self.btn_menu, border_radius=5)
-        screen.blit(self.app.font.render("MENU", True, WHITE), (self.btn_menu.x + 35, self.btn_menu.y + 10))
+        screen.blit(render_text(self.app.font, "MENU", WHITE), (self.btn_menu.x + 35, self.btn_menu.y + 10))
 
         # Lokacje
         for loc in self.locations: loc.draw(screen, self.app.font)
 
-        p = self.current_player
-        mx, my = pygame.mouse.get_pos()
-        hovered = None
+        p = self.viewed_player
 
         # Rynek (Łąka)
-        start_mx = (self.app.width - (8 * 110)) // 2
         for i, card in enumerate(self.meadow):
             # Sprawdzamy czy podświetlić ramkę na złoto (Combo)
-            bonus = p.check_bonus_potential(card.tag) if hasattr(p, 'check_bonus_potential') else None
-            card.draw_visual(screen, start_mx + (i * 110), 250, self.app.font, bonus_source=bonus,
-                             image=self.card_images.get(card.name))
-            if card.rect.collidepoint((mx, my)): hovered = card
+            bonus = p.check_bonus_potential(card.tag)
+            slot = self.ui[f"meadow{i}"].rect
+            draw_card(screen, card, slot.x, slot.y, self.app.font, bonus_source=bonus,
+                      image=self.card_images.get(card.name))
 
         # Dolny panel (statystyki gracza)
         py = self.app.height - 200
         pygame.draw.rect(screen, UI_PANEL_COLOR, (0, py, self.app.width, 200))
-        screen.blit(self.app.title_font.render(self.info_msg, True, WHITE), (20, py + 10))
+        screen.blit(render_text(self.app.title_font, self.info_msg, WHITE), (20, py + 10))
 
         # Surowce
         rx = 20
         for k in ["twig", "resin", "pebble", "berry"]:
             if self.images_res.get(k): screen.blit(self.images_res[k], (rx, py + 35))
-            screen.blit(self.app.font.render(str(p.resources[k]), True, WHITE), (rx + 35, py + 40));
+            screen.blit(render_text(self.app.font, str(p.resources[k]), WHITE), (rx + 35, py + 40));
             rx += 80
 
-        screen.blit(self.app.font.render(f"Robotnicy: {p.workers_available}/{p.workers_total}", True, WHITE),
+        screen.blit(render_text(self.app.font, f"Robotnicy: {p.workers_available}/{p.workers_total}", WHITE),
                     (rx + 20, py + 40))
-        screen.blit(self.app.font.render(f"PUNKTY: {p.score}", True, (255, 215, 0)), (rx + 150, py + 40))
+        screen.blit(render_text(self.app.font, f"PUNKTY: {p.score}", (255, 215, 0)), (rx + 150, py + 40))
 
         # Lista kart w mieście (lewa strona)
-        screen.blit(self.app.font.render(f"MIASTO ({len(p.city)}/15):", True, (255, 255, 200)), (20, 125))
-        for i, c in enumerate(p.city):
+        screen.blit(render_text(self.app.font, f"MIASTO ({len(p.city)}/15):", (255, 255, 200)), (20, 125))
+        for i, c in enumerate(map(CARDS.__getitem__, p.city)):
             col = (150, 255, 150) if c.type == CardType.PROD else (
                 (150, 150, 255) if c.type == CardType.PASSIVE else (200, 200, 200))
-            screen.blit(self.app.font.render(f"- {c.name}", True, col), (20, 150 + (i * 20)))
+            screen.blit(render_text(self.app.font, f"- {c.name}", col), (20, 150 + (i * 20)))
 
         # Karty w Ręce
         hx, hy = 20, py + 80
-        screen.blit(self.app.font.render(f"RĘKA {len(p.hand)}/6", True, (200, 200, 200)), (hx, hy - 20))
-        for i, card in enumerate(p.hand):
-            card.draw_visual(screen, hx + (i * 110), hy, self.app.font, image=self.card_images.get(card.name))
-            if card.rect.collidepoint((mx, my)): hovered = card
+        screen.blit(render_text(self.app.font, f"RĘKA {len(p.hand)}/6", (200, 200, 200)), (hx, hy - 20))
+        for i, card in enumerate(map(CARDS.__getitem__, p.hand)):
+            slot = self.ui[f"hand{i}"].rect
+            draw_card(screen, card, slot.x, slot.y, self.app.font, image=self.card_images.get(card.name))
 
         # Rysujemy dymek na samym wierzchu
-        if hovered: self.draw_hover_tooltip(screen, hovered, (mx, my))
+        hovered = self.hovered_card()
+        self.tooltip_rect = self.draw_hover_tooltip(screen, hovered, self.ui.mouse_pos) if hovered else None
+        if self.tooltip_rect: self.app.invalidate(self.tooltip_rect)
 
         # Przycisk "Następna Pora"
-        bs = pygame.Rect(self.app.width - 220, self.app.height - 60, 200, 40)
+        bs = self.ui["next_season"].rect
         pygame.draw.rect(screen, (50, 150, 50) if p.workers_available == 0 else (100, 100, 100), bs, border_radius=8)
-        screen.blit(self.app.font.render("NASTĘPNA PORA", True, WHITE), (bs.x + 30, bs.y + 10))
\ No newline at end of file
+        screen.blit(render_text(self.app.font, "NASTĘPNA PORA", WHITE), (bs.x + 30, bs.y + 10))
\ No newline at end of file
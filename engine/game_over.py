@@ -1,7 +1,9 @@
 # engine/game_over.py
 import pygame
 from settings import *
-from typing import Tuple  #Typehinting]
+from typing import Dict, List, Optional, Tuple  #Typehinting]
+from engine.fonts import get_font, render_text
+from engine.ui import UITree
 
 
 class GameOverScene:
@@ -9,44 +11,52 @@ class GameOverScene:
         self.app = app
         self.winner_text: str = ""
         self.game_duration: str = "00:00"
+        self.summary: Optional[List[Dict]] = None  # Z telemetrii gry (Telemetry.summary), po jednym na gracza
         self.btn_back = pygame.Rect(0, 0, 200, 50)
+        self.ui = UITree()
         self.update_layout()
 
     def update_layout(self) -> None:
+        if not self.ui.resize((self.app.width, self.app.height)):
+            return
         self.btn_back.center = (self.app.width // 2, self.app.height - 80)
+        self.ui.add("back", self.btn_back, self.on_back)
 
-    def set_results(self, winner_txt: str, duration_sec: float) -> None:
+    def set_results(self, winner_txt: str, duration_sec: float, summary: Optional[List[Dict]] = None) -> None:
         self.winner_text = winner_txt
+        self.summary = summary
         # [Wykład: Formatowanie napisów f-string]
         self.game_duration = f"{int(duration_sec // 60)} min {int(duration_sec % 60)} s"
 
     def handle_click(self, pos: Tuple[int, int]) -> None:
-        if self.btn_back.collidepoint(pos):
-            self.app.sound.play_click()
-            self.app.game = self.app.reset_game_manager()
-            self.app.change_state("MENU")
+        self.ui.click(pos)
+
+    def on_back(self, node) -> None:
+        self.app.sound.play_click()
+        self.app.reset_game_manager()
+        self.app.change_state("MENU")
 
     def draw(self) -> None:
         screen = self.app.screen
         w, h = self.app.width, self.app.height
         screen.fill((30, 35, 40))
 
-        font_big = pygame.font.SysFont("Arial", 60, bold=True)
-        t = font_big.render("GAME OVER", True, (255, 100, 100))
+        font_big = get_font(60, bold=True)
+        t = render_text(font_big, "GAME OVER", (255, 100, 100))
         screen.blit(t, t.get_rect(center=(w // 2, 80)))
 
-        font_mid = pygame.font.SysFont("Arial", 30, bold=True)
-        w_surf = font_mid.render(self.winner_text, True, (255, 215, 0))
+        font_mid = get_font(30, bold=True)
+        w_surf = render_text(font_mid, self.winner_text, (255, 215, 0))
         screen.blit(w_surf, w_surf.get_rect(center=(w // 2, 150)))
 
         self.draw_table(screen, w // 2, 220)
 
         pygame.draw.rect(screen, (100, 100, 100), self.btn_back, border_radius=5)
-        txt = self.app.font.render("WRÓĆ DO MENU", True, WHITE)
+        txt = render_text(self.app.font, "WRÓĆ DO MENU", WHITE)
         screen.blit(txt, txt.get_rect(center=self.btn_back.center))
 
     def draw_table(self, screen, cx, start_y):
-        font = pygame.font.SysFont("Arial", 18)
+        font = get_font(18)
         p1, p2 = self.app.game.players
 
         #Krotki i listy]
@@ -56,12 +66,20 @@ class GameOverScene:
             ("Drewno (Suma)", str(p1.stats["total_res"]["twig"]), str(p2.stats["total_res"]["twig"])),
             ("Jagody (Suma)", str(p1.stats["total_res"]["berry"]), str(p2.stats["total_res"]["berry"])),
         ]
+        if self.summary:
+            s1, s2 = self.summary
+            rows += [
+                ("Darmowe Budowy", str(s1["free"]), str(s2["free"])),
+                ("Premie z Kart", str(s1["trigger_res"]), str(s2["trigger_res"])),
+                # PZ narastająco na koniec każdej pory roku
+                ("PZ po Porach Roku", " / ".join(map(str, s1["season_vp"])), " / ".join(map(str, s2["season_vp"]))),
+            ]
 
-        screen.blit(font.render(f"Czas gry: {self.game_duration}", True, (200, 200, 200)), (cx - 300, start_y - 40))
+        screen.blit(render_text(font, f"Czas gry: {self.game_duration}", (200, 200, 200)), (cx - 300, start_y - 40))
 
         col_w, x = 200, cx - 300
         for i, h in enumerate(["STATYSTYKA", "GRACZ 1", "GRACZ 2"]):
-            screen.blit(pygame.font.SysFont("Arial", 18, bold=True).render(h, True, (255, 200, 100)),
+            screen.blit(render_text(get_font(18, bold=True), h, (255, 200, 100)),
                         (x + (i * col_w), start_y))
 
         y = start_y + 40
@@ -69,5 +87,5 @@ class GameOverScene:
 
         for row in rows:
             for i, val in enumerate(row):
-                screen.blit(font.render(val, True, (200, 200, 200) if i == 0 else WHITE), (x + (i * col_w), y))
+                screen.blit(render_text(font, val, (200, 200, 200) if i == 0 else WHITE), (x + (i * col_w), y))
             y += 30
\ No newline at end of file
@@ -0,0 +1,333 @@
+# engine/game_state.py
+# Czysta logika gry (bez pygame) - do symulacji, botów i testów balansu.
+# GameManager jest tylko widokiem, który tłumaczy kliknięcia na akcje i rysuje ten stan.
+import random
+import time
+from array import array
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Callable, Dict, List, Optional, Tuple
+from settings import P1_COLOR, P2_COLOR
+from engine.card import Card, CARDS, CardType, RESOURCE_ORDER
+from engine.player import Player
+
+# Definicje pól na planszy (Nazwa, Zysk, CzyWyłączne, KluczGrafiki)
+LOCATION_DEFS = [
+    ("Brzeg (2 Gałązki)", {"twig": 2}, True, "brzeg"),
+    ("Las (3 Gałązki)", {"twig": 3}, True, "las"),
+    ("Żywica (2 Żywice)", {"resin": 2}, True, "zywica"),
+    ("Kamyki (1 Kamyk)", {"pebble": 1}, True, "kamyki"),
+    ("Krzaki (1 Jagoda)", {"berry": 1}, True, "krzaki"),
+    ("Polana (2 Karty)", {"cards": 2}, False, "polana")
+]
+
+HAND_LIMIT = 6
+MEADOW_DRAW_LIMIT = 8  # Polana dobiera karty do tylu w ręce (ponad HAND_LIMIT)
+HAND_MAX = MEADOW_DRAW_LIMIT + 2  # Najwięcej kart w ręce: lato dokłada 2 karty bez limitu
+CITY_LIMIT = 15
+MEADOW_SIZE = 8
+
+
+class ActionType(StrEnum):
+    PLACE_WORKER = "PLACE_WORKER"
+    BUY = "BUY"
+    PLAY = "PLAY"
+    NEXT_SEASON = "NEXT_SEASON"
+
+
+ACTION_KINDS = tuple(ActionType)  # Kolejność = numer rodzaju akcji w zapisie binarnym
+
+
+@dataclass(frozen=True)
+class Action:
+    kind: ActionType
+    index: int = 0  # Indeks lokacji / karty na łące / karty w ręce
+
+    @property
+    def code(self) -> int:
+        #Akcja jako jeden bajt: rodzaj w górnych 4 bitach, indeks (< 16) w dolnych.
+        return ACTION_KINDS.index(self.kind) << 4 | self.index
+
+    @staticmethod
+    def from_code(code: int) -> "Action":
+        if not 0 <= code >> 4 < len(ACTION_KINDS):
+            raise ValueError(f"Nieznany rodzaj akcji w kodzie {code:#04x}")
+        return Action(ACTION_KINDS[code >> 4], code & 0x0F)
+
+
+@dataclass
+class LocationSpot:
+    name: str
+    gain: Dict[str, int]
+    exclusive: bool
+    image_key: str
+    occupant: Optional[Player] = None
+
+
+class GameState:
+
+    def __init__(self, seed: Optional[int] = None):
+        self.start_time = time.time()  # Łapiemy czas startu, żeby potem policzyć ile trwała gra
+
+        # Ziarno + log akcji w pełni odtwarzają grę (engine/replay.py) - jedyną losowością jest tasowanie
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.log = bytearray()  # Wykonane akcje, po jednym bajcie (Action.code)
+
+        # Tworzenie talii kart - same id prototypów z CARDS (po 4 kopie każdej karty)
+        source = list(range(len(CARDS))) * 4
+        random.Random(self.seed).shuffle(source)
+        self.deck: array = array('B', source)
+
+        # Tworzenie graczy
+        self.players = [Player("Gracz 1", P1_COLOR), Player("Gracz 2", P2_COLOR)]
+        self.turn_idx = 0
+
+        # Rozdajemy po 3 karty na start
+        for p in self.players:
+            for _ in range(3):
+                if self.deck: p.hand.append(self.deck.pop())
+
+        self.meadow: array = array('B')  # To jest nasza Łąka (Rynek)
+        self.refill_meadow()
+        self.locations: List[LocationSpot] = [LocationSpot(n, g, e, k) for n, g, e, k in LOCATION_DEFS]
+
+        self.info_msg = "Zaczyna Gracz 1 (ZIMA)."
+        self.over = False
+        self.winner_text = ""
+        self.duration = 0.0
+        self.turn_hook: Optional[Callable[["GameState"], None]] = None  # Wołane na koniec każdej tury (autozapis)
+
+    @property
+    def current_player(self) -> Player:
+        #Zwraca obiekt gracza, którego jest teraz kolej.
+        return self.players[self.turn_idx]
+
+    def meadow_card(self, index: int) -> Card:
+        return CARDS[self.meadow[index]]
+
+    def hand_card(self, index: int) -> Card:
+        return CARDS[self.current_player.hand[index]]
+
+    def __getstate__(self) -> dict:
+        # Pickle (stan wysyłany do procesów AI) bez turn_hook - autozapis należy do procesu gry,
+        # a hook bywa lambdą, której nie da się przesłać
+        state = self.__dict__.copy()
+        state["turn_hook"] = None
+        return state
+
+    def clone(self) -> "GameState":
+        #Tania kopia stanu dla wyszukiwania i symulacji (zamiast copy.deepcopy).
+        g = GameState.__new__(GameState)
+        g.__dict__.update(self.__dict__)
+        g.deck, g.meadow = array('B', self.deck), array('B', self.meadow)
+        g.log = bytearray(self.log)
+        g.turn_hook = None  # Symulacje nie zapisują gry
+        g.players = [p.clone() for p in self.players]
+        remap = {id(old): new for old, new in zip(self.players, g.players)}
+        g.locations = [LocationSpot(loc.name, loc.gain, loc.exclusive, loc.image_key,
+                                    remap[id(loc.occupant)] if loc.occupant else None) for loc in self.locations]
+        return g
+
+    def refill_meadow(self) -> None:
+        #Dopycha karty na rynku do 8 sztuk.
+        while len(self.meadow) < MEADOW_SIZE and self.deck:
+            self.meadow.append(self.deck.pop())
+
+    def legal_actions(self) -> List[Action]:
+        #Lista akcji, które aktualny gracz może wykonać (dla botów i symulacji).
+        if self.over:
+            return []
+        p = self.current_player
+        actions: List[Action] = []
+        if p.workers_available == 0:
+            actions.append(Action(ActionType.NEXT_SEASON))
+        else:
+            actions += [Action(ActionType.PLACE_WORKER, i) for i, loc in enumerate(self.locations)
+                        if not (loc.exclusive and loc.occupant)]
+        if len(p.hand) < HAND_LIMIT:
+            actions += [Action(ActionType.BUY, i) for i, c in enumerate(self.meadow) if p.can_afford(CARDS[c])]
+        if len(p.city) < CITY_LIMIT:
+            actions += [Action(ActionType.PLAY, i) for i in range(len(p.hand))]
+        return actions
+
+    def canonical_key(self) -> Tuple:
+        # Klucz stanu dla tablicy transpozycji (MCTS): ręka, miasto, łąka i talia jako multizbiory
+        # (kolejność nie zmienia sytuacji w grze, a kolejność talii i tak jest nieznana), do tego zasoby,
+        # pory roku, robotnicy, zajętość lokacji i czyja tura. Różne kolejności ruchów -> ten sam klucz.
+        players = tuple((tuple(p.resources[r] for r in RESOURCE_ORDER),
+                         tuple(sorted(p.hand)), tuple(sorted(p.city)),
+                         p.season, p.workers_total, p.workers_available, p.finished) for p in self.players)
+        occupancy = tuple(self.players.index(loc.occupant) if loc.occupant else -1 for loc in self.locations)
+        return (self.turn_idx, self.over, players, occupancy,
+                tuple(sorted(self.meadow)), tuple(sorted(self.deck)))
+
+    def action_key(self, action: Action) -> Tuple:
+        #Akcja opisana tym, co robi (id karty), a nie indeksem - kupno jednej z dwóch Farm to ten sam ruch.
+        match action.kind:
+            case ActionType.BUY:
+                return action.kind, self.meadow[action.index]
+            case ActionType.PLAY:
+                return action.kind, self.current_player.hand[action.index]
+            case ActionType.PLACE_WORKER:
+                return action.kind, action.index
+        return (action.kind,)
+
+    def apply(self, action: Action) -> bool:
+        #Wykonuje akcję aktualnego gracza. Zwraca False, jeśli akcja była niedozwolona.
+        if self.over:
+            return False
+        # Pattern Matching - rozdzielamy akcje po rodzaju
+        match action.kind:
+            case ActionType.NEXT_SEASON:
+                done = self.request_next_season()
+            case ActionType.PLACE_WORKER:
+                done = self.place_worker(action.index)
+            case ActionType.BUY:
+                done = self.buy_from_market(action.index)
+            case ActionType.PLAY:
+                done = self.play_from_hand(action.index)
+            case _:
+                done = False
+        # Do logu trafiają tylko wykonane akcje - odrzucone nie zmieniają stanu gry
+        if done:
+            self.log.append(action.code)
+            # Każda wykonana akcja kończy się next_turn (albo końcem gry), więc to koniec tury -
+            # hak wołamy dopiero tutaj, żeby zapisany stan zawierał już wpis w logu
+            if self.turn_hook: self.turn_hook(self)
+        return done
+
+    def next_turn(self) -> None:
+        #Przekazanie pałeczki następnemu graczowi.#
+        # Funkcja all - szybkie sprawdzenie czy wszyscy skończyli grę
+        if all(p.finished for p in self.players):
+            self.calc_winner()
+            return
+
+        # Przełączamy indeks gracza (modulo 2)
+        self.turn_idx = (self.turn_idx + 1) % 2
+
+        # Jak następny gracz już spasował, to wracamy do poprzedniego
+        if self.current_player.finished:
+            self.turn_idx = (self.turn_idx + 1) % 2
+            if self.current_player.finished:  # Zabezpieczenie jakby obaj skończyli
+                self.calc_winner()
+                return
+
+        p = self.current_player
+        self.info_msg = f"Tura: {p.name} ({p.season})"
+
+    def calc_winner(self) -> None:
+        #Podliczenie punktów - sam wynik, bez przełączania scen.
+        p1, p2 = self.players
+        self.duration = time.time() - self.start_time
+
+        # Wyrażenie warunkowe - ustalamy tekst wyniku w jednej linii
+        self.winner_text = f"WYGRAŁ: {p1.name}!" if p1.score > p2.score else (
+            f"WYGRAŁ: {p2.name}!" if p2.score > p1.score else "REMIS!")
+        self.over = True
+
+    def request_next_season(self) -> bool:
+        #Zmiana pory roku jest możliwa dopiero po wysłaniu wszystkich robotników.
+        if self.current_player.workers_available != 0:
+            self.info_msg = "Masz jeszcze robotników!"
+            return False
+        self.prepare_season()
+        return True
+
+    def prepare_season(self) -> None:
+        #Obsługa zmiany pory roku - reset workerów i bonusy.
+        p = self.current_player
+        # Zdejmujemy pionki z planszy
+        for loc in self.locations:
+            if loc.occupant == p: loc.occupant = None
+
+        # Pattern Matching (match/case) - maszyna stanów dla sezonów
+        match p.season:
+            case "ZIMA":
+                p.season = "WIOSNA";
+                p.workers_total += 1
+                if p.activate_production(): self.info_msg = "Wiosna: Produkcja aktywna!"
+            case "WIOSNA":
+                p.season = "LATO";
+                p.workers_total += 1
+                # W lecie dobieramy 2 karty
+                for _ in range(2):
+                    if self.deck: p.hand.append(self.deck.pop())
+            case "LATO":
+                p.season = "JESIEŃ";
+                p.workers_total += 2
+                if p.activate_production(): self.info_msg = "Jesień: Produkcja aktywna!"
+            case "JESIEŃ":
+                p.finished = True;
+                p.workers_total = 0;
+                self.info_msg = f"{p.name} zakończył grę."
+                self.next_turn();
+                return
+
+        p.workers_available = p.workers_total
+        self.next_turn()
+
+    def place_worker(self, index: int) -> bool:
+        #Worker Placement - wysłanie robotnika na lokację.
+        p = self.current_player
+        if p.workers_available <= 0 or not 0 <= index < len(self.locations):
+            return False
+        loc = self.locations[index]
+        # Sprawdzamy czy miejsce wolne
+        if loc.exclusive and loc.occupant: self.info_msg = "Zajęte!"; return False
+
+        # Dajemy nagrodę
+        if "cards" in loc.gain:
+            for _ in range(loc.gain["cards"]):
+                if self.deck and len(p.hand) < MEADOW_DRAW_LIMIT: p.hand.append(self.deck.pop())
+        else:
+            p.gain_resources(loc.gain)
+
+        # Zajmujemy pole i koniec akcji
+        if loc.exclusive: loc.occupant = p
+        p.workers_available -= 1;
+        self.next_turn()
+        return True
+
+    def buy_from_market(self, index: int) -> bool:
+        #Logika kupowania: pobiera surowce i przenosi kartę do ręki.
+        p = self.current_player
+        if not 0 <= index < len(self.meadow):
+            return False
+        card = self.meadow_card(index)
+        if len(p.hand) >= HAND_LIMIT: self.info_msg = "Pełna ręka!"; return False
+        if p.can_afford(card):
+            is_free = p.pay(card)  # Pobranie surowców
+            p.hand.append(card.id)  # Dodanie do ręki
+            self.meadow.pop(index);
+            self.refill_meadow()  # Usunięcie z rynku
+            self.info_msg = f"Kupiono {card.name}." + (" (FREE)" if is_free else "")
+            self.next_turn()
+            return True
+        self.info_msg = "Nie stać Cię!"
+        return False
+
+    def play_from_hand(self, index: int) -> bool:
+        #Logika zagrywania: z ręki do miasta (za darmo, ale zużywa akcję).
+        p = self.current_player
+        if not 0 <= index < len(p.hand):
+            return False
+        card = CARDS[p.hand[index]]
+        if len(p.city) >= CITY_LIMIT: self.info_msg = "Miasto pełne!"; return False
+
+        # Sprawdzamy pasywne bonusy (niebieskie karty)
+        for msg in p.check_triggers(card):
+            if msg.startswith("DRAW_CARD:"):
+                for _ in range(int(msg.split(":")[1])):
+                    if self.deck and len(p.hand) < HAND_LIMIT: p.hand.append(self.deck.pop())
+
+        p.add_to_city(card);
+        p.hand.pop(index)
+        p.stats["cards_played"] += 1
+
+        # Odpalamy produkcję natychmiastową (zielone karty)
+        if card.type == CardType.PROD: p.gain_tuple(card.benefit)
+
+        self.info_msg = f"Zagrałeś {card.name}."
+        self.next_turn()
+        return True
@@ -0,0 +1,463 @@
+# engine/host.py
+# Serwer wielu gier w jednym procesie (bez okna, bez pygame): ten sam protokół co engine.net, ale zamiast
+# jednego GameServer - słownik sesji po numerze gry. Sesja to sam GameState + połączenia graczy, bez
+# żadnych obiektów UI. Akcja trafia do gry przez słownik handlerów i powiązanie połączenia z sesją (O(1)).
+# Gry bez ruchu dłużej niż SESSION_IDLE_S są usypiane: stan idzie na dysk (~250 bajtów), w pamięci
+# zostaje tylko numer i połączenia. Ruch albo powrót gracza budzi grę z pliku. Gra porzucona przez
+# obu graczy znika po SESSION_EXPIRE_S. Numer gry jest losowy i niezależny od ziarna talii -
+# ziarno zostaje na serwerze.
+#
+#   python -m engine.host serve --port 7777              -> serwer gier, klienci: python main.py --connect ...
+#   python -m engine.host bench --sessions 10000         -> przepustowość akcji, pamięć, usypianie (bez sieci)
+import argparse
+import asyncio
+import json
+import os
+import queue
+import random
+import secrets
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from settings import REPLAY_DIR, SESSION_DIR, SESSION_IDLE_S, SESSION_EXPIRE_S
+from engine.game_state import GameState, Action, LOCATION_DEFS
+from engine.card import CARDS, RESOURCE_ORDER
+from engine.net import (DEFAULT_PORT, MSG_HELLO, MSG_WELCOME, MSG_ACTION, MSG_REJECT, ACTION, REJECT, SESSION, WELCOME,
+                        _Conn, delta_frame, field_bytes, frame, public_snapshot, read_frame)
+from engine.replay import ReplayWriter
+from engine.snapshot import dumps, loads, write_atomic, SEASONS, _text
+
+EXT = ".fvs"
+
+
+class Session:
+    # Jedna gra. Uśpiona (state = None) zajmuje tylko ten obiekt - stan jest w pliku albo jeszcze w blob.
+    __slots__ = ("id", "state", "blob", "fields", "conns", "over", "last_active")
+
+    def __init__(self, sid: int, state: Optional[GameState]):
+        self.id = sid
+        self.state = state
+        self.blob: Optional[bytes] = None  # Zserializowany stan, dopóki wątek zapisu nie skończy
+        self.fields: Optional[List[bytes]] = field_bytes(state) if state else None  # Ostatnio wysłana wersja
+        self.conns: List[Optional["_Seat"]] = [None, None]
+        self.over = bool(state and state.over)
+        self.last_active = time.monotonic()
+
+
+class _Seat(_Conn):
+    # Połączenie związane z miejscem w konkretnej sesji - akcja nie szuka gry po numerze
+    def __init__(self, writer: asyncio.StreamWriter, lag: float):
+        super().__init__(writer, lag)
+        self.session: Optional[Session] = None
+        self.seat = 0
+
+
+def deep_size(obj, seen: set) -> int:
+    #Przybliżony rozmiar obiektu razem ze wszystkim, do czego prowadzi (bez obiektów z seen).
+    total, stack = 0, [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack += o.keys()
+            stack += o.values()
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack += o
+        elif not isinstance(o, (str, bytes, bytearray, array, int, float)):
+            if hasattr(o, "__dict__"):
+                stack.append(o.__dict__)
+            for cls in type(o).__mro__:
+                slots = cls.__dict__.get("__slots__", ())
+                for name in (slots,) if isinstance(slots, str) else slots:
+                    if hasattr(o, name):
+                        stack.append(getattr(o, name))
+    return total
+
+
+def max_rss_kb() -> Optional[int]:
+    #Szczytowa pamięć procesu (RSS); None tam, gdzie nie ma modułu resource (Windows).
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _shared_ids() -> set:
+    # Obiekty wspólne dla wszystkich gier (prototypy kart, lokacje, nazwy surowców i pór roku, małe inty) -
+    # nie wliczamy ich do pamięci pojedynczej sesji
+    seen: set = set()
+    for obj in (CARDS, LOCATION_DEFS, RESOURCE_ORDER, SEASONS, None, True, False, *range(-5, 257)):
+        deep_size(obj, seen)
+    return seen
+
+
+class SessionHost:
+    def __init__(self, directory: str = SESSION_DIR, idle_after: float = SESSION_IDLE_S, lag: float = 0.0,
+                 record: bool = True, expire_after: float = SESSION_EXPIRE_S):
+        self.directory = directory
+        self.idle_after = idle_after
+        self.expire_after = expire_after
+        self.lag = lag
+        self.record = record and REPLAY_DIR is not None
+        self.sessions: Dict[int, Session] = {}
+        self.waiting: Optional[Session] = None  # Nowa gra czekająca na drugiego gracza
+        self.handlers: Dict[int, Callable[[_Seat, bytes], None]] = {MSG_HELLO: self.on_hello,
+                                                                     MSG_ACTION: self.on_action}
+        self.actions = self.evictions = self.restores = self.expired = 0
+        self.action_s = 0.0
+        self._sweeper_task: Optional[asyncio.Task] = None
+        # Jeden wątek zapisu - kolejne zapisy tej samej gry trafiają na dysk w kolejności zlecenia
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-io")
+        self._written: queue.SimpleQueue = queue.SimpleQueue()
+        self._shared = _shared_ids()
+
+    def path(self, sid: int) -> str:
+        return os.path.join(self.directory, f"{sid:08x}{EXT}")
+
+    # --- Sesje ---
+    def create(self, seed: Optional[int] = None) -> Session:
+        # Numer gry widzą gracze (--session), więc nie może nic mówić o talii - losujemy go osobno
+        sid = secrets.randbits(32)
+        while sid == 0 or sid in self.sessions or os.path.exists(self.path(sid)):
+            sid = secrets.randbits(32)
+        session = self.sessions[sid] = Session(sid, GameState(seed))
+        return session
+
+    def find(self, sid: int) -> Optional[Session]:
+        # Gra uśpiona przez poprzedni proces serwera też jest do podjęcia - wystarczy jej plik
+        session = self.sessions.get(sid)
+        if session is None and os.path.exists(self.path(sid)):
+            session = self.sessions[sid] = Session(sid, None)
+        return session
+
+    def wake(self, session: Session) -> GameState:
+        if session.state is None:
+            data = session.blob
+            if data is None:
+                with open(self.path(session.id), "rb") as f:  # ~250 bajtów, zwykle z cache systemu plików
+                    data = f.read()
+            session.state, _ = loads(data)
+            session.blob = None
+            session.fields = field_bytes(session.state)  # Te same bajty, które klienci już mają
+            self.restores += 1
+        session.last_active = time.monotonic()
+        return session.state
+
+    def evict(self, session: Session) -> None:
+        # Serializacja tutaj (kilkanaście µs), zapis w wątku; do czasu zapisu stan trzyma blob
+        session.blob = blob = dumps(session.state)
+        session.state = session.fields = None
+        self._io.submit(self._write, session, blob)
+        self.evictions += 1
+
+    def _write(self, session: Session, blob: bytes) -> None:
+        try:
+            write_atomic(self.path(session.id), blob)
+            self._written.put((session, blob))
+        except OSError as e:
+            print(f"Błąd zapisu sesji {session.id:08x}: {e}")  # blob zostaje w pamięci
+
+    def collect_written(self) -> None:
+        # Zwolnienie blobów już zapisanych - tylko w wątku pętli, żeby nie ścigać się z wake/evict
+        while True:
+            try:
+                session, blob = self._written.get_nowait()
+            except queue.Empty:
+                return
+            if session.blob is blob:
+                session.blob = None
+
+    def drop(self, session: Session) -> None:
+        del self.sessions[session.id]
+        self._io.submit(self._remove, self.path(session.id))  # Plik mógł zostać z wcześniejszego uśpienia
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def sweep(self) -> None:
+        #Usypia gry bez ruchu, usuwa skończone, które wszyscy już opuścili, i porzucone w trakcie.
+        self.collect_written()
+        now = time.monotonic()
+        deadline, expired = now - self.idle_after, now - self.expire_after
+        for session in list(self.sessions.values()):
+            if session.last_active > deadline:
+                continue
+            if not any(session.conns) and (session.over or session.last_active <= expired):
+                if not session.over: self.expired += 1
+                self.drop(session)
+            elif session.state is not None:
+                self.evict(session)
+
+    def expire_files(self) -> None:
+        # Pliki gier uśpionych przez poprzedni proces serwera, do których nikt nie wrócił
+        deadline = time.time() - self.expire_after
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(EXT) and os.path.getmtime(path) <= deadline:
+                self._remove(path)
+                self.expired += 1
+
+    def flush(self) -> None:
+        self._io.submit(lambda: None).result()
+        self.collect_written()
+
+    # --- Rozgrywka ---
+    def act(self, session: Session, seat: int, seq: int, code: int) -> bytes:
+        #Wykonuje akcję gracza; zwraca ramkę do rozesłania (delta) albo odpowiedź dla niego (odrzucenie).
+        start = time.perf_counter()
+        state = self.wake(session)
+        if state.over or state.turn_idx != seat:
+            return frame(MSG_REJECT, REJECT.pack(seq) + _text("Nie twoja tura!"))
+        try:
+            action = Action.from_code(code)
+        except ValueError:
+            return frame(MSG_REJECT, REJECT.pack(seq) + _text("Nieznana akcja!"))
+        if not state.apply(action):
+            return frame(MSG_REJECT, REJECT.pack(seq) + _text(state.info_msg))
+        session.fields, data = delta_frame(state, session.fields, seat, seq)
+        if state.over:
+            session.over = True
+            if self.record:
+                self._io.submit(self._save_replay, state, bytes(state.log))
+        self.actions += 1
+        self.action_s += time.perf_counter() - start
+        return data
+
+    @staticmethod
+    def _save_replay(state: GameState, log: bytes) -> None:
+        # Plik powtórki dopiero po końcu gry - przy tysiącach gier nie trzymamy otwartego pliku na każdą
+        writer = ReplayWriter.for_game(state, REPLAY_DIR)
+        writer.sync(log)
+        writer.close()
+
+    # --- Sieć ---
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        os.makedirs(self.directory, exist_ok=True)
+        self.expire_files()
+        self._sweeper_task = asyncio.create_task(self._sweeper())  # Referencja - inaczej GC może zabrać zadanie
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def _sweeper(self) -> None:
+        while True:
+            await asyncio.sleep(max(0.5, min(self.idle_after / 4, 5.0)))
+            self.sweep()
+
+    def close(self) -> None:
+        #Zatrzymuje sprzątanie i czeka na zaległe zapisy (koniec pracy serwera).
+        if self._sweeper_task:
+            self._sweeper_task.cancel()
+            self._sweeper_task = None
+        self.flush()
+        self._io.shutdown()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        conn = _Seat(writer, self.lag)
+        try:
+            while True:
+                msg_type, payload = await read_frame(reader)
+                handler = self.handlers.get(msg_type)
+                if handler:
+                    handler(conn, payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (ValueError, struct.error) as e:
+            # Nieczytelna ramka - rozłączamy tylko tego gracza, jego miejsce w grze czeka na powrót
+            print(f"Błędna wiadomość od klienta: {e}")
+        finally:
+            self.leave(conn)
+            conn.close()
+
+    def on_hello(self, conn: _Seat, payload: bytes) -> None:
+        if conn.session is not None:
+            return
+        if payload:
+            # Powrót do konkretnej gry (numer z WELCOME przy pierwszym połączeniu)
+            (sid,) = SESSION.unpack(payload)
+            session = self.find(sid)
+            if session is None or None not in session.conns:
+                conn.close()
+                return
+        else:
+            session = self.waiting if self.waiting and None in self.waiting.conns else self.create()
+            self.waiting = session if session.conns.count(None) == 2 else None
+        state = self.wake(session)
+        conn.session, conn.seat = session, session.conns.index(None)
+        session.conns[conn.seat] = conn
+        conn.send(frame(MSG_WELCOME, WELCOME.pack(conn.seat, session.id) + public_snapshot(state)))
+
+    def on_action(self, conn: _Seat, payload: bytes) -> None:
+        session = conn.session
+        if session is None:
+            return
+        seq, code = ACTION.unpack(payload)
+        if None in session.conns:
+            conn.send(frame(MSG_REJECT, REJECT.pack(seq) + _text("Czekamy na drugiego gracza...")))
+            return
+        data = self.act(session, conn.seat, seq, code)
+        if data[2] == MSG_REJECT:
+            conn.send(data)
+        else:
+            for c in session.conns:
+                c.send(data)
+
+    def leave(self, conn: _Seat) -> None:
+        session = conn.session
+        if session is None:
+            return
+        session.conns[conn.seat] = None
+        session.last_active = time.monotonic()
+        if self.waiting is session and not any(session.conns):
+            self.waiting = None
+        conn.session = None
+
+    # --- Raport ---
+    def session_bytes(self, session: Session) -> int:
+        seen = set(self._shared)
+        seen.update(id(c) for c in session.conns if c)  # Połączenia to koszt sieci, nie gry
+        return deep_size(session, seen)
+
+    def report(self, top: int = 5) -> Dict:
+        #Pamięć per sesja (przybliżona, z sys.getsizeof) i liczniki hosta.
+        now = time.monotonic()
+        sizes = [(self.session_bytes(s), s) for s in self.sessions.values()]
+        resident = [b for b, s in sizes if s.state is not None]
+        asleep = [b for b, s in sizes if s.state is None]
+        sizes.sort(key=lambda x: x[0], reverse=True)
+        return {
+            "sessions": len(sizes),
+            "resident": len(resident),
+            "evicted": len(asleep),
+            "connected": sum(c is not None for s in self.sessions.values() for c in s.conns),
+            "bytes_total": sum(resident) + sum(asleep),
+            "bytes_per_resident": round(sum(resident) / len(resident)) if resident else 0,
+            "bytes_per_evicted": round(sum(asleep) / len(asleep)) if asleep else 0,
+            "actions": self.actions,
+            "action_us_mean": round(self.action_s / self.actions * 1e6, 2) if self.actions else 0.0,
+            "evictions": self.evictions,
+            "restores": self.restores,
+            "expired": self.expired,
+            "max_rss_kb": max_rss_kb(),
+            "largest": [{"id": f"{s.id:08x}", "bytes": b, "resident": s.state is not None,
+                         "idle_s": round(now - s.last_active, 1)} for b, s in sizes[:top]],
+        }
+
+
+async def serve(host: str, port: int, directory: str, idle_after: float, expire_after: float,
+                report_every: float) -> None:
+    game_host = SessionHost(directory, idle_after, expire_after=expire_after)
+    srv = await game_host.start(host, port)
+    print(f"Serwer gier na {host}:{port}, usypianie po {idle_after:g} s bezczynności, porzucone gry "
+          f"usuwane po {expire_after:g} s -> {directory}/")
+    try:
+        async with srv:
+            while True:
+                await asyncio.sleep(report_every)
+                r = game_host.report(top=0)
+                print(f"sesje {r['sessions']} (aktywne {r['resident']}, uśpione {r['evicted']}, "
+                      f"wygasłe {r['expired']}), gracze {r['connected']}, "
+                      f"pamięć {r['bytes_total'] / 1024:.0f} KB (~{r['bytes_per_resident']} B/grę, "
+                      f"{r['bytes_per_evicted']} B/uśpioną), akcja {r['action_us_mean']} µs")
+    finally:
+        game_host.close()
+
+
+def percentile_us(values: List[int], q: float) -> float:
+    return round(values[min(len(values) - 1, int(q * len(values)))] / 1000, 2)
+
+
+def bench(n_sessions: int, moves: int, seed: int) -> Dict:
+    # Cała ścieżka akcji bez sieci: N gier, w każdej kilka losowych ruchów, potem uśpienie wszystkich
+    # i obudzenie części - ze sprawdzeniem, że stan po powrocie z dysku jest identyczny.
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        game_host = SessionHost(directory, idle_after=0, record=False)
+        start = time.perf_counter()
+        sessions = [game_host.create(seed + i) for i in range(n_sessions)]
+        create_s = time.perf_counter() - start
+
+        latencies: List[int] = []
+        for i in range(moves):
+            for session in sessions:
+                state = session.state
+                if state.over:
+                    continue
+                code = rng.choice(state.legal_actions()).code
+                t = time.perf_counter_ns()
+                game_host.act(session, state.turn_idx, i, code)
+                latencies.append(time.perf_counter_ns() - t)
+        latencies.sort()
+        resident = game_host.report(top=0)
+
+        keys = {s.id: s.state.canonical_key() for s in sessions}
+        t = time.perf_counter()
+        game_host.sweep()
+        evict_s = time.perf_counter() - t
+        game_host.flush()
+        asleep = game_host.report(top=0)
+
+        sample = sessions[::max(1, n_sessions // 1000)]
+        wake_ns: List[int] = []
+        for session in sample:
+            t = time.perf_counter_ns()
+            game_host.wake(session)
+            wake_ns.append(time.perf_counter_ns() - t)
+        wake_ns.sort()
+        identical = all(s.state.canonical_key() == keys[s.id] for s in sample)
+
+    return {
+        "sessions": n_sessions,
+        "create_us": round(create_s / n_sessions * 1e6, 2),
+        "actions": len(latencies),
+        "action_us": {"p50": percentile_us(latencies, 0.50), "p99": percentile_us(latencies, 0.99),
+                      "mean": round(sum(latencies) / len(latencies) / 1000, 2)},
+        "bytes_per_resident": resident["bytes_per_resident"],
+        "bytes_per_evicted": asleep["bytes_per_evicted"],
+        "resident_mb": round(resident["bytes_total"] / 2 ** 20, 2),
+        "evicted_mb": round(asleep["bytes_total"] / 2 ** 20, 2),
+        "evict_us": round(evict_s / n_sessions * 1e6, 2),
+        "wake_us": {"p50": percentile_us(wake_ns, 0.50), "p99": percentile_us(wake_ns, 0.99)},
+        "wake_identical": identical,
+        "max_rss_kb": asleep["max_rss_kb"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serwer wielu gier Forest Valley (bez okna).")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_serve = sub.add_parser("serve", help="uruchom serwer gier")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_serve.add_argument("--dir", default=SESSION_DIR, help="katalog uśpionych gier")
+    p_serve.add_argument("--idle", type=float, default=SESSION_IDLE_S, help="usypianie po tylu sekundach")
+    p_serve.add_argument("--expire", type=float, default=SESSION_EXPIRE_S,
+                         help="gra porzucona przez obu graczy znika po tylu sekundach")
+    p_serve.add_argument("--report", type=float, default=30.0, help="co ile sekund wypisać statystyki")
+    p_bench = sub.add_parser("bench", help="akcje, pamięć i usypianie N gier (bez sieci)")
+    p_bench.add_argument("--sessions", type=int, default=10000)
+    p_bench.add_argument("--moves", type=int, default=20, help="ruchów na grę")
+    p_bench.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.cmd == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, args.dir, args.idle, args.expire, args.report))
+        except KeyboardInterrupt:
+            pass
+    else:
+        print(json.dumps(bench(args.sessions, args.moves, args.seed), indent=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# engine/loading.py
+import pygame
+from settings import *
+from engine.fonts import render_text
+
+
+class LoadingScene:
+    # Ekran ładowania - pokazuje postęp AssetLoadera, dopóki grafiki wczytują się w tle
+    def __init__(self, app):
+        self.app = app
+        self.bar = pygame.Rect(0, 0, 400, 20)
+        self.update_layout()
+
+    def update_layout(self) -> None:
+        self.bar.center = (self.app.width // 2, self.app.height // 2 + 40)
+
+    def draw(self) -> None:
+        screen = self.app.screen
+        screen.fill(BG_COLOR)
+
+        title = render_text(self.app.title_font, "FOREST VALLEY", GOLD)
+        screen.blit(title, title.get_rect(center=(self.app.width // 2, self.app.height // 2 - 20)))
+
+        pct = self.app.loader.progress
+        pygame.draw.rect(screen, (60, 60, 60), self.bar, border_radius=5)
+        pygame.draw.rect(screen, GOLD, (self.bar.x, self.bar.y, int(self.bar.width * pct), self.bar.height),
+                         border_radius=5)
+        lbl = render_text(self.app.font, f"Ładowanie... {int(pct * 100)}%", WHITE)
+        screen.blit(lbl, lbl.get_rect(center=(self.bar.centerx, self.bar.bottom + 20)))
+
+        # Pasek się rusza - dopóki trwa ładowanie, prosimy o kolejne klatki (tylko ten fragment ekranu)
+        self.app.invalidate(self.bar.inflate(0, 60))
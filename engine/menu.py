@@ -1,6 +1,8 @@
 # engine/menu.py
 import pygame
 from settings import *
+from engine.fonts import render_text
+from engine.ui import UITree
 
 
 class Menu:
@@ -9,35 +11,16 @@ class Menu:
         self.state = "MAIN"
 
         #TŁO MENU
-        self.bg_original = None
         self.bg_image = None
-        try:
-            self.bg_original = pygame.image.load("assets/menu_bg.png")
-        except FileNotFoundError:
-            pass
 
-        # --- GRAFIKI PRZYCISKÓW ---
-        self.btn_images = {}
+        # --- GRAFIKI PRZYCISKÓW --- (wczytane i przeskalowane przez AssetLoader)
+        self.btn_images = self.app.assets.group("buttons")
 
         # KONFIGURACJA WYMIARÓW
         self.BTN_W = 300
         self.BTN_H = 110
         self.GAP = 5
 
-        files = {
-            "play": "play.png",
-            "setting": "setting.png",
-            "quit": "quit.png"
-        }
-
-        for key, filename in files.items():
-            try:
-                img = pygame.image.load(f"assets/{filename}")
-                self.btn_images[key] = pygame.transform.smoothscale(img, (self.BTN_W, self.BTN_H))
-            except FileNotFoundError:
-                print(f"Błąd: Nie znaleziono assets/{filename}")
-                self.btn_images[key] = None
-
         # Wstępne definicje
         self.btn_start = pygame.Rect(0, 0, self.BTN_W, self.BTN_H)
         self.btn_settings = pygame.Rect(0, 0, self.BTN_W, self.BTN_H)
@@ -56,17 +39,27 @@ class Menu:
 
         self.btn_res = pygame.Rect(0, 0, 240, 50)
         self.btn_fullscreen = pygame.Rect(0, 0, 240, 50)
+        self.btn_ai = pygame.Rect(0, 0, 240, 50)
         self.btn_back = pygame.Rect(0, 0, 200, 50)
+        self.btn_resume = pygame.Rect(0, 0, 240, 50)
+
+        # Drzewo UI: przyciski obu ekranów menu z gotowymi prostokątami + indeks do kliknięć i hovera
+        self.ui = UITree()
 
         self.update_layout()
 
     def update_layout(self):
-        #Przelicza pozycje po zmianie rozmiaru okna
+        #Przelicza pozycje po zmianie rozmiaru okna (przy tym samym rozmiarze układ jest już gotowy)
+        if self.ui.resize((self.app.width, self.app.height)):
+            self.build_layout()
+        # "Wznów grę" tylko gdy na dysku jest autozapis niedokończonej gry
+        self.ui.show("resume", self.app.can_resume())
+
+    def build_layout(self):
         cx = self.app.width // 2
         cy = self.app.height // 2
 
-        if self.bg_original:
-            self.bg_image = pygame.transform.scale(self.bg_original, (self.app.width, self.app.height))
+        self.bg_image = self.app.assets.variant("backgrounds", "menu", (self.app.width, self.app.height))
 
         #UKŁADANIE BLOKU PRZYCISKÓW
         step = self.BTN_H + self.GAP
@@ -81,15 +74,39 @@ class Menu:
         self.btn_quit.centerx = cx
         self.btn_quit.centery = center_y + step
 
+        self.btn_resume.center = (cx, self.btn_quit.bottom + 35)
+
         #USTAWIENIA (UI)
         self.slider_rect.center = (cx, 250)
         self.btn_res.center = (cx, 330)
         self.btn_fullscreen.center = (cx, 400)
-        self.btn_back.center = (cx, 500)
+        self.btn_ai.center = (cx, 470)
+        self.btn_back.center = (cx, 560)
 
         # Aktualizujemy hitbox gałki (żeby po zmianie rozdzielczości była w dobrym miejscu do kliknięcia)
         self.sync_knob_to_volume()
 
+        main, settings = self.ui.group("MAIN"), self.ui.group("SETTINGS")
+        self.ui.add("play", self.btn_start, self.on_start, parent=main)
+        self.ui.add("setting", self.btn_settings, lambda n: self.set_state("SETTINGS"), parent=main)
+        self.ui.add("quit", self.btn_quit, self.on_quit, parent=main)
+        self.ui.add("resume", self.btn_resume, lambda n: self.app.resume_game(), parent=main)
+        # Suwak klikamy razem z gałką, która wystaje 5 px nad i pod pasek
+        self.ui.add("slider", self.slider_rect.inflate(0, 10), lambda n: self.update_volume(self.ui.mouse_pos[0]),
+                    parent=settings)
+        self.ui.add("res", self.btn_res, self.on_resolution, parent=settings)
+        self.ui.add("fullscreen", self.btn_fullscreen, self.on_fullscreen, parent=settings)
+        self.ui.add("ai", self.btn_ai, self.on_ai, parent=settings)
+        self.ui.add("back", self.btn_back, lambda n: self.set_state("MAIN"), parent=settings)
+        self.ui.show("SETTINGS", self.state == "SETTINGS")
+        self.ui.show("MAIN", self.state == "MAIN")
+
+    def set_state(self, state):
+        self.app.sound.play_click()
+        self.state = state
+        self.ui.show("MAIN", state == "MAIN")
+        self.ui.show("SETTINGS", state == "SETTINGS")
+
     def sync_knob_to_volume(self):
         #Pomocnicza funkcja ustawiająca gałkę idealnie wg aktualnej głośności
         current_vol = self.app.sound.volume
@@ -97,33 +114,39 @@ class Menu:
         self.slider_knob.center = (int(knob_x), self.slider_rect.centery)
 
     def handle_click(self, pos):
-        if self.state == "MAIN":
-            if self.btn_start.collidepoint(pos):
-                self.app.change_state("GAME")
-            elif self.btn_settings.collidepoint(pos):
-                self.app.sound.play_click()
-                self.state = "SETTINGS"
-            elif self.btn_quit.collidepoint(pos):
-                self.app.running = False
+        # Akcje przycisków są podpięte w drzewie UI - tu tylko trafienie w indeks
+        self.ui.hover(pos)
+        self.ui.click(pos)
 
-        elif self.state == "SETTINGS":
-            # Kliknięcie w suwak przesuwa gałkę
-            if self.slider_rect.collidepoint(pos) or self.slider_knob.collidepoint(pos):
-                self.update_volume(pos[0])
+    def on_start(self, node):
+        self.app.change_state("GAME")
+
+    def on_quit(self, node):
+        self.app.running = False
 
-            elif self.btn_res.collidepoint(pos):
-                self.app.sound.play_click()
-                self.res_idx = (self.res_idx + 1) % len(RESOLUTIONS)
-                w, h = RESOLUTIONS[self.res_idx]
-                self.app.set_resolution(w, h)
+    def on_resolution(self, node):
+        self.app.sound.play_click()
+        self.res_idx = (self.res_idx + 1) % len(RESOLUTIONS)
+        w, h = RESOLUTIONS[self.res_idx]
+        self.app.set_resolution(w, h)
 
-            elif self.btn_fullscreen.collidepoint(pos):
-                self.app.sound.play_click()
-                self.app.toggle_fullscreen()
+    def on_fullscreen(self, node):
+        self.app.sound.play_click()
+        self.app.toggle_fullscreen()
 
-            elif self.btn_back.collidepoint(pos):
-                self.app.sound.play_click()
-                self.state = "MAIN"
+    def on_ai(self, node):
+        # Przełączamy drugiego gracza między człowiekiem a komputerem (od następnej gry)
+        self.app.sound.play_click()
+        self.app.ai_seat = None if self.app.ai_seat is not None else 1
+
+    def handle_motion(self, pos, buttons):
+        self.handle_drag(pos, buttons)
+
+        # Podświetlenie przycisku zmienia się tylko przy wejściu/wyjściu kursora
+        old, new = self.ui.hover(pos)
+        if old is not new:
+            for node in (old, new):
+                if node: self.app.invalidate(node.rect.inflate(6, 6))  # +4 px na powiększony obrazek
 
     def handle_drag(self, pos, buttons):
         if self.state == "SETTINGS" and buttons[0]:
@@ -144,6 +167,9 @@ class Menu:
 
         # Od razu synchronizujemy gałkę
         self.sync_knob_to_volume()
+        # Suwak razem z etykietą głośności nad nim
+        self.app.invalidate(pygame.Rect(self.slider_rect.x - 20, self.slider_rect.y - 30,
+                                        self.slider_rect.width + 40, 50))
 
     def draw(self):
         screen = self.app.screen
@@ -158,21 +184,22 @@ class Menu:
         else:
             screen.fill(BG_COLOR)
 
-        title = self.app.title_font.render("FOREST VALLEY", True, GOLD)
-        title_shadow = self.app.title_font.render("FOREST VALLEY", True, BLACK)
+        title = render_text(self.app.title_font, "FOREST VALLEY", GOLD)
+        title_shadow = render_text(self.app.title_font, "FOREST VALLEY", BLACK)
         t_pos = (self.app.width // 2 - title.get_width() // 2, 50)
         screen.blit(title_shadow, (t_pos[0] + 2, t_pos[1] + 2))
         screen.blit(title, t_pos)
 
         if self.state == "MAIN":
-            self.draw_img_btn(screen, self.btn_start, "play")
-            self.draw_img_btn(screen, self.btn_settings, "setting")
-            self.draw_img_btn(screen, self.btn_quit, "quit")
+            for key in ("play", "setting", "quit"):
+                self.draw_img_btn(screen, self.ui[key].rect, key)
+            if self.ui["resume"].visible:
+                self.draw_standard_btn(screen, self.btn_resume, "WZNÓW GRĘ", (50, 110, 50), "resume")
 
         elif self.state == "SETTINGS":
             self.sync_knob_to_volume()
 
-            lbl_vol = self.app.font.render(f"Głośność: {int(self.app.sound.volume * 100)}%", True, WHITE)
+            lbl_vol = render_text(self.app.font, f"Głośność: {int(self.app.sound.volume * 100)}%", WHITE)
             screen.blit(lbl_vol, (self.slider_rect.x, self.slider_rect.y - 25))
 
             pygame.draw.rect(screen, (100, 100, 100), self.slider_rect, border_radius=5)
@@ -180,39 +207,43 @@ class Menu:
 
             # Przycisk Rozdzielczości
             w, h = RESOLUTIONS[self.res_idx]
-            self.draw_standard_btn(screen, self.btn_res, f"Rozdzielczość: {w}x{h}", (60, 60, 80))
+            self.draw_standard_btn(screen, self.btn_res, f"Rozdzielczość: {w}x{h}", (60, 60, 80), "res")
 
             # Przycisk Fullscreen
             fs_txt = "Pełny Ekran: TAK" if self.app.fullscreen else "Pełny Ekran: NIE"
             col_fs = (50, 150, 50) if self.app.fullscreen else (150, 50, 50)
-            self.draw_standard_btn(screen, self.btn_fullscreen, fs_txt, col_fs)
+            self.draw_standard_btn(screen, self.btn_fullscreen, fs_txt, col_fs, "fullscreen")
+
+            # Przycisk Przeciwnik
+            ai_txt = "Gracz 2: KOMPUTER" if self.app.ai_seat is not None else "Gracz 2: CZŁOWIEK"
+            self.draw_standard_btn(screen, self.btn_ai, ai_txt, (60, 60, 80), "ai")
 
             # Przycisk Powrót
-            self.draw_standard_btn(screen, self.btn_back, "WRÓĆ", (100, 100, 100))
+            self.draw_standard_btn(screen, self.btn_back, "WRÓĆ", (100, 100, 100), "back")
 
     def draw_img_btn(self, screen, rect, img_key):
         img = self.btn_images.get(img_key)
-        is_hovered = rect.collidepoint(pygame.mouse.get_pos())
+        is_hovered = self.ui.is_hovered(img_key)
 
         if img:
             if is_hovered:
                 w, h = rect.width + 4, rect.height + 4
-                scaled = pygame.transform.smoothscale(img, (w, h))
+                scaled = self.app.assets.variant("buttons", img_key, (w, h), smooth=True)
                 new_rect = scaled.get_rect(center=rect.center)
                 screen.blit(scaled, new_rect)
             else:
                 screen.blit(img, rect)
         else:
-            self.draw_standard_btn(screen, rect, img_key.upper(), (100, 100, 100))
+            self.draw_standard_btn(screen, rect, img_key.upper(), (100, 100, 100), img_key)
 
-    def draw_standard_btn(self, screen, rect, text, color):
-        if rect.collidepoint(pygame.mouse.get_pos()):
+    def draw_standard_btn(self, screen, rect, text, color, key=None):
+        if key and self.ui.is_hovered(key):
             color = (min(color[0] + 30, 255), min(color[1] + 30, 255), min(color[2] + 30, 255))
         s = pygame.Surface((rect.width, rect.height))
         s.set_alpha(230)
         s.fill(color)
         screen.blit(s, (rect.x, rect.y))
         pygame.draw.rect(screen, WHITE, rect, 2)
-        txt_surf = self.app.font.render(text, True, WHITE)
+        txt_surf = render_text(self.app.font, text, WHITE)
         txt_rect = txt_surf.get_rect(center=rect.center)
         screen.blit(txt_surf, txt_rect)
\ No newline at end of file
@@ -0,0 +1,439 @@
+# engine/net.py
+# Gra sieciowa dla dwóch graczy: serwer asyncio trzyma autorytatywny GameState, klienci wysyłają akcje
+# (Action.code, 1 bajt) i dostają tylko zmienione pola stanu (delta) w zwartym formacie binarnym.
+# Postawienie robotnika klient przewiduje u siebie od razu (client-side prediction), a gdy przyjdzie
+# odpowiedź serwera, stan jest uzgadniany - gracz nie czeka na podróż pakietu w obie strony.
+#
+#   python -m engine.net serve --port 7777          -> serwer bez okna
+#   python main.py --connect 127.0.0.1:7777         -> klient (dwa razy, po jednym na gracza)
+#   python -m engine.net loopback --lag 80          -> serwer + dwóch klientów-botów na localhost
+import argparse
+import asyncio
+import queue
+import random
+import struct
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+from settings import REPLAY_DIR
+from engine.game_state import GameState, Action, ActionType
+from engine.card import RESOURCE_ORDER
+from engine.replay import ReplayWriter
+from engine.snapshot import dumps, loads, SEASONS, _Reader, _block, _text
+
+DEFAULT_PORT = 7777
+FRAME = struct.Struct("<H")  # Długość wiadomości (typ + treść)
+
+MSG_HELLO, MSG_WELCOME, MSG_ACTION, MSG_DELTA, MSG_REJECT = range(1, 6)
+ACTION = struct.Struct("<HB")  # numer sekwencyjny klienta, Action.code
+DELTA = struct.Struct("<BHH")  # kto wykonał akcję, jego numer sekwencyjny, maska zmienionych pól
+REJECT = struct.Struct("<H")  # numer odrzuconej akcji (+ komunikat)
+SESSION = struct.Struct("<I")  # HELLO do engine.host: numer gry, do której wracamy
+WELCOME = struct.Struct("<BI")  # miejsce gracza, numer gry na serwerze wielu gier (0 = engine.net) (+ stan)
+
+_U8 = struct.Struct("<B")
+_RES = struct.Struct("<4H")
+_RESULT = struct.Struct("<Bd")  # koniec gry, czas gry (+ tekst zwycięzcy)
+_STATUS = struct.Struct("<BBBBH4I")  # pora roku, robotnicy, koniec, zagrane karty, suma zasobów
+
+# Pola delty: 5 wspólnych + po 4 na gracza (bit w masce = numer pola)
+F_TURN, F_INFO, F_MEADOW, F_LOCATIONS, F_RESULT = range(5)
+PLAYER_FIELDS = 4
+NO_SEAT = 0xFF
+
+
+def frame(msg_type: int, payload: bytes = b"") -> bytes:
+    return FRAME.pack(len(payload) + 1) + bytes((msg_type,)) + payload
+
+
+def field_bytes(state: GameState) -> List[bytes]:
+    #Każde pole stanu jako bajty - do porównania (co się zmieniło) i od razu do wysłania.
+    fields = [
+        _U8.pack(state.turn_idx),
+        _text(state.info_msg),
+        _block(state.meadow),
+        _block(bytes(state.players.index(loc.occupant) if loc.occupant else NO_SEAT for loc in state.locations)),
+        _RESULT.pack(state.over, state.duration) + _text(state.winner_text),
+    ]
+    for p in state.players:
+        fields += [
+            _RES.pack(*(p.resources[r] for r in RESOURCE_ORDER)),
+            _block(p.hand),
+            _block(p.city),
+            _STATUS.pack(SEASONS.index(p.season), p.workers_total, p.workers_available, p.finished,
+                         p.stats["cards_played"], *(p.stats["total_res"][r] for r in RESOURCE_ORDER)),
+        ]
+    return fields
+
+
+def encode_delta(old: List[bytes], new: List[bytes]) -> Tuple[int, bytes]:
+    mask, body = 0, bytearray()
+    for i, (a, b) in enumerate(zip(old, new)):
+        if a != b:
+            mask |= 1 << i
+            body += b
+    return mask, bytes(body)
+
+
+def apply_delta(state: GameState, mask: int, r: _Reader) -> None:
+    #Nakłada zmienione pola (w kolejności bitów) na lustrzany stan klienta.
+    for i in range(5 + PLAYER_FIELDS * len(state.players)):
+        if not mask >> i & 1:
+            continue
+        if i == F_TURN:
+            (state.turn_idx,) = r.unpack(_U8)
+        elif i == F_INFO:
+            state.info_msg = r.text()
+        elif i == F_MEADOW:
+            state.meadow = array('B', r.block())
+        elif i == F_LOCATIONS:
+            for loc, seat in zip(state.locations, r.block()):
+                loc.occupant = None if seat == NO_SEAT else state.players[seat]
+        elif i == F_RESULT:
+            over, state.duration = r.unpack(_RESULT)
+            state.over = bool(over)
+            state.winner_text = r.text()
+        else:
+            p = state.players[(i - 5) // PLAYER_FIELDS]
+            match (i - 5) % PLAYER_FIELDS:
+                case 0:
+                    p.resources = dict(zip(RESOURCE_ORDER, r.unpack(_RES)))
+                case 1:
+                    p.hand = array('B', r.block())
+                case 2:
+                    p.city = array('B', r.block())
+                    p.rebuild_indexes()
+                case 3:
+                    v = r.unpack(_STATUS)
+                    p.season = SEASONS[v[0]]
+                    p.workers_total, p.workers_available, p.finished = v[1], v[2], bool(v[3])
+                    p.stats = {"cards_played": v[4], "total_res": dict(zip(RESOURCE_ORDER, v[5:9]))}
+
+
+def delta_frame(state: GameState, last_fields: List[bytes], seat: int, seq: int) -> Tuple[List[bytes], bytes]:
+    #Jedna delta dla obu klientów - zmienione pola od poprzedniej wysłanej wersji stanu.
+    fields = field_bytes(state)
+    mask, body = encode_delta(last_fields, fields)
+    return fields, frame(MSG_DELTA, DELTA.pack(seat, seq, mask) + body)
+
+
+def public_snapshot(state: GameState) -> bytes:
+    # Klient nie dostaje kolejności talii - widzi to samo, co gracz przy stole. Bez ziarna i logu akcji,
+    # bo z nich replay() odtworzyłby talię co do karty (w nagłówku zapisu ziarno = 0).
+    view = state.clone()
+    view.deck = array('B')
+    view.seed = 0
+    view.log = bytearray()
+    return dumps(view)
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+    (n,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+    if n == 0:
+        raise ValueError("pusta ramka (bez typu wiadomości)")
+    data = await reader.readexactly(n)
+    return data[0], data[1:]
+
+
+class _Conn:
+    # Połączenie po stronie serwera. Wysyłka przez kolejkę i osobne zadanie, które może dodać
+    # sztuczne opóźnienie (lag) - do testowania przewidywania na localhost.
+    def __init__(self, writer: asyncio.StreamWriter, lag: float):
+        self.writer = writer
+        self.lag = lag
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._pump())
+
+    def send(self, data: bytes) -> None:
+        self.outbox.put_nowait((time.perf_counter() + self.lag, data))
+
+    async def _pump(self) -> None:
+        while True:
+            due, data = await self.outbox.get()
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.writer.write(data)
+            await self.writer.drain()
+
+    def close(self) -> None:
+        self.task.cancel()
+        self.writer.close()
+
+
+class GameServer:
+    def __init__(self, seed: Optional[int] = None, lag: float = 0.0, record: bool = True):
+        self.state = GameState(seed)
+        self.lag = lag
+        self.clients: List[Optional[_Conn]] = [None, None]
+        self.last_fields = field_bytes(self.state)
+        self.replay = ReplayWriter.for_game(self.state, REPLAY_DIR) if record and REPLAY_DIR else None
+        self.bytes_sent = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+    def send(self, seat: int, data: bytes) -> None:
+        conn = self.clients[seat]
+        if conn:
+            conn.send(data)
+            self.bytes_sent += len(data)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if None not in self.clients:
+            writer.close()  # Oba miejsca zajęte
+            return
+        seat = self.clients.index(None)
+        self.clients[seat] = conn = _Conn(writer, self.lag)
+        try:
+            while True:
+                msg_type, payload = await read_frame(reader)
+                if msg_type == MSG_HELLO:
+                    self.send(seat, frame(MSG_WELCOME, WELCOME.pack(seat, 0) + public_snapshot(self.state)))
+                elif msg_type == MSG_ACTION:
+                    seq, code = ACTION.unpack(payload)
+                    self.on_action(seat, seq, code)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (ValueError, struct.error) as e:
+            # Ramka, której nie da się odczytać - rozłączamy tylko tego klienta, gra czeka na powrót
+            print(f"Błędna wiadomość od gracza {seat}: {e}")
+        finally:
+            # Miejsce się zwalnia - ponowne połączenie dostanie pełny stan w WELCOME
+            self.clients[seat] = None
+            conn.close()
+
+    def on_action(self, seat: int, seq: int, code: int) -> None:
+        if None in self.clients:
+            return self.reject(seat, seq, "Czekamy na drugiego gracza...")
+        if self.state.over or self.state.turn_idx != seat:
+            return self.reject(seat, seq, "Nie twoja tura!")
+        try:
+            action = Action.from_code(code)
+        except ValueError:
+            return self.reject(seat, seq, "Nieznana akcja!")
+        if not self.state.apply(action):
+            return self.reject(seat, seq, self.state.info_msg)
+        if self.replay: self.replay.sync(self.state.log)
+        self.last_fields, data = delta_frame(self.state, self.last_fields, seat, seq)
+        for s in range(len(self.clients)):
+            self.send(s, data)
+
+    def reject(self, seat: int, seq: int, text: str) -> None:
+        self.send(seat, frame(MSG_REJECT, REJECT.pack(seq) + _text(text)))
+
+
+class NetClient:
+    # Klient dla pętli pygame: asyncio działa w osobnym wątku, a główny wątek woła poll() co klatkę.
+    # confirmed - lustro stanu serwera, view - to, co pokazujemy (confirmed + przewidziane ruchy).
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, session: Optional[int] = None):
+        self.host, self.port = host, port
+        self.session = session  # Numer gry na serwerze wielu gier (engine.host), None = dołącz do wolnej
+        self.seat: Optional[int] = None
+        self.confirmed: Optional[GameState] = None
+        self.view: Optional[GameState] = None
+        self.pending: List[Tuple[int, Action, bool]] = []  # Wysłane, niepotwierdzone akcje (seq, akcja, przewidziana)
+        self.accepted: List[Action] = []  # Własne akcje przyjęte przez serwer od ostatniego odczytu (np. dźwięk)
+        self.seq = 0
+        self.error: Optional[str] = None
+        self.mispredictions = 0
+        self._inbox: queue.SimpleQueue = queue.SimpleQueue()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._thread = threading.Thread(target=self._run, name="net-client", daemon=True)
+
+    def start(self) -> "NetClient":
+        self._thread.start()
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return self.view is not None
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._main())
+        except (OSError, asyncio.IncompleteReadError) as e:
+            self._inbox.put((None, str(e) or "Rozłączono"))
+        except (ValueError, struct.error) as e:
+            self._inbox.put((None, f"Błędna wiadomość serwera: {e}"))
+
+    async def _main(self) -> None:
+        reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(frame(MSG_HELLO, b"" if self.session is None else SESSION.pack(self.session)))
+        while True:
+            self._inbox.put(await read_frame(reader))
+
+    def send(self, action: Action) -> None:
+        #Wysyła akcję; postawienie robotnika od razu widać lokalnie (przewidywanie).
+        if self._writer is None:
+            return
+        self.seq = (self.seq + 1) & 0xFFFF
+        data = frame(MSG_ACTION, ACTION.pack(self.seq, action.code))
+        self._loop.call_soon_threadsafe(self._writer.write, data)
+        predicted = self.predictable(action) and self.view.apply(action)
+        self.pending.append((self.seq, action, predicted))
+
+    def predictable(self, action: Action) -> bool:
+        # Tylko robotnik na polu z surowcami - wynik zależy wyłącznie od widocznego stanu.
+        # Polana dobiera karty z talii, której klient nie zna, więc czeka na serwer.
+        if action.kind != ActionType.PLACE_WORKER or self.view.turn_idx != self.seat:
+            return False
+        return "cards" not in self.view.locations[action.index].gain
+
+    def poll(self) -> bool:
+        #Przetwarza wiadomości z serwera. Zwraca True, jeśli widok się zmienił.
+        changed = False
+        while True:
+            try:
+                msg_type, payload = self._inbox.get_nowait()
+            except queue.Empty:
+                return changed
+            changed = True
+            try:
+                self.handle(msg_type, payload)
+            except (ValueError, IndexError, struct.error) as e:
+                # Stanu nie da się dalej odtwarzać - rozłączamy się zamiast pokazywać rozjechane lustro
+                self.error = f"Błędna wiadomość serwera: {e}"
+                self.close()
+                return True
+
+    def handle(self, msg_type: Optional[int], payload) -> None:
+        if msg_type is None:
+            self.error = payload
+        elif msg_type == MSG_WELCOME:
+            self.seat, sid = WELCOME.unpack_from(payload)
+            if sid and sid != self.session:
+                self.session = sid  # Ponowne połączenie wraca do tej samej gry
+                print(f"Gra {sid:08x} na {self.host}:{self.port} - powrót: --session {sid:08x}")
+            self.confirmed, _ = loads(payload[WELCOME.size:])
+            self.pending = []
+            self.rebuild_view()
+        elif msg_type == MSG_DELTA:
+            seat, seq, mask = DELTA.unpack_from(payload)
+            r = _Reader(payload)
+            r.pos = DELTA.size
+            apply_delta(self.confirmed, mask, r)
+            if seat == self.seat:
+                self.acknowledge(seq)
+            self.rebuild_view()
+        elif msg_type == MSG_REJECT:
+            (seq,) = REJECT.unpack_from(payload)
+            r = _Reader(payload)
+            r.pos = REJECT.size
+            self.acknowledge(seq, rejected=True)
+            self.confirmed.info_msg = r.text()
+            self.rebuild_view()
+
+    def acknowledge(self, seq: int, rejected: bool = False) -> None:
+        # Odrzucony ruch, który już pokazaliśmy, to błędne przewidywanie - rebuild_view go cofnie
+        if rejected and any(s == seq and predicted for s, _, predicted in self.pending):
+            self.mispredictions += 1
+        if not rejected:
+            self.accepted += [action for s, action, _ in self.pending if s == seq]
+        self.pending = [entry for entry in self.pending if entry[0] != seq]
+
+    def rebuild_view(self) -> None:
+        # Stan serwera + przewidziane ruchy, na które jeszcze nie ma odpowiedzi
+        self.view = self.confirmed.clone()
+        for _, action, predicted in self.pending:
+            if predicted:
+                self.view.apply(action)
+
+    def close(self) -> None:
+        if self._loop and self._writer:
+            self._loop.call_soon_threadsafe(self._writer.close)
+
+
+def parse_address(text: str) -> Tuple[str, int]:
+    host, _, port = text.rpartition(":")
+    return (host or "127.0.0.1"), int(port or DEFAULT_PORT)
+
+
+async def serve(host: str, port: int, seed: Optional[int], lag: float) -> None:
+    server = GameServer(seed, lag)
+    srv = await server.start(host, port)
+    print(f"Serwer na {host}:{port} (ziarno {server.state.seed:08x}), czekam na graczy...")
+    async with srv:
+        await srv.serve_forever()
+
+
+def loopback(port: int, seed: int, lag: float, think: float = 0.0) -> Dict:
+    # Serwer i dwóch klientów-botów w jednym procesie na localhost - sprawdza, że lustra klientów
+    # zgadzają się ze stanem serwera po każdej akcji i że przewidywanie nie rozjeżdża stanu.
+    rng = random.Random(seed)
+    box: Dict = {}
+    started = threading.Event()
+
+    def run_server():
+        async def main():
+            box["server"] = GameServer(seed, lag, record=False)
+            box["srv"] = await box["server"].start("127.0.0.1", port)
+            box["loop"] = asyncio.get_running_loop()
+            started.set()
+            async with box["srv"]:
+                await box["srv"].serve_forever()
+        try:
+            asyncio.run(main())
+        except asyncio.CancelledError:
+            pass
+
+    threading.Thread(target=run_server, daemon=True).start()
+    started.wait()
+    server: GameServer = box["server"]
+    clients = [NetClient("127.0.0.1", port).start() for _ in range(2)]
+    start = time.perf_counter()
+    while not server.state.over:
+        for c in clients:
+            c.poll()
+            if c.error:
+                raise ConnectionError(c.error)
+        for c in clients:
+            if c.ready and not c.pending and c.view.turn_idx == c.seat and not c.view.over \
+                    and c.confirmed.turn_idx == c.seat:
+                c.send(rng.choice(c.view.legal_actions()))
+        time.sleep(think or 0.001)
+    deadline = time.perf_counter() + 2 + lag * 4
+    while time.perf_counter() < deadline and not all(c.confirmed.over for c in clients):
+        for c in clients:
+            c.poll()
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+
+    key = lambda s: (s.turn_idx, s.over, [(p.resources, list(p.hand), list(p.city), p.season, p.workers_available,
+                                            p.score) for p in s.players], list(s.meadow),
+                     [s.players.index(l.occupant) if l.occupant else -1 for l in s.locations])
+    consistent = all(key(c.confirmed) == key(server.state) for c in clients)
+    box["loop"].call_soon_threadsafe(box["srv"].close)
+    return {"actions": len(server.state.log), "bytes_sent": server.bytes_sent, "seconds": round(elapsed, 3),
+            "consistent": consistent, "mispredictions": sum(c.mispredictions for c in clients),
+            "scores": [p.score for p in server.state.players]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serwer gry sieciowej Forest Valley (asyncio).")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_serve = sub.add_parser("serve", help="uruchom serwer")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_serve.add_argument("--seed", type=int, default=None)
+    p_serve.add_argument("--lag", type=float, default=0.0, help="sztuczne opóźnienie odpowiedzi [ms]")
+    p_loop = sub.add_parser("loopback", help="serwer + dwóch klientów-botów na localhost")
+    p_loop.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p_loop.add_argument("--seed", type=int, default=1)
+    p_loop.add_argument("--lag", type=float, default=0.0, help="sztuczne opóźnienie odpowiedzi [ms]")
+    args = parser.parse_args()
+
+    if args.cmd == "serve":
+        asyncio.run(serve(args.host, args.port, args.seed, args.lag / 1000))
+    else:
+        result = loopback(args.port, args.seed, args.lag / 1000)
+        print(result)
+        if not result["consistent"]:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
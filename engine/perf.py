@@ -0,0 +1,271 @@
+# engine/perf.py
+# Nakładka wydajności (F3) i liczniki klatek: FPS, percentyle czasu klatki, czas obsługi zdarzeń
+# i rysowania każdej sceny, liczba blitów, renderów tekstu i nowych Surface na klatkę.
+# Liczniki można eksportować do pliku (JSON lines) i/lub lokalnego endpointu HTTP (/metrics).
+#
+# Gdy nakładka jest wyłączona i nie ma eksportu, App w ogóle nie woła tego modułu w pętli -
+# brak haków, brak pomiarów. Liczenie wywołań (sys.setprofile) działa tylko w czasie draw,
+# więc przy włączonej nakładce same czasy rysowania są trochę zawyżone.
+import json
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Tuple
+import pygame
+from engine.fonts import get_font
+
+WINDOW = 240  # Ile ostatnich klatek bierzemy do percentyli (~4 s przy 60 FPS)
+# Wywołania C, które zwracają nowy Surface (render tekstu liczymy osobno, ale to też nowy Surface)
+SURFACE_MAKERS = {"copy", "convert", "convert_alpha", "subsurface", "scale", "smoothscale", "scale_by",
+                  "rotate", "rotozoom", "flip", "frombytes", "frombuffer", "load"}
+
+_RealSurface = pygame.Surface
+
+
+class _CountedSurface(_RealSurface):
+    # Podstawiany za pygame.Surface tylko na czas draw - zlicza Surface tworzone wprost w scenach
+    monitor: Optional["PerfMonitor"] = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if _CountedSurface.monitor:
+            _CountedSurface.monitor.surfaces += 1
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+class PerfMonitor:
+    def __init__(self, overlay: bool = False, export_file: Optional[str] = None, port: Optional[int] = None,
+                 export_interval: float = 1.0):
+        self.overlay = overlay
+        self.export_file = export_file
+        self.port = port
+        self.export_interval = export_interval
+
+        self.frame_ms: Deque[float] = deque(maxlen=WINDOW)
+        self.events_ms: Deque[float] = deque(maxlen=WINDOW)
+        self.draw_ms: Dict[str, Deque[float]] = {}
+        self.counts: Deque[tuple] = deque(maxlen=WINDOW)  # (blity, rendery tekstu, nowe Surface)
+        self.frames = 0
+        self.fps = 0.0
+        self.blits = self.text_renders = self.surfaces = 0
+
+        self._frame_start = self._mark = 0.0
+        self._last_export = time.perf_counter()
+        # Gotowy panel nakładki - tekst renderujemy od nowa najwyżej co export_interval
+        self._panel: Optional[pygame.Surface] = None
+        self._panel_rect: Optional[pygame.Rect] = None
+        self._panel_time = 0.0
+        self._latest: Dict = {}
+        self._lock = threading.Lock()
+        self._file_queue: Optional[queue.SimpleQueue] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.start_exporters()
+
+    @property
+    def active(self) -> bool:
+        return self.overlay or self.export_file is not None or self.port is not None
+
+    def toggle_overlay(self) -> None:
+        self.overlay = not self.overlay
+        self._panel = None  # Po włączeniu od razu aktualne liczby
+
+    def overlay_due(self) -> bool:
+        #Czas odświeżyć liczby na nakładce. Sama nakładka nie wymusza klatek - App zgłasza wtedy
+        #tylko jej prostokąt, więc w bezczynności rysujemy najwyżej raz na export_interval.
+        return self.overlay and (self._panel is None or
+                                 time.perf_counter() - self._panel_time >= self.export_interval)
+
+    @property
+    def overlay_rect(self) -> Optional[pygame.Rect]:
+        return self._panel_rect
+
+    # --- Pomiar (wołane z App.run tylko gdy active) ---
+    def begin_frame(self) -> None:
+        self._frame_start = self._mark = time.perf_counter()
+
+    def end_events(self) -> None:
+        now = time.perf_counter()
+        self.events_ms.append((now - self._mark) * 1000)
+        self._mark = now
+
+    def begin_draw(self) -> None:
+        self.blits = self.text_renders = self.surfaces = 0
+        self._mark = time.perf_counter()
+        _CountedSurface.monitor = self
+        pygame.Surface = _CountedSurface
+        sys.setprofile(self._profile)
+
+    def end_draw(self, scene: str) -> None:
+        sys.setprofile(None)
+        pygame.Surface = _RealSurface
+        _CountedSurface.monitor = None
+        self.draw_ms.setdefault(scene, deque(maxlen=WINDOW)).append((time.perf_counter() - self._mark) * 1000)
+        self.counts.append((self.blits, self.text_renders, self.surfaces))
+
+    def end_frame(self, clock: pygame.time.Clock) -> None:
+        # Czas pracy klatki (zdarzenia + logika + rysowanie + present), bez spania w clock.tick/event.wait
+        self.frame_ms.append((time.perf_counter() - self._frame_start) * 1000)
+        self.frames += 1
+        self.fps = clock.get_fps()
+        if self.export_file or self.port:
+            now = time.perf_counter()
+            if now - self._last_export >= self.export_interval:
+                self._last_export = now
+                self.export(self.snapshot())
+
+    def _profile(self, frame, event, arg) -> None:
+        if event != "c_call":
+            return
+        name = arg.__name__
+        if name == "blit" or name == "blits":
+            self.blits += 1
+        elif name == "render":
+            self.text_renders += 1
+            self.surfaces += 1
+        elif name in SURFACE_MAKERS:
+            self.surfaces += 1
+
+    # --- Raport ---
+    def snapshot(self) -> Dict:
+        counts = list(self.counts)
+        avg = lambda i: round(sum(c[i] for c in counts) / len(counts), 2) if counts else 0.0
+        return {
+            "time": time.time(),
+            "frames": self.frames,
+            "fps": round(self.fps, 1),
+            "frame_ms": {"p50": round(percentile(self.frame_ms, 0.50), 3),
+                         "p95": round(percentile(self.frame_ms, 0.95), 3),
+                         "p99": round(percentile(self.frame_ms, 0.99), 3),
+                         "max": round(max(self.frame_ms, default=0.0), 3)},
+            "events_ms": round(sum(self.events_ms) / len(self.events_ms), 3) if self.events_ms else 0.0,
+            "draw_ms": {scene: round(sum(v) / len(v), 3) for scene, v in self.draw_ms.items() if v},
+            "per_frame": {"blits": avg(0), "text_renders": avg(1), "surfaces": avg(2)},
+        }
+
+    def draw(self, screen: pygame.Surface) -> Optional[pygame.Rect]:
+        #Rysuje nakładkę w lewym górnym rogu (scena pod nią była właśnie narysowana, więc blit co klatkę).
+        #Zwraca prostokąt do odświeżenia, gdy zmieniła się treść panelu, inaczej None.
+        if not self.overlay_due():
+            screen.blit(self._panel, self._panel_rect)
+            return None
+        old = self._panel_rect
+        self._panel, self._panel_rect = self.render_panel()
+        self._panel_time = time.perf_counter()
+        screen.blit(self._panel, self._panel_rect)
+        return self._panel_rect.union(old) if old else self._panel_rect
+
+    def render_panel(self) -> Tuple[pygame.Surface, pygame.Rect]:
+        #Tekst renderujemy wprost - liczby ciągle się zmieniają, więc nie ma sensu zapychać nimi TextCache.
+        s = self.snapshot()
+        f, c = s["frame_ms"], s["per_frame"]
+        lines = [f"FPS {s['fps']:.1f}   klatka p50 {f['p50']:.2f} p95 {f['p95']:.2f} p99 {f['p99']:.2f} ms",
+                 f"zdarzenia {s['events_ms']:.2f} ms   " +
+                 "  ".join(f"{scene} {ms:.2f}" for scene, ms in s["draw_ms"].items()),
+                 f"blity {c['blits']:.0f}   teksty {c['text_renders']:.1f}   Surface {c['surfaces']:.1f} /klatkę"]
+        font = get_font(13)
+        rendered = [font.render(line, True, (180, 255, 180)) for line in lines]
+        rect = pygame.Rect(4, 4, max(r.get_width() for r in rendered) + 12, len(rendered) * 16 + 8)
+        panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 200))
+        for i, surf in enumerate(rendered):
+            panel.blit(surf, (6, 4 + i * 16))
+        return panel, rect
+
+    # --- Eksport ---
+    def start_exporters(self) -> None:
+        if self.export_file:
+            # Zapis do pliku w wątku - pętla gry tylko wrzuca gotowy słownik do kolejki
+            self._file_queue = queue.SimpleQueue()
+            threading.Thread(target=self._file_writer, name="perf-export", daemon=True).start()
+        if self.port:
+            monitor = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    with monitor._lock:
+                        data = monitor._latest
+                    if self.path == "/metrics":
+                        body, ctype = monitor.prometheus(data).encode(), "text/plain; version=0.0.4"
+                    else:
+                        body, ctype = json.dumps(data).encode(), "application/json"
+                    self.send_response(200)
+                    self.send_header("Content-Type", ctype)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass  # Bez logu każdego zapytania na konsoli gry
+
+            self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+            threading.Thread(target=self._server.serve_forever, name="perf-http", daemon=True).start()
+
+    def export(self, data: Dict) -> None:
+        with self._lock:
+            self._latest = data
+        if self._file_queue is not None:
+            self._file_queue.put(data)
+
+    def _file_writer(self) -> None:
+        while True:
+            data = self._file_queue.get()
+            try:
+                with open(self.export_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(data) + "\n")
+            except OSError as e:
+                print(f"Błąd eksportu metryk {self.export_file}: {e}")
+
+    @staticmethod
+    def prometheus(data: Dict) -> str:
+        if not data:
+            return ""
+        lines = [f"forest_valley_fps {data['fps']}", f"forest_valley_frames_total {data['frames']}",
+                 f"forest_valley_events_ms {data['events_ms']}"]
+        quantiles = {"p50": "0.5", "p95": "0.95", "p99": "0.99"}
+        lines += [f'forest_valley_frame_ms{{quantile="{quantiles[q]}"}} {v}' for q, v in data["frame_ms"].items()
+                  if q in quantiles]
+        lines.append(f"forest_valley_frame_ms_max {data['frame_ms']['max']}")
+        lines += [f'forest_valley_draw_ms{{scene="{s}"}} {v}' for s, v in data["draw_ms"].items()]
+        lines += [f"forest_valley_{k}_per_frame {v}" for k, v in data["per_frame"].items()]
+        return "\n".join(lines) + "\n"
+
+    def close(self) -> None:
+        if self._server:
+            self._server.shutdown()
+
+
+class StartupProfile:
+    # Czas startu (python main.py --startup-profile): kolejne fazy od startu main.py do pierwszej klatki
+    # i do pierwszej klatki menu. Budżet dotyczy pierwszej klatki - tego, kiedy gracz widzi okno.
+    def __init__(self, t0: float, budget_ms: float):
+        self.t0 = self._last = t0
+        self.budget_ms = budget_ms
+        self.phases: List[Tuple[str, float]] = []
+        self.first_frame_ms: Optional[float] = None
+
+    def mark(self, phase: str) -> None:
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+
+    def first_frame(self) -> None:
+        self.mark("pierwsza klatka")
+        self.first_frame_ms = (self._last - self.t0) * 1000
+
+    @property
+    def within_budget(self) -> bool:
+        return self.first_frame_ms is not None and self.first_frame_ms <= self.budget_ms
+
+    def report(self) -> str:
+        lines = [f"{phase:<34}{ms:>9.1f} ms" for phase, ms in self.phases]
+        lines.append(f"{'do pierwszej klatki':<34}{self.first_frame_ms or 0:>9.1f} ms  "
+                     f"(budżet {self.budget_ms:.0f} ms: {'OK' if self.within_budget else 'PRZEKROCZONY'})")
+        lines.append(f"{'do menu':<34}{(self._last - self.t0) * 1000:>9.1f} ms")
+        return "\n".join(lines)
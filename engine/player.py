@@ -1,7 +1,8 @@
 # engine/player.py
 from settings import *
-from typing import List, Dict, Optional
-from engine.card import Card, CardType
+from array import array
+from typing import List, Dict, Optional, Set, Tuple
+from engine.card import Card, CardType, CARDS, RESOURCE_ORDER
 
 
 class Player:
@@ -9,8 +10,15 @@ class Player:
         self.name: str = name
         self.color: tuple[int, int, int] = color
         self.resources: Dict[str, int] = {"twig": 0, "resin": 0, "pebble": 0, "berry": 0}
-        self.hand: List[Card] = []
-        self.city: List[Card] = []
+        # Ręka i miasto to id kart (indeksy w CARDS) - tanie kopiowanie stanu dla AI i symulacji
+        self.hand: array = array('B')
+        self.city: array = array('B')
+
+        # Indeksy miasta - aktualizowane w add_to_city, żeby zapytania co klatkę były O(1)
+        self._score: int = 0
+        self.links: Set[str] = set()  # Linki dostarczane przez budynki w mieście (darmowe budowanie)
+        self.triggers: Dict[str, List[Card]] = {}  # Tag zagrywanej karty -> pasywne karty, które reagują
+        self.producers: List[Card] = []  # Zielone karty (produkcja)
 
         self.season: str = "ZIMA"
         self.workers_total: int = 2
@@ -24,65 +32,92 @@ class Player:
 
     @property  #  Dekorator @property]
     def score(self) -> int:
-        #Programowanie funkcyjne - Wyrażenie generatorowe]
-        return sum(c.points for c in self.city)
+        return self._score
+
+    def clone(self) -> "Player":
+        #Szybka kopia (bez deepcopy) - prototypy kart są współdzielone, kopiujemy tylko liczniki i tablice.
+        p = Player.__new__(Player)
+        p.__dict__.update(self.__dict__)
+        p.resources = self.resources.copy()
+        p.hand, p.city = array('B', self.hand), array('B', self.city)
+        p.links = self.links.copy()
+        p.triggers = {tag: cards.copy() for tag, cards in self.triggers.items()}
+        p.producers = self.producers.copy()
+        p.stats = {"cards_played": self.stats["cards_played"], "total_res": self.stats["total_res"].copy()}
+        return p
+
+    def add_to_city(self, card: Card) -> None:
+        #Jedyne miejsce, w którym karta trafia do miasta - od razu aktualizujemy indeksy.
+        self.city.append(card.id)
+        self.index_card(card)
+
+    def index_card(self, card: Card) -> None:
+        self._score += card.points
+        if card.link:
+            self.links.add(card.link)
+        if card.type == CardType.PASSIVE and card.trigger:
+            self.triggers.setdefault(card.trigger.on_play_tag, []).append(card)
+        if card.type == CardType.PROD:
+            self.producers.append(card)
+
+    def rebuild_indexes(self) -> None:
+        #Po podmianie całego miasta (np. wczytanie stanu) - przeliczamy indeksy od zera.
+        self._score, self.links, self.triggers, self.producers = 0, set(), {}, []
+        for card_id in self.city:
+            self.index_card(CARDS[card_id])
 
     def gain_resources(self, res_dict: Dict[str, int]) -> None:
         for r, amount in res_dict.items():
             self.resources[r] += amount
             self.stats["total_res"][r] += amount
 
+    def gain_tuple(self, values: Tuple[int, ...]) -> None:
+        #To samo dla krotek zasobów z prototypów kart (kolejność RESOURCE_ORDER).
+        for r, amount in zip(RESOURCE_ORDER, values):
+            if amount:
+                self.resources[r] += amount
+                self.stats["total_res"][r] += amount
+
     def check_free_build(self, card: Card) -> bool:
-        if card.link_req:
-            #Funkcja any() z generatorem]
-            return any(built_card.link == card.link_req for built_card in self.city)
-        return False
+        return card.link_req is not None and card.link_req in self.links
 
     def can_afford(self, card: Card) -> bool:
         if self.check_free_build(card):
             return True
-        #Iteracja po słowniku .items()]
-        for res, amt in card.cost.items():
-            if self.resources.get(res, 0) < amt:
+        #Iteracja po parach (zasób, koszt) - funkcja zip]
+        for res, amt in zip(RESOURCE_ORDER, card.cost):
+            if self.resources[res] < amt:
                 return False
         return True
 
     def pay(self, card: Card) -> bool:
         if self.check_free_build(card):
             return True
-        for res, amt in card.cost.items():
+        for res, amt in zip(RESOURCE_ORDER, card.cost):
             self.resources[res] -= amt
         return False
 
     def activate_production(self) -> bool:
-        #List comprehension z filtrowaniem]
-        prod_cards = [c for c in self.city if c.type == CardType.PROD]
-        if not prod_cards:
+        if not self.producers:
             return False
 
-        for card in prod_cards:
-            self.gain_resources(card.benefit)
+        for card in self.producers:
+            self.gain_tuple(card.benefit)
         return True
 
     def check_triggers(self, played_card: Card) -> List[str]:
         bonuses: List[str] = []
-        # Filtrujemy tylko karty pasywne z triggerem (Styl funkcyjny)
-        passive_cards = filter(lambda c: c.type == CardType.PASSIVE and c.trigger, self.city)
-
-        for city_card in passive_cards:
+        # Tylko karty pasywne reagujące na tag zagranej karty (indeks zamiast filtrowania miasta)
+        for city_card in self.triggers.get(played_card.tag, ()):
             trig = city_card.trigger
-            if trig.get("on_play_tag") == played_card.tag:
-                if "gain_res" in trig:
-                    self.gain_resources(trig["gain_res"])
-                    for r, a in trig["gain_res"].items():
-                        bonuses.append(f"+{a} {r} ({city_card.name})")
-                if "gain_card" in trig:
-                    bonuses.append(f"DRAW_CARD:{trig['gain_card']}")
+            if any(trig.gain_res):
+                self.gain_tuple(trig.gain_res)
+                for r, a in zip(RESOURCE_ORDER, trig.gain_res):
+                    if a: bonuses.append(f"+{a} {r} ({city_card.name})")
+            if trig.gain_card:
+                bonuses.append(f"DRAW_CARD:{trig.gain_card}")
         return bonuses
 
     def check_bonus_potential(self, card_tag: str) -> Optional[str]:
-        for city_card in self.city:
-            if city_card.type == CardType.PASSIVE and city_card.trigger:
-                if city_card.trigger.get("on_play_tag") == card_tag:
-                    return city_card.name
-        return None
\ No newline at end of file
+        cards = self.triggers.get(card_tag)
+        return cards[0].name if cards else None
\ No newline at end of file
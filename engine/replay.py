@@ -0,0 +1,112 @@
+# engine/replay.py
+# Zapis i odtwarzanie gier. Plik powtórki to nagłówek (magic, wersja, ziarno) + po jednym bajcie
+# na każdą wykonaną akcję (Action.code), dopisywanym na bieżąco - typowa gra to ~100 bajtów.
+# Ziarno odtwarza talię, a log kolejne ruchy, więc gra przechodzi dokładnie tak samo bez okna.
+#
+#   python -m engine.replay replays/                   -> wynik każdej gry + tempo odtwarzania
+#   python -m engine.replay gra.fvr --turn 40          -> stan po 40 akcjach (przewinięcie)
+import argparse
+import os
+import struct
+import time
+from typing import IO, Iterator, List, Optional, Tuple
+from engine.game_state import GameState, Action
+
+MAGIC = b"FVRP"
+REPLAY_VERSION = 1
+HEADER = struct.Struct("<4sBI")  # magic, wersja formatu, ziarno (uint32)
+EXT = ".fvr"
+
+
+class ReplayWriter:
+    # Dopisuje do pliku nowe bajty z GameState.log - wołane po każdej akcji, więc przy awarii
+    # w pliku zostaje wszystko do ostatniego ruchu. Plik powstaje dopiero przy pierwszej akcji
+    # (gra porzucona bez ruchu nie zostawia pustej powtórki), a po close() kolejny sync dopisuje dalej.
+    def __init__(self, path: str, seed: int):
+        self.path = path
+        self.seed = seed
+        self.written = 0
+        self._file: Optional[IO[bytes]] = None
+
+    @classmethod
+    def for_game(cls, state: GameState, directory: str) -> "ReplayWriter":
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{state.seed:08x}{EXT}"
+        return cls(os.path.join(directory, name), state.seed)
+
+    def sync(self, log: bytearray) -> None:
+        if len(log) == self.written:
+            return
+        if self._file is None:
+            if self.written:
+                self._file = open(self.path, "ab")
+            else:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "wb")
+                self._file.write(HEADER.pack(MAGIC, REPLAY_VERSION, self.seed))
+        self._file.write(log[self.written:])
+        self._file.flush()
+        self.written = len(log)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_replay(path: str) -> Tuple[int, bytes]:
+    #Zwraca (ziarno, log akcji) z pliku powtórki.
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path}: plik za krótki na nagłówek powtórki")
+    magic, version, seed = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: to nie jest plik powtórki")
+    if version != REPLAY_VERSION:
+        raise ValueError(f"{path}: nieobsługiwana wersja powtórki {version}")
+    return seed, data[HEADER.size:]
+
+
+def replay(seed: int, log: bytes, turn: Optional[int] = None) -> GameState:
+    #Odtwarza grę bez okna. turn = ile akcji wykonać (None = cały log).
+    state = GameState(seed)
+    for i, code in enumerate(log[:turn]):
+        if not state.apply(Action.from_code(code)):
+            raise ValueError(f"Akcja {i} ({Action.from_code(code)}) jest niedozwolona - log nie pasuje do gry")
+    return state
+
+
+def iter_paths(paths: List[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(EXT):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Odtwarza zapisane gry Forest Valley bez okna.")
+    parser.add_argument("paths", nargs="+", help="pliki .fvr albo katalogi z nimi")
+    parser.add_argument("--turn", type=int, default=None, help="zatrzymaj po tylu akcjach")
+    args = parser.parse_args()
+
+    games = actions = 0
+    start = time.perf_counter()
+    for path in iter_paths(args.paths):
+        seed, log = read_replay(path)
+        state = replay(seed, log, args.turn)
+        p1, p2 = state.players
+        result = state.winner_text or state.info_msg
+        print(f"{path}: ziarno {seed:08x}, akcje {min(len(log), args.turn or len(log))}/{len(log)}, "
+              f"punkty {p1.score}:{p2.score} - {result}")
+        games += 1
+        actions += len(log[:args.turn])
+    elapsed = time.perf_counter() - start
+    if games:
+        print(f"{games} gier, {actions} akcji w {elapsed:.3f} s ({actions / max(elapsed, 1e-9):.0f} akcji/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# engine/snapshot.py
+# Zapis/odczyt pełnego stanu gry do zwartego, wersjonowanego formatu binarnego (~300 bajtów).
+# Karty są zapisane jako id prototypów, indeksy graczy (punkty, linki, triggery) przeliczamy po wczytaniu.
+# Autosaver zapisuje stan na dysk w osobnym wątku - główna pętla tylko serializuje (kilkadziesiąt µs).
+import os
+import struct
+import threading
+import time
+from array import array
+from typing import Optional, Tuple
+from engine.game_state import GameState, LocationSpot, LOCATION_DEFS
+from engine.player import Player
+from engine.card import CARDS, RESOURCE_ORDER
+
+MAGIC = b"FVSV"
+SNAPSHOT_VERSION = 1
+SEASONS = ("ZIMA", "WIOSNA", "LATO", "JESIEŃ")
+NO_SEAT = 0xFF  # Brak gracza (wolna lokacja / brak AI)
+
+HEADER = struct.Struct("<4sBI")  # magic, wersja, ziarno
+STATE = struct.Struct("<BBBdd")  # tura, koniec gry, miejsce AI, czas gry do tej pory, czas całej gry
+PLAYER = struct.Struct("<3B4HBBBBH4I")  # kolor, zasoby, pora roku, robotnicy, koniec, zagrane karty, suma zasobów
+
+
+class _Reader:
+    # Każde wyjście poza dane to ValueError - ucięty albo uszkodzony zapis nie może skończyć się IndexError
+    def __init__(self, data: bytes):
+        self.data, self.pos = memoryview(data), 0
+
+    def need(self, n: int) -> None:
+        if self.pos + n > len(self.data):
+            raise ValueError(f"Zapis ucięty: potrzeba {n} bajtów od pozycji {self.pos}, jest {len(self.data)}")
+
+    def unpack(self, fmt: struct.Struct) -> Tuple:
+        self.need(fmt.size)
+        values = fmt.unpack_from(self.data, self.pos)
+        self.pos += fmt.size
+        return values
+
+    def block(self, wide: bool = False) -> bytes:
+        (n,) = self.unpack(_U16 if wide else _U8)
+        self.need(n)
+        chunk = bytes(self.data[self.pos:self.pos + n])
+        self.pos += n
+        return chunk
+
+    def cards(self) -> array:
+        ids = array('B', self.block())
+        if any(c >= len(CARDS) for c in ids):
+            raise ValueError(f"Nieznana karta w zapisie (id {max(ids)})")
+        return ids
+
+    def text(self) -> str:
+        return self.block(wide=True).decode("utf-8")
+
+
+_U8, _U16 = struct.Struct("<B"), struct.Struct("<H")
+
+
+def _block(data: bytes, wide: bool = False) -> bytes:
+    return (_U16 if wide else _U8).pack(len(data)) + bytes(data)
+
+
+def _text(value: str) -> bytes:
+    return _block(value.encode("utf-8"), wide=True)
+
+
+def dumps(state: GameState, ai_seat: Optional[int] = None) -> bytes:
+    out = bytearray(HEADER.pack(MAGIC, SNAPSHOT_VERSION, state.seed))
+    elapsed = state.duration if state.over else time.time() - state.start_time
+    out += STATE.pack(state.turn_idx, state.over, NO_SEAT if ai_seat is None else ai_seat, elapsed, state.duration)
+    out += _text(state.info_msg) + _text(state.winner_text)
+    out += _block(state.log, wide=True) + _block(state.deck) + _block(state.meadow)
+    out += _block(bytes(state.players.index(loc.occupant) if loc.occupant else NO_SEAT for loc in state.locations))
+
+    out += _U8.pack(len(state.players))
+    for p in state.players:
+        out += _text(p.name)
+        out += PLAYER.pack(*p.color, *(p.resources[r] for r in RESOURCE_ORDER), SEASONS.index(p.season),
+                           p.workers_total, p.workers_available, p.finished, p.stats["cards_played"],
+                           *(p.stats["total_res"][r] for r in RESOURCE_ORDER))
+        out += _block(p.hand) + _block(p.city)
+    return bytes(out)
+
+
+def loads(data: bytes) -> Tuple[GameState, Optional[int]]:
+    #Zwraca (stan gry, miejsce AI). Stan jest składany bezpośrednio - bez tasowania i rozdawania z __init__.
+    r = _Reader(data)
+    magic, version, seed = r.unpack(HEADER)
+    if magic != MAGIC:
+        raise ValueError("To nie jest zapis stanu gry")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Nieobsługiwana wersja zapisu {version}")
+
+    g = GameState.__new__(GameState)
+    g.seed = seed
+    g.turn_idx, over, ai_seat, elapsed, g.duration = r.unpack(STATE)
+    g.over = bool(over)
+    g.start_time = time.time() - elapsed
+    g.info_msg, g.winner_text = r.text(), r.text()
+    g.log = bytearray(r.block(wide=True))
+    g.deck, g.meadow = r.cards(), r.cards()
+    occupancy = r.block()
+    g.turn_hook = None
+
+    (n_players,) = r.unpack(_U8)
+    if len(occupancy) != len(LOCATION_DEFS) or not 0 < n_players < NO_SEAT:
+        raise ValueError("Uszkodzony zapis: liczba lokacji albo graczy się nie zgadza")
+    if g.turn_idx >= n_players or any(seat != NO_SEAT and seat >= n_players for seat in (ai_seat, *occupancy)):
+        raise ValueError("Uszkodzony zapis: numer gracza spoza gry")
+    g.players = []
+    for _ in range(n_players):
+        name = r.text()
+        v = r.unpack(PLAYER)
+        if v[7] >= len(SEASONS):
+            raise ValueError(f"Uszkodzony zapis: nieznana pora roku {v[7]}")
+        p = Player(name, v[0:3])
+        p.resources = dict(zip(RESOURCE_ORDER, v[3:7]))
+        p.season = SEASONS[v[7]]
+        p.workers_total, p.workers_available, p.finished = v[8], v[9], bool(v[10])
+        p.stats = {"cards_played": v[11], "total_res": dict(zip(RESOURCE_ORDER, v[12:16]))}
+        p.hand, p.city = r.cards(), r.cards()
+        p.rebuild_indexes()
+        g.players.append(p)
+    if r.pos != len(r.data):
+        raise ValueError("Uszkodzony zapis: dane po końcu stanu")
+
+    g.locations = [LocationSpot(n, gain, e, k, None if seat == NO_SEAT else g.players[seat])
+                   for (n, gain, e, k), seat in zip(LOCATION_DEFS, occupancy)]
+    return g, None if ai_seat == NO_SEAT else ai_seat
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    # Najpierw plik tymczasowy, potem podmiana - przerwany zapis nie psuje poprzedniego stanu
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def save(path: str, state: GameState, ai_seat: Optional[int] = None) -> None:
+    write_atomic(path, dumps(state, ai_seat))
+
+
+def load(path: str) -> Tuple[GameState, Optional[int]]:
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+class Autosaver:
+    # Wątek w tle zapisujący najnowszy stan. Jeśli dysk nie nadąża, starsze zapisy są pomijane -
+    # liczy się tylko ostatni stan, a pętla gry nigdy nie czeka na I/O.
+    def __init__(self, path: str):
+        self.path = path
+        self.saved = 0
+        self._pending: Optional[bytes] = None
+        self._writing = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def submit(self, state: GameState, ai_seat: Optional[int] = None) -> None:
+        # Serializujemy od razu (stan zmieni się w następnej turze), zapis zostawiamy wątkowi
+        data = dumps(state, ai_seat)
+        with self._cond:
+            self._pending = data
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                data, self._pending = self._pending, None
+                self._writing = True
+            try:
+                write_atomic(self.path, data)
+                self.saved += 1
+            except OSError as e:
+                print(f"Błąd autozapisu {self.path}: {e}")
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        #Czeka, aż ostatni zgłoszony stan trafi na dysk (np. przy zamykaniu gry).
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending is None and not self._writing, timeout)
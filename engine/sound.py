@@ -1,43 +1,127 @@
 # engine/sound.py
-import pygame
+# Dźwięk: bank efektów dekodowany w wątku w tle (do tego czasu efekty są po prostu pomijane - główna
+# pętla nigdy nie czeka na dekodowanie), własna pula kanałów z priorytetami i podkradaniem głosu
+# (nowy ważniejszy efekt przerywa najstarszy mniej ważny) oraz muzyka odtwarzana strumieniowo
+# przez pygame.mixer.music - plik jest czytany kawałkami w wątku audio SDL, nie ładowany w całości.
 import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import pygame
+from settings import SFX_CHANNELS, MUSIC_TRACKS
+
+# Priorytety efektów - wyższy może przerwać niższy, gdy brakuje kanałów
+PRIO_UI, PRIO_ACTION, PRIO_EVENT = range(3)
+
+# Bank efektów: nazwa -> (plik, priorytet, głośność względem głównej). Kilka nazw może dzielić plik -
+# dekodujemy go raz.
+SFX: Dict[str, Tuple[str, int, float]] = {
+    "click": ("assets/menu_click.wav", PRIO_UI, 1.0),
+    "place_worker": ("assets/axe_chop.wav", PRIO_ACTION, 1.0),
+    "buy": ("assets/menu_click.wav", PRIO_ACTION, 0.8),
+    "play_card": ("assets/axe_chop.wav", PRIO_ACTION, 0.6),
+    "season": ("assets/axe_chop.wav", PRIO_EVENT, 1.0),
+}
 
 
 class SoundManager:
-    def __init__(self):
-        pygame.mixer.init()
+    def __init__(self, channels: int = SFX_CHANNELS):
         # ZMIANA: 2% głośności na start
         self.volume = 0.02
+        self.bank: Dict[str, Tuple[pygame.mixer.Sound, int, float]] = {}
+        self.channels: List[pygame.mixer.Channel] = []
+        self.voices: List[Tuple[int, float, float]] = []  # (priorytet, start, głośność) efektu na każdym kanale
+        self.stolen = self.dropped = 0
+        self.music_path: Optional[str] = None
 
-        # Ścieżki
-        self.music_path = "assets/menu_sound.wav"
-        self.click_path = "assets/menu_click.wav"
-
-        # Ładowanie SFX
-        self.click_sound = None
         try:
-            if os.path.exists(self.click_path):
-                self.click_sound = pygame.mixer.Sound(self.click_path)
-                self.click_sound.set_volume(self.volume)
-        except Exception as e:
-            print(f"Błąd dźwięku SFX: {e}")
-
-    def play_music(self):
-        if os.path.exists(self.music_path):
+            pygame.mixer.init()
+        except pygame.error as e:
+            print(f"Błąd dźwięku: {e} - gra bez dźwięku")
+            return
+        # Kanały puli są zarezerwowane - Sound.play() gdziekolwiek indziej ich nie zabierze
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), channels))
+        pygame.mixer.set_reserved(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.voices = [(PRIO_UI, 0.0, 1.0)] * channels
+        self._loader = threading.Thread(target=self.preload, name="sfx-preload", daemon=True)
+        self._loader.start()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.channels)
+
+    def preload(self) -> None:
+        #Dekoduje cały bank w tle; bank podmieniamy na raz, więc play() widzi pusty albo kompletny.
+        decoded: Dict[str, Optional[pygame.mixer.Sound]] = {}
+        for path, _, _ in SFX.values():
+            if path in decoded:
+                continue
+            decoded[path] = None
             try:
-                pygame.mixer.music.load(self.music_path)
-                pygame.mixer.music.set_volume(self.volume)
-                pygame.mixer.music.play(-1)
-            except Exception as e:
-                print(f"Błąd muzyki: {e}")
+                if os.path.exists(path):
+                    decoded[path] = pygame.mixer.Sound(path)
+                else:
+                    print(f"Brak pliku dźwięku: {path}")
+            except pygame.error as e:
+                print(f"Błąd dźwięku SFX {path}: {e}")
+        self.bank = {name: (decoded[path], prio, gain) for name, (path, prio, gain) in SFX.items() if decoded[path]}
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        # Dla narzędzi/testów - gra nie czeka, efekty po prostu zaczynają grać po załadowaniu
+        if self.enabled:
+            self._loader.join(timeout)
+
+    def pick_channel(self, priority: int) -> Optional[int]:
+        #Wolny kanał puli, a jak nie ma - najstarszy z najniższym priorytetem, o ile nie wyższym niż nowy.
+        victim = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+            if victim is None or self.voices[i] < self.voices[victim]:
+                victim = i
+        if victim is not None and self.voices[victim][0] <= priority:
+            self.channels[victim].stop()
+            self.stolen += 1
+            return victim
+        return None
+
+    def play(self, name: str) -> bool:
+        entry = self.bank.get(name)
+        if entry is None:
+            return False  # Bank jeszcze się ładuje albo brak pliku
+        sound, priority, gain = entry
+        i = self.pick_channel(priority)
+        if i is None:
+            self.dropped += 1
+            return False
+        channel = self.channels[i]
+        channel.play(sound)
+        channel.set_volume(self.volume * gain)
+        self.voices[i] = (priority, time.monotonic(), gain)
+        return True
 
     def play_click(self):
-        if self.click_sound:
-            self.click_sound.play()
+        self.play("click")
+
+    def play_music(self, path: Optional[str] = None):
+        # Pierwszy istniejący utwór z listy; load otwiera tylko strumień, dekodowanie idzie w wątku SDL
+        if not self.enabled:
+            return
+        tracks = [path] if path else MUSIC_TRACKS
+        self.music_path = next((t for t in tracks if os.path.exists(t)), None)
+        if self.music_path is None:
+            return
+        try:
+            pygame.mixer.music.load(self.music_path)
+            pygame.mixer.music.set_volume(self.volume)
+            pygame.mixer.music.play(-1)
+        except pygame.error as e:
+            print(f"Błąd muzyki: {e}")
 
     def set_volume(self, val):
         self.volume = val
-        if pygame.mixer.music.get_busy():
+        if self.enabled:
             pygame.mixer.music.set_volume(val)
-        if self.click_sound:
-            self.click_sound.set_volume(val)
\ No newline at end of file
+            for channel, (_, _, gain) in zip(self.channels, self.voices):
+                channel.set_volume(val * gain)
@@ -0,0 +1,326 @@
+# engine/telemetry.py
+# Telemetria tura po turze: po każdej akcji jeden wiersz (kto, co, jaka karta, czy za darmo, premie
+# z kart pasywnych, zasoby, punkty, pora roku), na koniec gry wynik i karty w miastach.
+# Wiersze trafiają do z góry zaalokowanych kolumn array (bufor pierścieniowy) - zapis to kilka
+# przypisań, bez tworzenia obiektów. Pełny bufor jest zrzucany na dysk jedną paczką, kolumna po
+# kolumnie, a agregacje czytają tylko potrzebne kolumny, paczka po paczce - pamięć nie rośnie z liczbą gier.
+#
+#   python -m engine.telemetry record --games 100000 --bots greedy random --dir telemetry
+#   python -m engine.telemetry report telemetry/        -> wygrane wg kart, krzywa PZ, PZ po porach roku
+import argparse
+import glob
+import multiprocessing
+import os
+import random
+import struct
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+from engine.ai import MAX_ROLLOUT_STEPS, score_for
+from engine.card import CARDS, CardType
+from engine.game_state import GameState, Action, ActionType
+from engine.snapshot import SEASONS
+from engine.tournament import resolve
+
+MAGIC = b"FVTB"
+TELEMETRY_VERSION = 1
+BATCH = struct.Struct("<4sBBI")  # magic, wersja, tabela, liczba wierszy - potem kolumny jedna za drugą
+EXT = ".fvt"
+NO_CARD = 0xFF
+CAPACITY = 4096  # Wierszy w buforze - jedna paczka na dysku
+
+# Tabele: (nazwa kolumny, typ array). Wiersz gry to jej ziarno (game), tura to numer akcji w logu.
+TURNS = (("game", "I"), ("turn", "H"), ("seat", "B"), ("action", "B"), ("card", "B"), ("free", "B"),
+         ("season", "B"), ("twig", "H"), ("resin", "H"), ("pebble", "H"), ("berry", "H"),
+         ("trigger_res", "H"), ("trigger_cards", "B"), ("vp", "H"), ("city", "B"), ("hand", "B"))
+GAMES = (("game", "I"), ("actions", "H"), ("vp0", "H"), ("vp1", "H"), ("result", "B"))  # result: 2/1/0 dla gracza 0
+CITIES = (("game", "I"), ("seat", "B"), ("card", "B"), ("result", "B"))  # Karta w mieście na koniec gry
+TABLES = (TURNS, GAMES, CITIES)
+T_TURNS, T_GAMES, T_CITIES = range(3)
+
+
+class Columns:
+    # Bufor jednej tabeli: kolumny array o stałym rozmiarze. Po zapełnieniu zrzucany do pliku
+    # (jeśli jest) i zapisywany od początku - bez pliku trzyma ostatnie CAPACITY wierszy.
+    def __init__(self, table: int, capacity: int = CAPACITY):
+        self.table = table
+        self.capacity = capacity
+        self.cols = [array(t, bytes(capacity * array(t).itemsize)) for _, t in TABLES[table]]
+        self.size = 0
+
+    def append(self, values: Sequence[int], out: Optional["TelemetryWriter"]) -> None:
+        if self.size == self.capacity:
+            if out: out.write(self)
+            self.size = 0
+        i = self.size
+        for col, v in zip(self.cols, values):
+            col[i] = v
+        self.size += 1
+
+    def column(self, name: str) -> array:
+        return self.cols[[n for n, _ in TABLES[self.table]].index(name)]
+
+
+class TelemetryWriter:
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._file: Optional[BinaryIO] = open(path, "ab")
+
+    def write(self, buf: Columns) -> None:
+        # Kolumny bez kopiowania (memoryview na array), tylko zapełniona część
+        self._file.write(BATCH.pack(MAGIC, TELEMETRY_VERSION, buf.table, buf.size))
+        for col in buf.cols:
+            self._file.write(memoryview(col).cast("B")[:buf.size * col.itemsize])
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class Telemetry:
+    # Rejestrator dla pętli gry / symulacji: zamiast state.apply(a) wołamy telemetry.apply(state, a)
+    def __init__(self, path: Optional[str] = None, capacity: int = CAPACITY):
+        self.out = TelemetryWriter(path) if path else None
+        self.turns = Columns(T_TURNS, capacity)
+        self.games = Columns(T_GAMES, max(1, capacity // 64))
+        self.cities = Columns(T_CITIES, max(1, capacity // 4))
+        self.rows = 0
+
+    def apply(self, state: GameState, action: Action) -> bool:
+        seat, p = state.turn_idx, state.current_player
+        card, free = NO_CARD, 0
+        if action.kind == ActionType.BUY and action.index < len(state.meadow):
+            card = state.meadow[action.index]
+            free = p.check_free_build(CARDS[card])
+        elif action.kind == ActionType.PLAY and action.index < len(p.hand):
+            card = p.hand[action.index]
+        total_res = p.stats["total_res"]
+        gained, hand = sum(total_res.values()), len(p.hand)
+        if not state.apply(action):
+            return False
+
+        trigger_res = trigger_cards = 0
+        if action.kind == ActionType.PLAY:
+            # Wszystko, co przybyło ponad produkcję samej karty, dały karty pasywne
+            played = CARDS[card]
+            trigger_res = sum(total_res.values()) - gained - (sum(played.benefit) if played.type == CardType.PROD else 0)
+            trigger_cards = len(p.hand) - hand + 1
+        r = p.resources
+        self.turns.append((state.seed, len(state.log) - 1, seat, action.code, card, free, SEASONS.index(p.season),
+                           r["twig"], r["resin"], r["pebble"], r["berry"], trigger_res, trigger_cards, p.score,
+                           len(p.city), len(p.hand)), self.out)
+        self.rows += 1
+        if state.over:
+            self.end_game(state)
+        return True
+
+    def end_game(self, state: GameState) -> None:
+        p1, p2 = state.players
+        self.games.append((state.seed, len(state.log), p1.score, p2.score, int(2 * score_for(state, 0))), self.out)
+        for seat, p in enumerate(state.players):
+            result = int(2 * score_for(state, seat))
+            for card_id in p.city:
+                self.cities.append((state.seed, seat, card_id, result), self.out)
+
+    def flush(self) -> None:
+        if self.out:
+            for buf in (self.turns, self.games, self.cities):
+                if buf.size:
+                    self.out.write(buf)
+                    buf.size = 0
+
+    def close(self) -> None:
+        self.flush()
+        if self.out: self.out.close()
+
+    def summary(self, game: int) -> List[Dict]:
+        #Podsumowanie gry z bufora (ekran końca gry): darmowe budowy, premie z kart, PZ na koniec każdej pory.
+        out = [{"free": 0, "trigger_res": 0, "season_vp": [0] * len(SEASONS)} for _ in range(2)]
+        cols = {name: self.turns.column(name) for name in ("game", "seat", "free", "trigger_res", "season", "vp")}
+        for i in range(self.turns.size):
+            if cols["game"][i] != game:
+                continue
+            s = out[cols["seat"][i]]
+            s["free"] += cols["free"][i]
+            s["trigger_res"] += cols["trigger_res"][i]
+            season = cols["season"][i]
+            s["season_vp"][season] = max(s["season_vp"][season], cols["vp"][i])
+        for s in out:  # Pora bez ruchu - PZ z poprzedniej
+            for i in range(1, len(SEASONS)):
+                s["season_vp"][i] = max(s["season_vp"][i], s["season_vp"][i - 1])
+        return out
+
+
+# --- Odczyt i agregacje (strumieniowo) ---
+
+def iter_paths(paths: Sequence[str]) -> Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(glob.glob(os.path.join(path, "**", "*" + EXT), recursive=True))
+        else:
+            yield path
+
+
+def iter_batches(paths: Sequence[str], table: int, columns: Sequence[str]) -> Iterator[Tuple[int, Dict[str, array]]]:
+    #(liczba wierszy, {kolumna: array}) dla każdej paczki tabeli; pozostałe kolumny i tabele są przeskakiwane.
+    for path in iter_paths(paths):
+        with open(path, "rb") as f:
+            while header := f.read(BATCH.size):
+                magic, version, tid, rows = BATCH.unpack(header)
+                if magic != MAGIC:
+                    raise ValueError(f"{path}: uszkodzony plik telemetrii")
+                if version != TELEMETRY_VERSION:
+                    raise ValueError(f"{path}: nieobsługiwana wersja telemetrii {version}")
+                batch: Dict[str, array] = {}
+                for name, t in TABLES[tid]:
+                    size = rows * array(t).itemsize
+                    if tid == table and name in columns:
+                        batch[name] = array(t)
+                        batch[name].frombytes(f.read(size))
+                    else:
+                        f.seek(size, 1)
+                if tid == table:
+                    yield rows, batch
+
+
+def card_win_rates(paths: Sequence[str]) -> Dict[int, Tuple[int, float]]:
+    #{id karty: (w ilu miastach była, średni wynik właściciela 0..1)}.
+    seen, points = [0] * len(CARDS), [0] * len(CARDS)
+    for rows, b in iter_batches(paths, T_CITIES, ("card", "result")):
+        card, result = b["card"], b["result"]
+        for i in range(rows):
+            seen[card[i]] += 1
+            points[card[i]] += result[i]
+    return {c: (seen[c], points[c] / 2 / seen[c]) for c in range(len(CARDS)) if seen[c]}
+
+
+def vp_curves(paths: Sequence[str]) -> Tuple[List[float], List[float], int]:
+    #(średnie PZ gracza po jego n-tym ruchu, średnie PZ na koniec każdej pory roku, liczba gier).
+    #Wiersze jednej gry leżą w pliku po kolei, więc trzymamy tylko bieżącą grę.
+    turn_sum: List[int] = []
+    turn_cnt: List[int] = []
+    season_sum = [0] * len(SEASONS)
+    games, current = 0, None
+    moves, season_vp = [0, 0], [[0] * len(SEASONS) for _ in range(2)]
+
+    def close_game():
+        for seat_vp in season_vp:
+            best = 0
+            for s, vp in enumerate(seat_vp):  # Pora bez ruchu (np. pominięta) - PZ z poprzedniej
+                best = max(best, vp)
+                season_sum[s] += best
+
+    for rows, b in iter_batches(paths, T_TURNS, ("game", "seat", "season", "vp")):
+        game, seat, season, vp = b["game"], b["seat"], b["season"], b["vp"]
+        for i in range(rows):
+            if game[i] != current:
+                if current is not None:
+                    close_game()
+                games += 1
+                current = game[i]
+                moves, season_vp = [0, 0], [[0] * len(SEASONS) for _ in range(2)]
+            s, n = seat[i], moves[seat[i]]
+            if n == len(turn_sum):
+                turn_sum.append(0)
+                turn_cnt.append(0)
+            turn_sum[n] += vp[i]
+            turn_cnt[n] += 1
+            moves[s] = n + 1
+            season_vp[s][season[i]] = vp[i]
+    if current is not None:
+        close_game()
+    curve = [t / c for t, c in zip(turn_sum, turn_cnt)]
+    return curve, [v / max(2 * games, 1) for v in season_sum], games
+
+
+def game_totals(paths: Sequence[str]) -> Dict[str, float]:
+    #Średnie na grę: akcje, darmowe budowy, zasoby i karty z premii kart pasywnych; przewaga gracza 0.
+    games = actions = seat0 = 0
+    for rows, b in iter_batches(paths, T_GAMES, ("actions", "result")):
+        games += rows
+        actions += sum(b["actions"])
+        seat0 += sum(b["result"])
+    free = trig_res = trig_cards = 0
+    for rows, b in iter_batches(paths, T_TURNS, ("free", "trigger_res", "trigger_cards")):
+        free += sum(b["free"])
+        trig_res += sum(b["trigger_res"])
+        trig_cards += sum(b["trigger_cards"])
+    n = max(games, 1)
+    return {"games": games, "actions": actions / n, "free_builds": free / n, "trigger_res": trig_res / n,
+            "trigger_cards": trig_cards / n, "seat0_points": seat0 / 2 / n}
+
+
+# --- CLI ---
+
+def record_games(path: str, bots: Tuple[str, str], first_seed: int, games: int, think: float) -> Tuple[int, int]:
+    policies = (resolve(bots[0], think), resolve(bots[1], think))
+    telemetry = Telemetry(path)
+    for seed in range(first_seed, first_seed + games):
+        state, rng = GameState(seed), random.Random(seed)
+        for _ in range(MAX_ROLLOUT_STEPS):
+            if state.over:
+                break
+            telemetry.apply(state, policies[state.turn_idx](state, rng))
+    telemetry.close()
+    return games, telemetry.rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetria gier Forest Valley.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_rec = sub.add_parser("record", help="rozegraj gry botów i zapisz telemetrię")
+    p_rec.add_argument("--games", type=int, default=10000)
+    p_rec.add_argument("--bots", nargs=2, default=["greedy", "random"], help="polityki z engine.tournament")
+    p_rec.add_argument("--seed", type=int, default=1)
+    p_rec.add_argument("--think", type=float, default=20, help="czas na ruch botów mc/mcts [ms]")
+    p_rec.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    p_rec.add_argument("--dir", default="telemetry")
+    p_rep = sub.add_parser("report", help="agregacje z plików telemetrii")
+    p_rep.add_argument("paths", nargs="+", help="pliki .fvt albo katalogi")
+    p_rep.add_argument("--top", type=int, default=10, help="ile kart pokazać z każdego końca")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.cmd == "record":
+        # Każdy proces pisze własny plik - bez blokad, a report i tak czyta cały katalog
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        per = -(-args.games // args.workers)
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(record_games, os.path.join(args.dir, f"{stamp}-{s:08x}{EXT}"), tuple(args.bots),
+                                   s, min(per, args.seed + args.games - s), args.think / 1000)
+                       for s in range(args.seed, args.seed + args.games, per)]
+            games = rows = 0
+            for f in futures:
+                g, r = f.result()
+                games, rows = games + g, rows + r
+        elapsed = time.perf_counter() - start
+        print(f"{games} gier, {rows} wierszy w {elapsed:.1f} s ({games / elapsed:.0f} gier/s) -> {args.dir}/")
+        return
+
+    totals = game_totals(args.paths)
+    print(f"{totals['games']} gier: {totals['actions']:.1f} akcji, {totals['free_builds']:.2f} darmowych budów, "
+          f"premie z kart {totals['trigger_res']:.2f} zasobów + {totals['trigger_cards']:.2f} kart na grę, "
+          f"gracz 1 zdobywa {100 * totals['seat0_points']:.1f}% punktów meczowych")
+
+    rates = sorted(card_win_rates(args.paths).items(), key=lambda x: -x[1][1])
+    print(f"\n{'karta':<16}{'w miastach':>11}{'wynik':>8}")
+    shown = rates if len(rates) <= 2 * args.top else rates[:args.top] + [None] + rates[-args.top:]
+    for item in shown:
+        if item is None:
+            print("...")
+            continue
+        card, (seen, rate) = item
+        print(f"{CARDS[card].name:<16}{seen:>11}{100 * rate:>7.1f}%")
+
+    curve, seasons, games = vp_curves(args.paths)
+    print("\nśrednie PZ na koniec pory roku: " + "  ".join(f"{s} {v:.1f}" for s, v in zip(SEASONS, seasons)))
+    step = max(1, len(curve) // 10)
+    print("krzywa PZ (ruch gracza: PZ): " + "  ".join(f"{n + 1}: {curve[n]:.1f}" for n in range(0, len(curve), step)))
+    print(f"({time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
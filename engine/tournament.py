@@ -0,0 +1,209 @@
+# engine/tournament.py
+# Turniej botów (bez okna): każdy z każdym na tych samych taliach, obie kolejności miejsc dla każdego
+# ziarna - przewaga pierwszego ruchu i szczęście w rozdaniu się znoszą. Gry liczą procesy z puli
+# (po kilka gier na zadanie), każdy wynik od razu trafia do pliku JSON lines, a ranking Elo
+# z przedziałami ufności jest przeliczany na bieżąco.
+#
+#   python -m engine.tournament random greedy mc --seeds 50
+#   python -m engine.tournament greedy mcts --seeds 20 --think 50 --workers 8
+#   python -m engine.tournament greedy moje_boty:agresor      -> własna polityka: moduł:funkcja(state, rng)
+import argparse
+import importlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from typing import Callable, Dict, List, Tuple
+from engine.ai import MAX_ROLLOUT_STEPS, MonteCarloBot, MCTSBot, score_for
+from engine.card import CARDS
+from engine.game_state import GameState, Action, ActionType, LOCATION_DEFS
+
+Policy = Callable[[GameState, random.Random], Action]
+ELO_SCALE = 400 / math.log(10)
+BASE_ELO = 1500
+Z95 = 1.96
+
+
+def random_policy(state: GameState, rng: random.Random) -> Action:
+    return rng.choice(state.legal_actions())
+
+
+def greedy_policy(state: GameState, rng: random.Random) -> Action:
+    # Bez patrzenia w przód: zagraj najcenniejszą kartę, kup najcenniejszą, potem najbogatsze pole
+    p, actions = state.current_player, state.legal_actions()
+    plays = [a for a in actions if a.kind == ActionType.PLAY]  # Zagranie z ręki nic nie kosztuje
+    if plays:
+        return max(plays, key=lambda a: CARDS[p.hand[a.index]].points)
+    buys = [a for a in actions if a.kind == ActionType.BUY]
+    if buys:
+        return max(buys, key=lambda a: CARDS[state.meadow[a.index]].points)
+    places = [a for a in actions if a.kind == ActionType.PLACE_WORKER]
+    if places:
+        return max(places, key=lambda a: sum(LOCATION_DEFS[a.index][1].values()))
+    return actions[0]
+
+
+def search_policy(state: GameState, rng: random.Random, bot=MonteCarloBot, think: float = 0.02) -> Action:
+    # Wyszukiwanie z engine.ai, ale w tym samym procesie - równolegle liczą się całe gry, nie ruchy
+    actions = state.legal_actions()
+    if len(actions) < 2:
+        return actions[0]
+    wins, visits = bot.search(state, actions, state.turn_idx, time.time() + think, rng.getrandbits(32))
+    return actions[bot.pick(wins, visits)]
+
+
+POLICIES: Dict[str, Callable[..., Action]] = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "mc": partial(search_policy, bot=MonteCarloBot),
+    "mcts": partial(search_policy, bot=MCTSBot),
+}
+
+
+def resolve(name: str, think: float) -> Policy:
+    #Nazwa z POLICIES albo "moduł:funkcja" - funkcja(state, rng) zwraca jedną z state.legal_actions().
+    if name in POLICIES:
+        policy = POLICIES[name]
+        return partial(policy, think=think) if isinstance(policy, partial) else policy
+    module, _, func = name.partition(":")
+    if not func:
+        raise ValueError(f"Nieznana polityka {name!r} (dostępne: {', '.join(POLICIES)} albo moduł:funkcja)")
+    return getattr(importlib.import_module(module), func)
+
+
+def play_game(seat0: str, seat1: str, seed: int, think: float) -> Dict:
+    #Jedna gra na regułach GameState; wynik liczy calc_winner, tak jak w grze z oknem.
+    policies = (resolve(seat0, think), resolve(seat1, think))
+    rng = random.Random(seed ^ 0x5EED)
+    state = GameState(seed)
+    start = time.perf_counter()
+    for _ in range(MAX_ROLLOUT_STEPS):
+        if state.over:
+            break
+        state.apply(policies[state.turn_idx](state, rng))
+    else:
+        state.calc_winner()
+    return {"seat0": seat0, "seat1": seat1, "seed": seed, "scores": [p.score for p in state.players],
+            "result": score_for(state, 0), "actions": len(state.log),
+            "seconds": round(time.perf_counter() - start, 4)}
+
+
+def play_chunk(games: List[Tuple[str, str, int]], think: float) -> List[Dict]:
+    return [play_game(a, b, seed, think) for a, b, seed in games]
+
+
+def schedule(bots: List[str], seeds: int, first_seed: int) -> List[Tuple[str, str, int]]:
+    # Każda para, każde ziarno, obie kolejności miejsc - gry z tym samym ziarnem leżą obok siebie
+    return [(x, y, seed) for a, b in itertools.combinations(bots, 2)
+            for seed in range(first_seed, first_seed + seeds) for x, y in ((a, b), (b, a))]
+
+
+class Standings:
+    # Wyniki par (wygrane liczone z remisami po 0.5) i ranking Bradleya-Terry'ego w skali Elo.
+    # Ranking liczymy od nowa z sumy wyników, więc nie zależy od kolejności, w jakiej kończą się gry.
+    def __init__(self, bots: List[str]):
+        self.bots = bots
+        self.wins = {(a, b): 0.0 for a in bots for b in bots if a != b}
+        self.games = {(a, b): 0 for a in bots for b in bots if a != b}
+        self.seat0_points = 0.0
+        self.total = 0
+
+    def add(self, r: Dict) -> None:
+        a, b = r["seat0"], r["seat1"]
+        self.wins[a, b] += r["result"]
+        self.wins[b, a] += 1 - r["result"]
+        self.games[a, b] += 1
+        self.games[b, a] += 1
+        self.seat0_points += r["result"]
+        self.total += 1
+
+    def elo(self, iterations: int = 200) -> Dict[str, Tuple[float, float]]:
+        #{bot: (Elo, połowa 95% przedziału)}. Każda para ma dopisany jeden wirtualny remis (prior),
+        #żeby bot bez wygranej nie miał -nieskończoności.
+        wins = {k: w + 0.5 for k, w in self.wins.items()}
+        games = {k: n + 1 for k, n in self.games.items()}
+        gamma = {a: 1.0 for a in self.bots}
+        for _ in range(iterations):  # Algorytm MM (Hunter 2004)
+            for a in self.bots:
+                w = sum(wins[a, b] for b in self.bots if b != a)
+                d = sum(games[a, b] / (gamma[a] + gamma[b]) for b in self.bots if b != a)
+                gamma[a] = w / d
+            mean = sum(math.log(g) for g in gamma.values()) / len(gamma)
+            gamma = {a: math.exp(math.log(g) - mean) for a, g in gamma.items()}
+        result = {}
+        for a in self.bots:
+            # Błąd standardowy z informacji Fishera dla logarytmu siły
+            info = sum(games[a, b] * gamma[a] * gamma[b] / (gamma[a] + gamma[b]) ** 2 for b in self.bots if b != a)
+            result[a] = (BASE_ELO + ELO_SCALE * math.log(gamma[a]), Z95 * ELO_SCALE / math.sqrt(info))
+        return result
+
+    def points(self, bot: str) -> Tuple[float, int]:
+        return (sum(w for (a, _), w in self.wins.items() if a == bot),
+                sum(n for (a, _), n in self.games.items() if a == bot))
+
+    def line(self) -> str:
+        ratings = sorted(self.elo().items(), key=lambda x: -x[1][0])
+        return "  ".join(f"{bot} {elo:.0f}±{ci:.0f}" for bot, (elo, ci) in ratings)
+
+    def table(self) -> str:
+        rows = [f"{'bot':<16}{'gry':>6}{'pkt%':>8}{'Elo':>8}{'±95%':>7}"]
+        for bot, (elo, ci) in sorted(self.elo().items(), key=lambda x: -x[1][0]):
+            pts, n = self.points(bot)
+            rows.append(f"{bot:<16}{n:>6}{100 * pts / max(n, 1):>7.1f}%{elo:>8.0f}{ci:>7.0f}")
+        rows.append(f"przewaga pierwszego gracza: {100 * self.seat0_points / max(self.total, 1):.1f}% punktów")
+        return "\n".join(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Turniej botów Forest Valley (każdy z każdym, bez okna).")
+    parser.add_argument("bots", nargs="+", help=f"polityki: {', '.join(POLICIES)} albo moduł:funkcja")
+    parser.add_argument("--seeds", type=int, default=20, help="talii na parę (każda grana z obu miejsc)")
+    parser.add_argument("--seed", type=int, default=1, help="pierwsze ziarno")
+    parser.add_argument("--think", type=float, default=20, help="czas na ruch botów mc/mcts [ms]")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--chunk", type=int, default=0, help="gier na zadanie (0 = dobierz automatycznie)")
+    parser.add_argument("--out", default="tournament.jsonl", help="wyniki gier, po jednej linii JSON")
+    args = parser.parse_args()
+    if len(set(args.bots)) < 2:
+        parser.error("potrzeba co najmniej dwóch różnych botów")
+    bots = list(dict.fromkeys(args.bots))
+    think = args.think / 1000
+    for bot in bots:
+        try:
+            resolve(bot, think)  # Literówka w nazwie ma wyjść przed startem puli, nie w procesie roboczym
+        except (ValueError, ImportError, AttributeError) as e:
+            parser.error(str(e))
+
+    games = schedule(bots, args.seeds, args.seed)
+    # Kilka zadań na proces - krótkie gry (random/greedy) nie giną w narzucie przesyłania, a wyniki
+    # i tak spływają na bieżąco
+    chunk = args.chunk or max(1, min(64, len(games) // (args.workers * 8)))
+    standings = Standings(bots)
+    print(f"{len(games)} gier ({len(bots)} botów, {args.seeds} talii x 2 miejsca na parę), "
+          f"{args.workers} procesów, {chunk} gier na zadanie -> {args.out}")
+
+    start = last_print = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn")) as pool, \
+            open(args.out, "w", encoding="utf-8") as out:
+        futures = [pool.submit(play_chunk, games[i:i + chunk], think) for i in range(0, len(games), chunk)]
+        for future in as_completed(futures):
+            for r in future.result():
+                out.write(json.dumps(r) + "\n")
+                standings.add(r)
+            out.flush()
+            now = time.perf_counter()
+            if now - last_print >= 1.0 or standings.total == len(games):
+                last_print = now
+                print(f"[{standings.total}/{len(games)}] {standings.total / (now - start):.1f} gier/s  "
+                      f"{standings.line()}")
+    print()
+    print(standings.table())
+
+
+if __name__ == "__main__":
+    main()
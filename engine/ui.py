@@ -0,0 +1,122 @@
+# engine/ui.py
+# Zachowywane (retained) drzewo UI: sceny budują węzły z gotowymi prostokątami w update_layout(),
+# a kliknięcia i hover obsługuje jeden indeks przestrzenny (siatka komórek) zamiast pętli po przyciskach.
+# Układ liczymy ponownie tylko wtedy, gdy zmienia się rozmiar okna; pojedyncze węzły przesuwa move().
+import pygame
+from typing import Callable, Dict, List, Optional, Tuple
+
+CELL = 64  # Bok komórki siatki w pikselach - przyciski i karty zajmują kilka komórek
+
+
+class Node:
+    # Węzeł drzewa: grupa (np. "SETTINGS") albo liść z prostokątem i akcją po kliknięciu.
+    # index - numer slotu (np. karta w ręce), żeby jedna akcja obsłużyła cały rząd kart.
+    __slots__ = ("key", "rect", "on_click", "index", "parent", "children", "visible")
+
+    def __init__(self, key: str, rect: Optional[pygame.Rect] = None, on_click: Optional[Callable] = None,
+                 index: int = 0, parent: Optional["Node"] = None):
+        self.key = key
+        self.rect = rect
+        self.on_click = on_click
+        self.index = index
+        self.parent = parent
+        self.children: List["Node"] = []
+        self.visible = True
+
+    def shown(self) -> bool:
+        #Węzeł jest widoczny, jeśli on i wszyscy jego przodkowie są widoczni.
+        node = self
+        while node is not None:
+            if not node.visible:
+                return False
+            node = node.parent
+        return True
+
+
+class UITree:
+    def __init__(self):
+        self.root = Node("root")
+        self.nodes: Dict[str, Node] = {}
+        self.size: Optional[Tuple[int, int]] = None
+        self.hovered: Optional[Node] = None
+        self.mouse_pos: Tuple[int, int] = (-1, -1)
+        self._grid: Dict[Tuple[int, int], List[Node]] = {}
+        self._order: Dict[Node, int] = {}  # Kolejność dodania = kolejność rysowania (późniejszy jest na wierzchu)
+
+    def resize(self, size: Tuple[int, int]) -> bool:
+        #Czyści drzewo pod nowy rozmiar okna. False = rozmiar bez zmian, stary układ jest aktualny.
+        if size == self.size:
+            return False
+        self.size = size
+        self.root.children.clear()
+        self.nodes.clear()
+        self.hovered = None
+        self._grid.clear()
+        self._order.clear()
+        return True
+
+    def group(self, key: str, parent: Optional[Node] = None) -> Node:
+        parent = parent or self.root
+        node = Node(key, parent=parent)
+        parent.children.append(node)
+        self.nodes[key] = node
+        return node
+
+    def add(self, key: str, rect: pygame.Rect, on_click: Optional[Callable] = None, index: int = 0,
+            parent: Optional[Node] = None) -> Node:
+        #Dodaje liść i wpisuje go do każdej komórki siatki, którą przykrywa.
+        parent = parent or self.root
+        node = Node(key, pygame.Rect(rect), on_click, index, parent)
+        parent.children.append(node)
+        self.nodes[key] = node
+        self._order[node] = len(self._order)
+        for cell in self._cells(node.rect):
+            self._grid.setdefault(cell, []).append(node)
+        return node
+
+    def move(self, key: str, rect: pygame.Rect) -> None:
+        #Nowy prostokąt liścia bez przebudowy drzewa - przepisujemy tylko jego komórki siatki.
+        node = self.nodes[key]
+        for cell in self._cells(node.rect):
+            self._grid[cell].remove(node)
+        node.rect = pygame.Rect(rect)
+        for cell in self._cells(node.rect):
+            self._grid.setdefault(cell, []).append(node)
+
+    def __getitem__(self, key: str) -> Node:
+        return self.nodes[key]
+
+    def show(self, key: str, visible: bool = True) -> None:
+        self.nodes[key].visible = visible
+        self.hovered = self.hit(self.mouse_pos)
+
+    @staticmethod
+    def _cells(rect: pygame.Rect):
+        for cx in range(rect.left // CELL, (rect.right - 1) // CELL + 1):
+            for cy in range(rect.top // CELL, (rect.bottom - 1) // CELL + 1):
+                yield cx, cy
+
+    def hit(self, pos: Tuple[int, int]) -> Optional[Node]:
+        #Najwyżej leżący widoczny węzeł pod kursorem - sprawdzamy tylko kandydatów z jednej komórki.
+        best = None
+        for node in self._grid.get((pos[0] // CELL, pos[1] // CELL), ()):
+            if node.rect.collidepoint(pos) and node.shown():
+                if best is None or self._order[node] > self._order[best]:
+                    best = node
+        return best
+
+    def click(self, pos: Tuple[int, int]) -> Optional[Node]:
+        #Wywołuje akcję klikniętego węzła. Zwraca węzeł (albo None, gdy kliknięto w tło).
+        node = self.hit(pos)
+        if node is not None and node.on_click is not None:
+            node.on_click(node)
+        return node
+
+    def hover(self, pos: Tuple[int, int]) -> Tuple[Optional[Node], Optional[Node]]:
+        #Aktualizuje węzeł pod kursorem. Zwraca (stary, nowy) - równe, jeśli nic się nie zmieniło.
+        self.mouse_pos = pos
+        old, self.hovered = self.hovered, self.hit(pos)
+        return old, self.hovered
+
+    def is_hovered(self, key: str) -> bool:
+        return self.hovered is not None and self.hovered.key == key
@@ -1,6 +1,28 @@
 # main.py
-from engine.app import App
+import time
+T0 = time.perf_counter()  # Początek startu dla --startup-profile - przed importem silnika i pygame
+
+import argparse
+import sys
+from settings import STARTUP_BUDGET_MS
 
 if __name__ == "__main__":
-    app = App()
-    app.run()
\ No newline at end of file
+    # Silnik (i pygame) dopiero tutaj - procesy AI startują metodą spawn i importują ten plik od nowa
+    from engine.app import App
+    from engine.perf import StartupProfile
+
+    parser = argparse.ArgumentParser(description="Forest Valley")
+    parser.add_argument("--connect", metavar="HOST:PORT",
+                        help="gra sieciowa z serwerem (python -m engine.net serve / engine.host serve)")
+    parser.add_argument("--session", type=lambda s: int(s, 16),
+                        help="numer gry na serwerze wielu gier (szesnastkowo), żeby do niej wrócić")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help=f"zmierz fazy startu, wyjdź po pierwszej klatce menu (kod 1 gdy pierwsza "
+                             f"klatka później niż {STARTUP_BUDGET_MS} ms)")
+    args = parser.parse_args()
+    profile = StartupProfile(T0, STARTUP_BUDGET_MS) if args.startup_profile else None
+    app = App(connect=args.connect, session=args.session, profile=profile)
+    app.run()
+    if profile:
+        print(profile.report())
+        sys.exit(0 if profile.within_budget else 1)
@@ -5,6 +5,39 @@ SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 800
 FPS = 60
 
+# PRZECIWNIK KOMPUTEROWY
+AI_SEAT = None  # Indeks gracza sterowanego przez AI (np. 1), None = dwóch ludzi przy jednym ekranie
+AI_KIND = "MCTS"  # "MC" - płaski Monte Carlo, "MCTS" - drzewo z tablicą transpozycji
+AI_TIME_BUDGET = 1.0  # Sekundy na jeden ruch AI (rozgrywki liczone równolegle na wszystkich rdzeniach)
+
+# POWTÓRKI
+REPLAY_DIR = "replays"  # Tu trafia ziarno + log akcji każdej gry (python -m engine.replay), None = bez zapisu
+AUTOSAVE_PATH = "saves/autosave.fvs"  # Stan gry zapisywany w tle po każdej turze, None = bez autozapisu
+TELEMETRY_DIR = None  # np. "telemetry" - telemetria tur każdej gry (python -m engine.telemetry report)
+
+# SERWER GIER (python -m engine.host)
+SESSION_DIR = "sessions"  # Stan gier uśpionych po bezczynności
+SESSION_IDLE_S = 60  # Po tylu sekundach bez ruchu gra jest usypiana na dysk
+SESSION_EXPIRE_S = 24 * 3600  # Gra porzucona w trakcie (bez graczy) jest usuwana po tylu sekundach
+
+# START
+FONT_CACHE_PATH = ".cache/fonts.json"  # Zapamiętane pliki czcionek systemowych, None = szukaj przy każdym starcie
+STARTUP_BUDGET_MS = 400  # Limit czasu do pierwszej klatki sprawdzany przez python main.py --startup-profile
+
+# DŹWIĘK
+SFX_CHANNELS = 8  # Kanały zarezerwowane na efekty (przy braku wolnego cichszy/starszy efekt jest przerywany)
+MUSIC_TRACKS = ["assets/menu_sound.wav", "assets/menu_sound.ogg"]  # Pierwszy istniejący gra w pętli
+
+# RENDEROWANIE
+DIRTY_RECTS = True  # Aktualizujemy tylko zmienione fragmenty ekranu (False = pełny flip co klatkę)
+IDLE_WAIT_MS = 1000  # Jak długo pętla śpi bez zdarzeń, gdy nic się nie zmienia
+ASSET_CACHE_MB = 64  # Limit pamięci na przeskalowane warianty grafik (AssetStore)
+
+# WYDAJNOŚĆ (nakładka przełączana klawiszem F3)
+PERF_HUD = False  # Nakładka widoczna od startu
+PERF_EXPORT_FILE = None  # np. "perf.jsonl" - co sekundę jedna linia JSON z licznikami
+PERF_METRICS_PORT = None  # np. 9108 - http://127.0.0.1:9108/metrics (format Prometheus), / (JSON)
+
 # DOSTĘPNE ROZDZIELCZOŚCI
 RESOLUTIONS = [
     (1024, 768),
@@ -0,0 +1,43 @@
+# tests/conftest.py
+# Testy bez okna i dźwięku (sterowniki SDL "dummy"). Ścieżki do grafik są względne, więc pracujemy
+# w katalogu projektu, a wszystko, co gra zapisuje (powtórki, autozapis), kierujemy do tmp_path.
+import asyncio
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pytest
+from engine.net import MSG_HELLO, MSG_WELCOME, frame, read_frame
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    #App po załadowaniu grafik, z powtórkami i autozapisem w tmp_path.
+    monkeypatch.chdir(ROOT)
+    import engine.app
+    import engine.game_manager
+    monkeypatch.setattr(engine.app, "AUTOSAVE_PATH", str(tmp_path / "autosave.fvs"))
+    monkeypatch.setattr(engine.game_manager, "REPLAY_DIR", str(tmp_path / "replays"))
+    monkeypatch.setattr(engine.game_manager, "TELEMETRY_DIR", None)
+    app = engine.app.App()
+    app.loader.wait()
+    app.finish_loading()
+    yield app
+    if app.autosaver: app.autosaver.flush()
+    app.reset_game_manager()
+
+
+@pytest.fixture
+def connect():
+    #Klient protokołu engine.net na gołych strumieniach: HELLO i odebrany WELCOME -> (reader, writer, WELCOME).
+    async def connect(port: int, payload: bytes = b""):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(frame(MSG_HELLO, payload))
+        msg_type, welcome = await asyncio.wait_for(read_frame(reader), 5)
+        assert msg_type == MSG_WELCOME
+        return reader, writer, welcome
+    return connect
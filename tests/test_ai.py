@@ -0,0 +1,61 @@
+# tests/test_ai.py
+import random
+import time
+from concurrent.futures import wait
+import pytest
+from engine import ai
+from engine.game_state import GameState
+
+
+def test_unpicklable_search_falls_back_to_legal_move(monkeypatch):
+    # Zadanie, którego nie da się wysłać do procesu, nie może wywrócić gry - bot gra ruch awaryjny
+    monkeypatch.setattr(ai.MonteCarloBot, "search", staticmethod(lambda *args: ([], [])))
+    state = GameState(3)
+    bot = ai.MonteCarloBot(1, time_budget=0.05, workers=2)
+    assert bot.choose(state) in state.legal_actions()
+    assert not bot.thinking
+
+
+def test_broken_pool_falls_back_and_recovers():
+    state = GameState(4)
+    bot = ai.MonteCarloBot(1, time_budget=0.5, workers=2)
+    bot.start(state)
+    for process in list(ai.get_pool(2)._processes.values()):
+        process.kill()
+    wait(bot._futures)
+    assert bot.poll() in state.legal_actions()
+    assert ai._pool is None
+    # Następny ruch startuje nową pulę i znów liczy rozgrywki
+    assert bot.choose(state) in state.legal_actions()
+    assert bot.playouts > 0
+
+
+@pytest.mark.parametrize("search", [ai.evaluate_actions, ai.mcts_search])
+def test_search_respects_deadline(search):
+    state = GameState(6)
+    actions = state.legal_actions()
+    start = time.time()
+    wins, visits = search(state, actions, 1, start + 0.2, seed=1)
+    # Deadline sprawdzany co rozgrywkę - spóźnienie najwyżej o jedną grę do końca
+    assert time.time() - start < 0.2 + 0.5
+    assert len(wins) == len(visits) == len(actions)
+    assert sum(visits) > 0 and all(0 <= w <= n for w, n in zip(wins, visits))
+
+
+@pytest.mark.parametrize("kind", sorted(ai.BOTS))
+def test_bot_plays_legal_moves_within_budget(kind):
+    bot = ai.BOTS[kind](1, time_budget=0.2, workers=2)
+    state, rng = GameState(7), random.Random(7)
+    bot.choose(state)  # Rozgrzanie puli procesów (spawn) - nie liczy się do budżetu ruchu
+    for _ in range(3):
+        while state.turn_idx != bot.seat:
+            state.apply(rng.choice(state.legal_actions()))
+        start = time.time()
+        bot.start(state)
+        action = None
+        while action is None:
+            action = bot.poll()
+            time.sleep(0.01)
+        assert time.time() - start < 0.2 + 1.0
+        assert action in state.legal_actions()
+        assert state.apply(action)
@@ -0,0 +1,49 @@
+# tests/test_assets.py
+import os
+import pygame
+import pytest
+import bake_assets
+from engine import assets
+from engine.assets import IMAGE_SPECS, AssetLoader, AssetStore, load_pack
+
+
+@pytest.fixture
+def asset_dir(monkeypatch, tmp_path):
+    #Własne źródła grafik (z tłami, których nie ma w repozytorium) i paczki w tmp_path.
+    pygame.init()
+    src = tmp_path / "assets"
+    src.mkdir()
+    for files, _ in IMAGE_SPECS.values():
+        for filename in files.values():
+            pygame.image.save(pygame.Surface((64, 48)), str(src / filename))
+    monkeypatch.setattr(assets, "ASSET_DIR", str(src))
+    monkeypatch.setattr(assets, "PACK_DIR", str(tmp_path / "packs"))
+    return src
+
+
+def test_backgrounds_follow_resolution(asset_dir):
+    bake_assets.bake((640, 480))
+    store = AssetStore()
+    loader = AssetLoader(store).start((640, 480)).wait()
+    assert store.get("backgrounds", "game").get_size() == (640, 480)
+
+    # Z paczką dla nowej rozdzielczości - tła gotowe w docelowym rozmiarze
+    bake_assets.bake((800, 600))
+    loader.set_resolution((800, 600))
+    loader.wait()
+    assert store.get("backgrounds", "menu").get_size() == (800, 600)
+
+    # Bez paczki - pliki źródłowe, nie tło przeskalowane pod poprzedni ekran
+    loader.set_resolution((1024, 768))
+    loader.wait()
+    assert store.get("backgrounds", "menu").get_size() == (64, 48)
+    assert store.get("cards", "Farma").get_size() == IMAGE_SPECS["cards"][1]
+
+
+def test_stale_pack_is_ignored(asset_dir):
+    bake_assets.bake((640, 480))
+    assert load_pack((640, 480)) is not None
+    farm = asset_dir / "farm.png"
+    st = farm.stat()
+    os.utime(farm, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert load_pack((640, 480)) is None
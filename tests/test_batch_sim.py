@@ -0,0 +1,83 @@
+# tests/test_batch_sim.py
+# BatchSim ma te same zasady co GameState, tylko na tablicach - te same rozdania i te same ruchy
+# muszą dać identyczny przebieg gry.
+import random
+import numpy as np
+import pytest
+from engine import batch_sim
+from engine.batch_sim import BatchSim, BUY, NEXT_SEASON, PLACE, PLAY
+from engine.card import CARDS
+from engine.game_state import GameState, ActionType, RESOURCE_ORDER
+from engine.snapshot import SEASONS
+
+SEEDS = list(range(12))
+
+
+def batch_from(states) -> BatchSim:
+    #BatchSim z rozdaniem przepisanym z GameState (NumPy tasuje inaczej niż random.Random).
+    sim = BatchSim(len(states), seed=0)
+    sim.hand[:], sim.meadow[:] = 0, 0
+    for row, g in enumerate(states):
+        sim.deck[row, :len(g.deck)] = g.deck
+        sim.deck_top[row] = len(g.deck)
+        for p, player in enumerate(g.players):
+            for c in player.hand:
+                sim.hand[row, p, c] += 1
+        for c in g.meadow:
+            sim.meadow[row, c] += 1
+    return sim
+
+
+def flat(g: GameState, action) -> int:
+    match action.kind:
+        case ActionType.NEXT_SEASON:
+            return NEXT_SEASON
+        case ActionType.PLACE_WORKER:
+            return PLACE + action.index
+        case ActionType.BUY:
+            return BUY + g.meadow[action.index]
+        case ActionType.PLAY:
+            return PLAY + g.current_player.hand[action.index]
+
+
+def assert_same(sim: BatchSim, row: int, g: GameState) -> None:
+    assert sim.over[row] == g.over and sim.turn[row] == g.turn_idx
+    assert sim.deck_top[row] == len(g.deck)
+    assert sorted(np.repeat(np.arange(len(CARDS)), sim.meadow[row])) == sorted(g.meadow)
+    for p, player in enumerate(g.players):
+        assert list(sim.res[row, p]) == [player.resources[r] for r in RESOURCE_ORDER]
+        assert list(sim.hand[row, p]) == [player.hand.count(c) for c in range(len(CARDS))]
+        assert list(sim.city[row, p]) == [player.city.count(c) for c in range(len(CARDS))]
+        assert SEASONS[sim.season[row, p]] == player.season and sim.finished[row, p] == player.finished
+        assert (sim.workers_total[row, p], sim.workers_available[row, p]) == \
+            (player.workers_total, player.workers_available)
+    assert sim.score()[row].tolist() == [p.score for p in g.players]
+
+
+@pytest.mark.parametrize("chooser", ["random", "greedy"])
+def test_batch_matches_game_state(chooser):
+    states = [GameState(seed) for seed in SEEDS]
+    rngs = [random.Random(seed) for seed in SEEDS]
+    sim = batch_from(states)
+    for row, g in enumerate(states):
+        assert_same(sim, row, g)
+
+    while not all(g.over for g in states):
+        legal = sim.legal_mask()
+        greedy = batch_sim.greedy_policy(sim, legal)
+        choice = np.zeros(len(states), dtype=np.int64)
+        for row, g in enumerate(states):
+            actions = g.legal_actions()
+            assert sorted(np.flatnonzero(legal[row])) == sorted({flat(g, a) for a in actions})
+            if not actions:
+                continue
+            if chooser == "greedy":
+                # Ruch wybiera polityka BatchSim, GameState wykonuje jego odpowiednik
+                action = next(a for a in actions if flat(g, a) == greedy[row])
+            else:
+                action = rngs[row].choice(actions)
+            choice[row] = flat(g, action)
+            assert g.apply(action)
+        sim.step(lambda s, legal: choice)
+        for row, g in enumerate(states):
+            assert_same(sim, row, g)
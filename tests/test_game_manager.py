@@ -0,0 +1,76 @@
+# tests/test_game_manager.py
+import time
+from array import array
+from engine.card import CARDS
+from engine.game_state import HAND_MAX
+from engine.replay import read_replay
+
+
+def test_full_hand_is_drawn_and_hoverable(app):
+    # Polana dobiera do 8 kart, a lato dokłada 2 - każda karta ręki ma swój slot w UI
+    app.change_state("GAME")
+    game = app.game
+    game.current_player.hand = array('B', (i % len(CARDS) for i in range(HAND_MAX)))
+    game.draw()
+    last = game.ui[f"hand{HAND_MAX - 1}"]
+    game.handle_motion(last.rect.center)
+    assert game.hovered_card() is CARDS[game.current_player.hand[-1]]
+    game.draw()
+    assert game.tooltip_rect is not None
+
+
+def test_hand_slots_follow_hand_size(app):
+    # Zwykły odstęp dla małej ręki, ściśnięcie tylko przy przepełnieniu - bez zmiany rozmiaru okna
+    app.change_state("GAME")
+    game = app.game
+    slots = [game.ui[f"hand{i}"] for i in range(HAND_MAX)]
+    game.current_player.hand = array('B', range(4))
+    game.draw()
+    assert slots[1].rect.x - slots[0].rect.x == 110
+    assert [s.visible for s in slots] == [i < 4 for i in range(HAND_MAX)]
+    assert game.ui.hit(slots[5].rect.center) is None
+
+    game.current_player.hand = array('B', (i % len(CARDS) for i in range(HAND_MAX)))
+    game.draw()
+    assert slots[1].rect.x - slots[0].rect.x < 110
+    assert slots[-1].rect.right <= game.ui["next_season"].rect.left
+    assert game.ui.hit(slots[-1].rect.center) is slots[-1]
+
+
+def test_replay_file_only_for_played_games(app, tmp_path):
+    replays = tmp_path / "replays"
+    app.change_state("GAME")
+    app.change_state("MENU")
+    app.reset_game_manager()
+    assert not replays.exists() or not list(replays.iterdir())
+
+    # Wyjście do menu zamyka plik, a ruch po powrocie dopisuje do tej samej powtórki
+    app.change_state("GAME")
+    game = app.game
+    game.apply(game.state.legal_actions()[0])
+    app.change_state("MENU")
+    app.change_state("GAME")
+    game.apply(game.state.legal_actions()[0])
+    app.reset_game_manager()
+    (path,) = replays.iterdir()
+    seed, log = read_replay(str(path))
+    assert seed == game.state.seed and log == bytes(game.state.log)
+
+
+def test_ai_turn_with_autosave(app, monkeypatch):
+    # Stan z hookiem autozapisu musi dać się przesłać do procesów AI
+    import engine.game_manager
+    monkeypatch.setattr(engine.game_manager, "AI_TIME_BUDGET", 0.05)
+    assert app.autosaver is not None
+    app.ai_seat = 1
+    app.change_state("GAME")
+    game = app.game
+    assert game.state.turn_hook is not None
+    while not game.ai_turn():
+        game.apply(game.state.legal_actions()[0])
+    log_len = len(game.state.log)
+    deadline = time.time() + 30
+    while len(game.state.log) == log_len and time.time() < deadline:
+        game.update()
+        time.sleep(0.01)
+    assert len(game.state.log) > log_len
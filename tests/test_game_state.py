@@ -0,0 +1,81 @@
+# tests/test_game_state.py
+import random
+import pytest
+from engine.card import CARDS
+from engine.game_state import (GameState, Action, ActionType, ACTION_KINDS, HAND_LIMIT, HAND_MAX, LOCATION_DEFS,
+                               MEADOW_SIZE)
+
+
+def random_game(seed: int, check=lambda state: None) -> GameState:
+    state, rng = GameState(seed), random.Random(seed)
+    while not state.over:
+        check(state)
+        assert state.apply(rng.choice(state.legal_actions()))
+    return state
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_legal_actions_always_apply(seed):
+    # Każda akcja z legal_actions przechodzi, a log rośnie o jeden bajt na wykonaną akcję
+    def check(state):
+        for action in state.legal_actions():
+            sim = state.clone()
+            assert sim.apply(action), action
+            assert sim.log == state.log + bytes([action.code])
+        for p in state.players:
+            assert len(p.hand) <= HAND_MAX
+        assert len(state.meadow) <= MEADOW_SIZE
+
+    state = random_game(seed, check)
+    assert state.legal_actions() == []
+    assert all(p.finished for p in state.players)
+    assert state.winner_text
+
+
+def test_rejected_actions_leave_state_unchanged():
+    state = GameState(3)
+    key, log = state.canonical_key(), bytes(state.log)
+    rejected = [Action(ActionType.NEXT_SEASON),  # Robotnicy jeszcze nie wysłani
+                Action(ActionType.PLACE_WORKER, len(LOCATION_DEFS)),
+                Action(ActionType.BUY, MEADOW_SIZE),
+                Action(ActionType.PLAY, len(state.current_player.hand))]
+    for action in rejected:
+        assert not state.apply(action), action
+    assert state.canonical_key() == key and bytes(state.log) == log
+
+    # Zajęte pole wyłączne - drugi gracz nie może tam wysłać robotnika
+    assert state.apply(Action(ActionType.PLACE_WORKER, 0))
+    assert Action(ActionType.PLACE_WORKER, 0) not in state.legal_actions()
+    assert not state.apply(Action(ActionType.PLACE_WORKER, 0))
+
+
+def test_full_hand_cannot_buy():
+    state = GameState(4)
+    p = state.current_player
+    p.resources = dict.fromkeys(p.resources, 99)
+    while len(p.hand) < HAND_LIMIT:
+        p.hand.append(state.deck.pop())
+    assert not any(a.kind == ActionType.BUY for a in state.legal_actions())
+    assert not state.apply(Action(ActionType.BUY, 0))
+
+
+def test_finished_game_rejects_actions():
+    state = random_game(5)
+    assert not state.apply(Action(ActionType.NEXT_SEASON))
+
+
+def test_action_codes_round_trip():
+    for kind in ACTION_KINDS:
+        for index in range(16):
+            action = Action(kind, index)
+            assert Action.from_code(action.code) == action
+    with pytest.raises(ValueError):
+        Action.from_code(len(ACTION_KINDS) << 4)
+
+
+def test_same_seed_same_deal():
+    a, b = GameState(11), GameState(11)
+    assert a.deck == b.deck and a.meadow == b.meadow
+    assert [p.hand for p in a.players] == [p.hand for p in b.players]
+    assert sorted([*a.deck, *a.meadow, *(c for p in a.players for c in p.hand)]) == \
+        sorted(list(range(len(CARDS))) * 4)
@@ -0,0 +1,81 @@
+# tests/test_host.py
+import asyncio
+import os
+import time
+from engine.host import SessionHost
+from engine.net import ACTION, MSG_HELLO, MSG_ACTION, MSG_REJECT, SESSION, WELCOME, frame, read_frame
+from engine.snapshot import loads
+
+
+def test_malformed_frames(tmp_path, connect):
+    async def main():
+        host = SessionHost(directory=str(tmp_path), record=False)
+        listener = await host.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        (r0, w0, _), (r1, w1, _) = await connect(port), await connect(port)
+        (session,) = host.sessions.values()
+
+        # Nieznany rodzaj akcji - odrzucenie, połączenie zostaje
+        w0.write(frame(MSG_ACTION, ACTION.pack(1, 0xF0)))
+        msg_type, _ = await asyncio.wait_for(read_frame(r0), 5)
+        assert msg_type == MSG_REJECT
+
+        # Za krótki HELLO z numerem gry i za krótka akcja - rozłączony tylko nadawca
+        r2, w2 = await asyncio.open_connection("127.0.0.1", port)
+        w2.write(frame(MSG_HELLO, b"\x01"))
+        await asyncio.wait_for(r2.read(), 5)
+        w1.write(frame(MSG_ACTION, b"\x01"))
+        await asyncio.wait_for(r1.read(), 5)
+        await asyncio.sleep(0)
+        assert session.conns[0] is not None and session.conns[1] is None
+
+        # Zwolnione miejsce można zająć, wracając do tej samej gry
+        r3, w3, _ = await connect(port, SESSION.pack(session.id))
+        assert session.conns[1] is not None
+        for w in (w0, w1, w2, w3):
+            w.close()
+        listener.close()
+        host.flush()
+
+    asyncio.run(main())
+
+
+def test_session_id_is_not_the_seed(tmp_path, connect):
+    async def main():
+        host = SessionHost(directory=str(tmp_path), record=False)
+        listener = await host.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        r0, w0, welcome = await connect(port)
+        (session,) = host.sessions.values()
+        seat, sid = WELCOME.unpack_from(welcome)
+        view, _ = loads(welcome[WELCOME.size:])
+        assert sid == session.id and sid != session.state.seed and view.seed == 0
+        w0.close()
+        listener.close()
+        host.close()
+        assert host._sweeper_task is None
+
+    asyncio.run(main())
+
+
+def test_abandoned_sessions_expire(tmp_path):
+    host = SessionHost(directory=str(tmp_path), idle_after=0, record=False, expire_after=3600)
+    kept, abandoned = host.create(1), host.create(2)
+    host.sweep()
+    host.flush()
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(host.path(s.id)) for s in (kept, abandoned))
+
+    # Porzucona w trakcie (bez graczy dłużej niż expire_after) - znika z pamięci i z dysku
+    abandoned.last_active -= 3600
+    host.sweep()
+    host.flush()
+    assert abandoned.id not in host.sessions and kept.id in host.sessions
+    assert os.listdir(tmp_path) == [os.path.basename(host.path(kept.id))]
+    assert host.report()["expired"] == 1
+
+    # Plik gry uśpionej przez poprzedni proces serwera też wygasa
+    old = time.time() - 7200
+    os.utime(host.path(kept.id), (old, old))
+    host.expire_files()
+    assert os.listdir(tmp_path) == []
+    host.close()
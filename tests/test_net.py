@@ -0,0 +1,119 @@
+# tests/test_net.py
+import asyncio
+import contextlib
+import socket
+import threading
+import time
+from engine.net import (GameServer, NetClient, ACTION, FRAME, MSG_ACTION, MSG_DELTA, MSG_REJECT, MSG_WELCOME, frame,
+                        public_snapshot, read_frame)
+from engine.game_state import GameState
+from engine.replay import replay
+from engine.snapshot import HEADER, loads
+
+
+def test_malformed_frames(connect):
+    async def main():
+        server = GameServer(seed=1, record=False)
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        (r0, w0, _), (r1, w1, _) = await connect(port), await connect(port)
+
+        # Nieznany rodzaj akcji - odrzucenie, połączenie zostaje
+        w0.write(frame(MSG_ACTION, ACTION.pack(1, 0xF0)))
+        msg_type, _ = await asyncio.wait_for(read_frame(r0), 5)
+        assert msg_type == MSG_REJECT
+        w0.write(frame(MSG_ACTION, ACTION.pack(2, server.state.legal_actions()[0].code)))
+        msg_type, _ = await asyncio.wait_for(read_frame(r0), 5)
+        assert msg_type == MSG_DELTA
+
+        # Ramka za krótka na ACTION i pusta ramka - rozłączony zostaje tylko nadawca, miejsce się zwalnia
+        w1.write(frame(MSG_ACTION, b"\x01"))
+        await asyncio.wait_for(r1.read(), 5)  # Do końca strumienia = serwer zamknął połączenie
+        w0.write(FRAME.pack(0))
+        await asyncio.wait_for(r0.read(), 5)
+        await asyncio.sleep(0)
+        assert server.clients == [None, None]
+        r2, w2, _ = await connect(port)
+        for w in (w0, w1, w2):
+            w.close()
+        listener.close()
+
+    asyncio.run(main())
+
+
+def test_public_snapshot_hides_deck():
+    state = GameState(1234)
+    for _ in range(10):
+        state.apply(state.legal_actions()[0])
+    data = public_snapshot(state)
+    magic, _, seed = HEADER.unpack_from(data)
+    assert seed == 0
+    view, _ = loads(data)
+    assert view.seed == 0 and not view.deck and not view.log
+    # Ani ziarno, ani log z widoku klienta nie odtwarzają talii serwera
+    assert replay(view.seed, bytes(view.log)).deck != state.deck
+    assert view.meadow == state.meadow and [p.hand for p in view.players] == [p.hand for p in state.players]
+
+
+def fake_server(reply: bytes) -> int:
+    # Serwer na gołym gnieździe: odbiera HELLO i odsyła podane bajty
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def run():
+        conn, _ = listener.accept()
+        with conn, listener:
+            conn.recv(64)
+            conn.sendall(reply)
+            conn.recv(64)  # Czekamy, aż klient się rozłączy
+
+    threading.Thread(target=run, daemon=True).start()
+    return listener.getsockname()[1]
+
+
+def wait_for(client: NetClient, check, timeout: float = 5.0) -> None:
+    deadline = time.time() + timeout
+    while not check() and time.time() < deadline:
+        client.poll()
+        time.sleep(0.01)
+    assert check()
+
+
+def test_client_reports_malformed_frames():
+    # Pusta ramka (błąd w wątku sieci) i WELCOME za krótki na nagłówek (błąd w poll) - oba widać w error
+    for reply in (FRAME.pack(0), frame(MSG_WELCOME, b"\x00")):
+        client = NetClient("127.0.0.1", fake_server(reply)).start()
+        wait_for(client, lambda: client.error is not None)
+        assert "Błędna wiadomość" in client.error and not client.ready
+        client.close()
+
+
+def test_client_reports_only_accepted_actions():
+    box, started = {}, threading.Event()
+
+    def run_server():
+        async def main():
+            box["server"] = GameServer(seed=1, record=False)
+            box["srv"] = await box["server"].start(port=0)
+            started.set()
+            await box["srv"].serve_forever()
+        with contextlib.suppress(asyncio.CancelledError):
+            asyncio.run(main())
+
+    threading.Thread(target=run_server, daemon=True).start()
+    started.wait(5)
+    port = box["srv"].sockets[0].getsockname()[1]
+    clients = [NetClient("127.0.0.1", port).start() for _ in range(2)]
+    for c in clients:
+        wait_for(c, lambda: c.ready)
+    mover = next(c for c in clients if c.seat == c.confirmed.turn_idx)
+    other = next(c for c in clients if c is not mover)
+
+    other.send(other.view.legal_actions()[0])  # Nie jego tura - odrzucona
+    wait_for(other, lambda: not other.pending)
+    assert other.accepted == []
+    action = mover.view.legal_actions()[0]
+    mover.send(action)
+    wait_for(mover, lambda: not mover.pending)
+    assert mover.accepted == [action]
+    for c in clients:
+        c.close()
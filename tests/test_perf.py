@@ -0,0 +1,23 @@
+# tests/test_perf.py
+import pygame
+from engine.perf import PerfMonitor
+
+
+def test_overlay_redraws_at_most_every_interval():
+    pygame.init()
+    screen = pygame.Surface((640, 480))
+    perf = PerfMonitor(overlay=True, export_interval=60.0)
+    assert perf.overlay_due()
+    perf.begin_draw()
+    rect = perf.draw(screen)
+    perf.end_draw("MENU")
+    assert rect is not None and perf.overlay_rect == rect
+    # Ta sama treść do końca interwału: panel tylko wraca na ekran, bez zgłaszania prostokąta
+    assert not perf.overlay_due()
+    assert perf.draw(screen) is None
+    # Rysowanie nakładki liczy się do klatki (blit panelu)
+    assert perf.counts[-1][0] >= 1
+    perf.toggle_overlay()
+    perf.toggle_overlay()
+    assert perf.overlay_due()
+    perf.close()
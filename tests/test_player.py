@@ -0,0 +1,52 @@
+# tests/test_player.py
+import random
+import pytest
+from engine.card import CARDS
+from engine.game_state import GameState
+from engine.player import Player
+
+
+def indexes(p: Player):
+    return (p.score, p.links, {tag: [c.id for c in cards] for tag, cards in p.triggers.items()},
+            [c.id for c in p.producers])
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_incremental_indexes_match_rebuild(seed):
+    # Indeksy aktualizowane w add_to_city muszą zgadzać się z przeliczeniem miasta od zera
+    state, rng = GameState(seed), random.Random(seed)
+    while not state.over:
+        state.apply(rng.choice(state.legal_actions()))
+        for p in state.players:
+            rebuilt = p.clone()
+            rebuilt.rebuild_indexes()
+            assert indexes(p) == indexes(rebuilt)
+            assert p.score == sum(CARDS[c].points for c in p.city)
+
+
+def test_clone_is_independent():
+    # Symulacje (AI, MCTS) grają na kopiach - nic z kopii nie może przeciec do prawdziwej gry
+    state, rng = GameState(8), random.Random(8)
+    for _ in range(40):
+        state.apply(rng.choice(state.legal_actions()))
+    key, log = state.canonical_key(), bytes(state.log)
+    before = [(dict(p.resources), p.stats["total_res"].copy(), bytes(p.hand), bytes(p.city), indexes(p))
+              for p in state.players]
+
+    sim = state.clone()
+    assert sim.canonical_key() == key
+    assert all(loc.occupant is None or loc.occupant in sim.players for loc in sim.locations)
+    for p in sim.players:
+        p.resources["twig"] += 5
+        p.stats["total_res"]["twig"] += 5
+        p.hand.append(0)
+        p.add_to_city(CARDS[-1])
+    sim.deck.pop()
+    sim.meadow.append(0)
+    while not sim.over:
+        sim.apply(rng.choice(sim.legal_actions()))
+
+    assert state.canonical_key() == key and bytes(state.log) == log
+    assert [(dict(p.resources), p.stats["total_res"], bytes(p.hand), bytes(p.city), indexes(p))
+            for p in state.players] == before
+    assert all(loc.occupant is None or loc.occupant in state.players for loc in state.locations)
@@ -0,0 +1,59 @@
+# tests/test_replay.py
+import random
+import pytest
+from engine.game_state import GameState
+from engine.replay import ReplayWriter, read_replay, replay
+
+
+def play(state: GameState, rng: random.Random, moves: int) -> None:
+    for _ in range(moves):
+        if state.over:
+            return
+        state.apply(rng.choice(state.legal_actions()))
+
+
+@pytest.mark.parametrize("seed", [0, 42, 0xFFFFFFFF])
+def test_replay_reproduces_game(seed, tmp_path):
+    # Ziarno + log z pliku odtwarzają całą grę: ten sam wynik i ten sam stan końcowy
+    state, rng = GameState(seed), random.Random(seed)
+    writer = ReplayWriter.for_game(state, str(tmp_path))
+    while not state.over:
+        play(state, rng, 1)
+        writer.sync(state.log)
+    writer.close()
+
+    file_seed, log = read_replay(writer.path)
+    assert (file_seed, log) == (seed, bytes(state.log))
+    again = replay(file_seed, log)
+    assert again.over and again.winner_text == state.winner_text
+    assert [p.score for p in again.players] == [p.score for p in state.players]
+    assert again.canonical_key() == state.canonical_key()
+
+
+def test_replay_to_turn_matches_live_state():
+    state, rng = GameState(9), random.Random(9)
+    play(state, rng, 25)
+    mid = state.clone()
+    play(state, rng, 25)
+    assert replay(state.seed, bytes(state.log), turn=25).canonical_key() == mid.canonical_key()
+
+
+def test_replay_rejects_foreign_log():
+    state, rng = GameState(1), random.Random(1)
+    play(state, rng, 30)
+    with pytest.raises(ValueError):
+        replay(2, bytes(state.log))
+
+
+def test_writer_resumes_after_close(tmp_path):
+    state, rng = GameState(6), random.Random(6)
+    writer = ReplayWriter.for_game(state, str(tmp_path))
+    writer.sync(state.log)
+    assert not list(tmp_path.iterdir())  # Bez ruchu nie ma pliku
+    play(state, rng, 5)
+    writer.sync(state.log)
+    writer.close()
+    play(state, rng, 5)
+    writer.sync(state.log)
+    writer.close()
+    assert read_replay(writer.path) == (6, bytes(state.log))
@@ -0,0 +1,59 @@
+# tests/test_snapshot.py
+import random
+import pytest
+from engine.game_state import GameState
+from engine.snapshot import dumps, loads, save
+
+
+def played(seed: int, turns: int) -> GameState:
+    state = GameState(seed)
+    rng = random.Random(seed)
+    for _ in range(turns):
+        actions = state.legal_actions()
+        if not actions:
+            break
+        state.apply(rng.choice(actions))
+    return state
+
+
+@pytest.mark.parametrize("seed", [1, 7, 123])
+def test_round_trip(seed):
+    state = played(seed, 40)
+    restored, ai_seat = loads(dumps(state, ai_seat=1))
+    assert ai_seat == 1
+    assert restored.seed == state.seed and restored.log == state.log
+    assert restored.canonical_key() == state.canonical_key()
+    assert restored.deck == state.deck and restored.meadow == state.meadow
+    for a, b in zip(restored.players, state.players):
+        assert (a.name, a.hand, a.city, a.score, a.stats) == (b.name, b.hand, b.city, b.score, b.stats)
+    # Wczytany stan gra dalej tak samo jak oryginał
+    for action in state.legal_actions():
+        assert restored.clone().apply(action) == state.clone().apply(action)
+
+
+def test_corrupt_snapshot_raises_value_error():
+    # Autozapis czyta App.load_autosave, który łapie tylko OSError/ValueError - inny wyjątek wywróciłby menu
+    data = dumps(played(5, 30))
+    for n in range(len(data)):
+        with pytest.raises(ValueError):
+            loads(data[:n])
+    with pytest.raises(ValueError):
+        loads(data + b"\0")
+    rng = random.Random(1)
+    for _ in range(2000):
+        corrupt = bytearray(data)
+        for _ in range(rng.randrange(1, 4)):
+            corrupt[rng.randrange(len(corrupt))] = rng.randrange(256)
+        try:
+            loads(bytes(corrupt))
+        except ValueError:
+            pass
+
+
+def test_corrupt_autosave_is_ignored(app):
+    import engine.app
+    save(engine.app.AUTOSAVE_PATH, played(3, 10))
+    assert app.can_resume()
+    with open(engine.app.AUTOSAVE_PATH, "r+b") as f:
+        f.truncate(40)
+    assert not app.can_resume()
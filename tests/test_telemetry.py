@@ -0,0 +1,59 @@
+# tests/test_telemetry.py
+import random
+import pytest
+from engine.ai import score_for
+from engine.game_state import GameState
+from engine.snapshot import SEASONS
+from engine.telemetry import T_CITIES, T_GAMES, T_TURNS, Telemetry, iter_batches
+
+COLUMNS = ("game", "turn", "seat", "action", "season", "vp", "city", "hand")
+
+
+def record(path, seeds, capacity):
+    #Gry przez Telemetry i niezależnie spisane oczekiwane wiersze (tury, gry, miasta).
+    telemetry = Telemetry(str(path), capacity=capacity)
+    turns, games, cities = [], [], []
+    for seed in seeds:
+        state, rng = GameState(seed), random.Random(seed)
+        while not state.over:
+            seat, action = state.turn_idx, rng.choice(state.legal_actions())
+            assert telemetry.apply(state, action)
+            p = state.players[seat]
+            turns.append((seed, len(state.log) - 1, seat, action.code, SEASONS.index(p.season), p.score,
+                          len(p.city), len(p.hand)))
+        games.append((seed, len(state.log), *(p.score for p in state.players)))
+        for seat, p in enumerate(state.players):
+            cities += [(seed, seat, card, int(2 * score_for(state, seat))) for card in p.city]
+    telemetry.close()
+    return turns, games, cities
+
+
+def read(path, table, columns):
+    rows, batches = [], 0
+    for _, batch in iter_batches([str(path)], table, columns):
+        assert set(batch) == set(columns)  # Tylko zamówione kolumny
+        rows += zip(*(batch[c] for c in columns))
+        batches += 1
+    return rows, batches
+
+
+def test_write_and_read_back(tmp_path):
+    path = tmp_path / "t.fvt"
+    turns, games, cities = record(path, seeds=range(5), capacity=64)  # Mały bufor = wiele paczek na dysku
+    got, batches = read(path, T_TURNS, COLUMNS)
+    assert got == turns and batches > 1
+    got, _ = read(path, T_GAMES, ("game", "actions", "vp0", "vp1"))
+    assert got == games
+    got, _ = read(path, T_CITIES, ("game", "seat", "card", "result"))
+    assert sorted(got) == sorted(cities)
+
+
+def test_directory_read_and_bad_file(tmp_path):
+    record(tmp_path / "a.fvt", seeds=[1], capacity=4096)
+    record(tmp_path / "sub" / "b.fvt", seeds=[2], capacity=4096)
+    got, _ = read(tmp_path, T_GAMES, ("game",))
+    assert sorted(got) == [(1,), (2,)]
+
+    (tmp_path / "bad.fvt").write_bytes(b"XXXX" + bytes(16))
+    with pytest.raises(ValueError):
+        read(tmp_path / "bad.fvt", T_TURNS, ("game",))
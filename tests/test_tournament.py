@@ -0,0 +1,60 @@
+# tests/test_tournament.py
+import math
+import random
+import pytest
+from engine.tournament import BASE_ELO, Standings, schedule
+
+
+def results(a: str, b: str, wins: float, games: int):
+    #Wyniki meczu a-b: wins punktów dla a (połówki = remisy), na przemian miejsca przy stole.
+    out = []
+    for i in range(games):
+        result = 1.0 if i < int(wins) else (0.5 if i < wins else 0.0)
+        out.append({"seat0": a, "seat1": b, "result": result} if i % 2 == 0 else
+                   {"seat0": b, "seat1": a, "result": 1.0 - result})
+    return out
+
+
+def test_two_bots_match_closed_form():
+    # Dwóch graczy: siła z MM to po prostu stosunek wygranych (z wirtualnym remisem jako prior)
+    st = Standings(["A", "B"])
+    for r in results("A", "B", 75, 100):
+        st.add(r)
+    elo = st.elo()
+    expected = 400 * math.log10(75.5 / 25.5)
+    assert elo["A"][0] - elo["B"][0] == pytest.approx(expected, abs=0.01)
+    assert (elo["A"][0] + elo["B"][0]) / 2 == pytest.approx(BASE_ELO)
+    assert st.points("A") == (75.0, 100)
+
+
+def test_recovers_known_strengths():
+    # Wyniki dokładnie takie, jakich oczekuje model Bradleya-Terry'ego dla Elo 1700/1500/1300
+    true = {"A": 1700, "B": 1500, "C": 1300}
+    st = Standings(list(true))
+    for a, b in [("A", "B"), ("A", "C"), ("B", "C")]:
+        p = 1 / (1 + 10 ** ((true[b] - true[a]) / 400))
+        for r in results(a, b, round(p * 20000) / 2, 10000):
+            st.add(r)
+    elo = st.elo()
+    for bot, rating in true.items():
+        assert elo[bot][0] == pytest.approx(rating, abs=3)
+        assert 0 < elo[bot][1] < 15
+
+
+def test_even_results_and_order_independence():
+    rows = results("A", "B", 10, 20) + results("B", "C", 10, 20) + results("A", "C", 10, 20)
+    forward, shuffled = Standings(["A", "B", "C"]), Standings(["A", "B", "C"])
+    for r in rows:
+        forward.add(r)
+    random.Random(1).shuffle(rows)
+    for r in rows:
+        shuffled.add(r)
+    assert forward.elo() == pytest.approx(shuffled.elo())
+    for rating, _ in forward.elo().values():
+        assert rating == pytest.approx(BASE_ELO)
+
+
+def test_schedule_plays_both_seats():
+    games = schedule(["A", "B", "C"], seeds=2, first_seed=10)
+    assert len(games) == 3 * 2 * 2
+    assert ("A", "B", 10) in games and ("B", "A", 10) in games